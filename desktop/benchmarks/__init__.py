@@ -0,0 +1,2 @@
+# Benchmarks of the desktop data layer and views against a local stub API.
+# Run from desktop/ with:  python -m benchmarks --help
@@ -0,0 +1,159 @@
+# benchmarks/__main__.py
+"""Time the desktop client's loading paths against a local stub API.
+
+    python -m benchmarks --rentals 20000 --purchases 20000 --save base.json
+    python -m benchmarks --rentals 20000 --purchases 20000 --baseline base.json
+
+The views are built on Qt's offscreen platform, so no display is needed.
+With ``--baseline`` the exit status is 1 when a median got more than
+``--threshold`` slower.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Callable, List
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.harness import Result, format_table, measure, regressions
+from benchmarks.stub_server import StubApi, make_dataset
+from models.car import Car
+from models.columnar import purchase_table, rental_table
+from models.purchase import Purchase
+from models.rental import Rental
+from services.api_service import ApiService
+from services.car_service import CarService
+from services.http_cache import HttpCache
+from services.http_transport import HttpTransport
+from services.local_store import LocalStore
+from services.request_executor import RequestExecutor
+from services.sync_engine import SyncEngine
+from services.thumbnail_cache import ThumbnailCache
+
+
+def run(args) -> List[Result]:
+    dataset = make_dataset(args.cars, args.rentals, args.purchases, args.seed)
+    cars, rentals, purchases = dataset['cars'], dataset['rentals'], dataset['purchases']
+    car_by_id = {car['id']: car for car in cars}
+    # Purchases as the views get them: with their car attached
+    purchases_with_cars = [{**p, 'car': car_by_id.get(p['carId'], {})} for p in purchases]
+    results: List[Result] = []
+
+    def bench(name: str, fn: Callable, items: int, setup=None):
+        if args.only and not any(pattern in name for pattern in args.only):
+            return
+        results.append(measure(name, fn, items, args.repeat, args.warmup, setup,
+                               memory=not args.no_memory))
+        print(f"  {name}", file=sys.stderr)
+
+    # Model decoding
+    bench("Car.from_dict", lambda: [Car.from_dict(c) for c in cars], len(cars))
+    bench("Rental.from_dict", lambda: [Rental.from_dict(r) for r in rentals], len(rentals))
+    bench("Purchase.from_dict", lambda: [Purchase.from_dict(p) for p in purchases_with_cars],
+          len(purchases))
+
+    with StubApi(dataset, latency=args.latency) as stub:
+        # One pooled transport, as in the app; the HTTP cache is disabled so
+        # every call downloads its data
+        transport = HttpTransport()
+
+        def api():
+            return (ApiService(stub.url, HttpCache(ttls={}, default_ttl=None), transport),)
+
+        # Network + decoding
+        bench("ApiService.get_rentals", lambda a: a.get_rentals(), len(rentals), api)
+        bench("ApiService.get_purchases", lambda a: a.get_purchases(), len(purchases), api)
+        bench("CarService.get_all_cars", lambda a: CarService(a).get_all_cars(), len(cars), api)
+
+        # First sync into an empty local store
+        for entity, items in (('cars', cars), ('rentals', rentals), ('purchases', purchases)):
+            bench(f"SyncEngine.sync({entity})", lambda engine, e=entity: engine.sync(e), len(items),
+                  lambda: (SyncEngine(api()[0], LocalStore(':memory:')),))
+
+        # Views
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        from ui.car_management_widget import CarManagementWidget
+        from ui.tabs.purchases_tab import PurchasesTab
+        from ui.tabs.rentals_tab import RentalsTab
+
+        api_service = api()[0]
+        sync_engine = SyncEngine(api_service, LocalStore(':memory:'))
+        executor = RequestExecutor()
+        thumbnails_dir = tempfile.TemporaryDirectory()
+        rentals_tab = RentalsTab(api_service, executor, sync_engine)
+        purchases_tab = PurchasesTab(api_service, executor, sync_engine)
+        car_widget = CarManagementWidget(CarService(api_service, sync_engine), executor,
+                                         ThumbnailCache(thumbnails_dir.name))
+        for widget in (rentals_tab, purchases_tab, car_widget):
+            widget.resize(1200, 800)
+            widget.show()
+        # Let the loads the views start on their own finish first
+        executor.pool.waitForDone()
+        app.processEvents()
+
+        def show(populate: Callable, *populate_args):
+            populate(*populate_args)
+            app.processEvents()
+
+        bench("RentalsTab.populate", lambda: show(rentals_tab.populate_rentals, rental_table(rentals)),
+              len(rentals))
+        bench("PurchasesTab.populate",
+              lambda: show(purchases_tab.populate_purchases, purchase_table(purchases_with_cars)),
+              len(purchases))
+        car_objects = [Car.from_dict(c) for c in cars]
+        car_widget.car_service.search_index.rebuild(car_objects)
+        bench("CarManagementWidget.set_cars", lambda: show(car_widget.set_cars, car_objects),
+              len(cars))
+
+        for widget in (rentals_tab, purchases_tab, car_widget):
+            widget.close()
+        executor.shutdown()
+        thumbnails_dir.cleanup()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cars", type=int, default=500)
+    parser.add_argument("--rentals", type=int, default=5000)
+    parser.add_argument("--purchases", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds the stub API waits before every response")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--only", action="append", metavar="TEXT",
+                        help="run only the benchmarks whose name contains TEXT (repeatable)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory run")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with results saved by --save")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown of the median counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results = run(args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = {row['name']: row for row in json.load(f)['results']}
+    print(format_table(results, baseline, args.threshold))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'dataset': {'cars': args.cars, 'rentals': args.rentals,
+                                   'purchases': args.purchases, 'latency': args.latency},
+                       'results': [result.to_dict() for result in results]}, f, indent=2)
+    if baseline is not None and regressions(results, baseline, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
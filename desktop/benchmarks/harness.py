@@ -0,0 +1,118 @@
+# benchmarks/harness.py
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class Result:
+    """Timings of one benchmark: ``samples`` in seconds, each processing ``items`` records."""
+    name: str
+    items: int
+    samples: List[float] = field(default_factory=list)
+    # Peak of Python allocations during one extra run (tracemalloc; Qt's C++ heap is not seen)
+    peak_memory: int = 0
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.samples, q)) if self.samples else 0.0
+
+    @property
+    def median(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def throughput(self) -> float:
+        """Records per second at the median time."""
+        return self.items / self.median if self.median else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'items': self.items,
+            'runs': len(self.samples),
+            'p50_ms': round(self.median * 1000, 3),
+            'p95_ms': round(self.percentile(95) * 1000, 3),
+            'p99_ms': round(self.percentile(99) * 1000, 3),
+            'max_ms': round(max(self.samples, default=0.0) * 1000, 3),
+            'throughput': round(self.throughput, 1),
+            'peak_memory_kib': round(self.peak_memory / 1024, 1),
+        }
+
+
+def measure(name: str, fn: Callable[..., Any], items: int, repeat: int = 5, warmup: int = 1,
+            setup: Optional[Callable[[], tuple]] = None, memory: bool = True) -> Result:
+    """Time ``repeat`` calls of ``fn`` after ``warmup`` untimed ones.
+
+    ``setup`` runs before every call, untimed, and returns the arguments
+    for ``fn`` (e.g. a fresh local store). The garbage collector is paused
+    while a call is timed so a collection triggered by earlier work does not
+    land in a sample. With ``memory`` one more call is made under
+    ``tracemalloc`` to record the peak allocation.
+    """
+    result = Result(name, items)
+    for run in range(warmup + repeat):
+        args = setup() if setup else ()
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn(*args)
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        if run >= warmup:
+            result.samples.append(elapsed)
+
+    if memory:
+        args = setup() if setup else ()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn(*args)
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def format_table(results: Iterable[Result], baseline: Optional[Dict[str, Dict[str, Any]]] = None,
+                 threshold: float = 0.10) -> str:
+    """Render ``results`` as a text table.
+
+    With a ``baseline`` (``name`` -> ``Result.to_dict()`` of an earlier
+    run) the change of the median is shown, and medians more than
+    ``threshold`` slower are marked ``REGRESSION``.
+    """
+    header = f"{'benchmark':<34}{'items':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}" \
+             f"{'items/s':>12}{'peak KiB':>11}"
+    if baseline is not None:
+        header += f"{'vs base':>10}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        row = result.to_dict()
+        line = f"{row['name']:<34}{row['items']:>8}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}" \
+               f"{row['p99_ms']:>10.2f}{row['throughput']:>12,.0f}{row['peak_memory_kib']:>11,.0f}"
+        previous = (baseline or {}).get(result.name)
+        if previous and previous.get('p50_ms'):
+            change = row['p50_ms'] / previous['p50_ms'] - 1
+            line += f"{change:>+10.0%}"
+            if change > threshold:
+                line += "  REGRESSION"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def regressions(results: Iterable[Result], baseline: Dict[str, Dict[str, Any]],
+                threshold: float = 0.10) -> List[str]:
+    """Names of the benchmarks whose median is more than ``threshold`` slower than ``baseline``."""
+    slower = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous and previous.get('p50_ms') and \
+                result.median * 1000 > previous['p50_ms'] * (1 + threshold):
+            slower.append(result.name)
+    return slower
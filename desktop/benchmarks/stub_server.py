@@ -0,0 +1,163 @@
+# benchmarks/stub_server.py
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+CAR_TYPES = ("SEDAN", "SUV", "HATCHBACK", "COUPE", "CONVERTIBLE", "VAN")
+MAKES = ("Dacia", "Skoda", "Toyota", "Ford", "BMW", "Audi", "Renault", "Volkswagen")
+RENTAL_STATUSES = ("PENDING", "CONFIRMED", "ACTIVE", "COMPLETED")
+PURCHASE_STATUSES = ("PENDING", "COMPLETED")
+PAYMENT_METHODS = ("CASH", "CARD", "TRANSFER")
+SERVER_TIME = "2026-01-01T00:00:00Z"
+
+
+def make_dataset(cars: int, rentals: int, purchases: int, seed: int = 1) -> Dict[str, List[Dict[str, Any]]]:
+    """Generate records shaped like the backend's JSON, the same for the same ``seed``.
+
+    Rentals embed their car, as the backend serializes them; purchases only
+    carry a ``carId``, so loading them exercises the car lookup.
+    """
+    rng = random.Random(seed)
+    car_records = []
+    for car_id in range(1, cars + 1):
+        daily_rate = rng.randrange(30, 300)
+        car_records.append({
+            "id": car_id,
+            "name": rng.choice(MAKES),
+            "model": f"Model {rng.randrange(1, 40)}",
+            "year": rng.randrange(2005, 2026),
+            "color": rng.choice(("red", "blue", "black", "white", "grey")),
+            "licensePlate": f"B-{car_id:05d}",
+            "dailyRate": daily_rate,
+            "price": daily_rate * 200,
+            "available": rng.random() < 0.7,
+            "type": rng.choice(CAR_TYPES),
+            "imageUrl": "",
+            "description": "Benchmark car",
+            "updatedAt": SERVER_TIME,
+        })
+
+    start = date(2024, 1, 1)
+    rental_records = []
+    for rental_id in range(1, rentals + 1):
+        begin = start + timedelta(days=rng.randrange(0, 700))
+        days = rng.randrange(1, 15)
+        car = car_records[rng.randrange(cars)] if cars else {}
+        rental_records.append({
+            "id": rental_id,
+            "customerName": f"Customer {rental_id}",
+            "customerEmail": f"customer{rental_id}@example.com",
+            "car": car,
+            "startDate": begin.isoformat(),
+            "endDate": (begin + timedelta(days=days)).isoformat(),
+            "status": rng.choice(RENTAL_STATUSES),
+            "totalPrice": float(car.get("dailyRate", 50) * days),
+            "createdAt": f"{begin.isoformat()}T09:00:00",
+            "updatedAt": SERVER_TIME,
+        })
+
+    purchase_records = []
+    for purchase_id in range(1, purchases + 1):
+        car = car_records[rng.randrange(cars)] if cars else {}
+        purchase_records.append({
+            "id": purchase_id,
+            "customerName": f"Buyer {purchase_id}",
+            "customerEmail": f"buyer{purchase_id}@example.com",
+            "carId": car.get("id"),
+            "purchasePrice": float(car.get("price", 10000)),
+            "purchaseDate": (start + timedelta(days=rng.randrange(0, 700))).isoformat(),
+            "paymentMethod": rng.choice(PAYMENT_METHODS),
+            "status": rng.choice(PURCHASE_STATUSES),
+            "updatedAt": SERVER_TIME,
+        })
+    return {"cars": car_records, "rentals": rental_records, "purchases": purchase_records}
+
+
+class StubApi:
+    """A local stand-in for the backend serving a fixed dataset.
+
+    Serves the list, ``/changes`` (always the full set, as for a first
+    sync) and single-car endpoints the desktop client reads; everything else
+    is a 404, including ``/api/events``. Bodies are encoded once up front so
+    the server's own cost stays out of the measurements, and ``latency``
+    seconds are added to every response to model a remote backend.
+
+    Use as a context manager; ``url`` is the base URL to hand to
+    ``ApiService``.
+    """
+
+    def __init__(self, dataset: Dict[str, List[Dict[str, Any]]], latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.requests = 0
+        self._bodies: Dict[str, bytes] = {}
+        self._cars: Dict[int, bytes] = {}
+        for entity, records in dataset.items():
+            self._bodies[f"/api/{entity}"] = json.dumps(records).encode()
+            self._bodies[f"/api/{entity}/changes"] = json.dumps(
+                {"items": records, "deletedIds": [], "serverTime": SERVER_TIME}).encode()
+        for car in dataset.get("cars", ()):
+            self._cars[car["id"]] = json.dumps(car).encode()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubApi":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubApi":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def body(self, path: str) -> Optional[bytes]:
+        if path in self._bodies:
+            return self._bodies[path]
+        match = re.fullmatch(r"/api/cars/(\d+)", path)
+        return self._cars.get(int(match.group(1))) if match else None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, as the real backend
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                body = stub.body(urlsplit(self.path).path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,249 @@
+"""Command-line admin tool for the car dealership API (no Qt required).
+
+Examples:
+    python cli.py rentals approve --status PENDING --from 2026-01-01
+    python cli.py purchases complete --ids 12,13,14 --dry-run
+    python cli.py cars import new_lot.csv
+    python cli.py export rentals -o rentals.csv
+    python cli.py export purchases --from 2020-01-01 -o purchases.parquet
+
+Bulk status changes and car imports go through the bulk endpoints in
+batches that run in parallel (``--workers``); batches the server rejects as
+a whole are retried record by record.
+"""
+import argparse
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import config
+from services.api_service import ApiService
+from services.car_import import CarImporter, read_rows
+from services.car_service import CarService
+from services.exporter import (ENTITIES, FORMATS, cached_records, select_records,
+                                write_export)
+from services.logging_service import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# action -> status sent to the bulk endpoint
+RENTAL_ACTIONS = {'approve': 'APPROVED', 'reject': 'REJECTED'}
+PURCHASE_ACTIONS = {'complete': 'COMPLETED', 'cancel': 'CANCELLED'}
+
+
+class Progress:
+    """Thread-safe ``done/total`` counter redrawn on stderr at most 10 times a second.
+
+    Nothing is drawn when stderr is not a terminal (e.g. in cron jobs); the
+    summary from ``finish`` is always printed.
+    """
+
+    def __init__(self, label: str, total: Optional[int] = None, enabled: bool = True):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.enabled = enabled and sys.stderr.isatty()
+        self._started = time.perf_counter()
+        self._drawn = 0.0
+        self._lock = threading.Lock()
+
+    def advance(self, done: int = 1, failed: int = 0):
+        with self._lock:
+            self.done += done
+            self.failed += failed
+            now = time.perf_counter()
+            if self.enabled and now - self._drawn >= 0.1:
+                self._drawn = now
+                sys.stderr.write(f"\r{self._line(now)}")
+                sys.stderr.flush()
+
+    def finish(self) -> str:
+        line = self._line(time.perf_counter())
+        if self.enabled:
+            sys.stderr.write("\r")
+        print(line, file=sys.stderr)
+        return line
+
+    def _line(self, now: float) -> str:
+        elapsed = max(now - self._started, 1e-9)
+        count = f"{self.done}/{self.total}" if self.total is not None else str(self.done)
+        failed = f", {self.failed} failed" if self.failed else ""
+        return f"{self.label}: {count}{failed} in {elapsed:.1f} s ({self.done / elapsed:,.0f}/s)"
+
+
+def run_parallel(items: Sequence[Any], fn: Callable[[Any], Tuple[int, int]], workers: int,
+                 progress: Progress):
+    """Run ``fn`` on every item with at most ``workers`` in flight.
+
+    ``fn`` returns ``(done, failed)`` counts for the progress display.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, item) for item in items]
+        for future in as_completed(futures):
+            try:
+                done, failed = future.result()
+            except Exception:
+                logger.exception("Worker failed")
+                continue
+            progress.advance(done, failed)
+
+
+def chunks(items: Sequence[Any], size: int) -> List[Sequence[Any]]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def parse_ids(value: str) -> List[int]:
+    try:
+        return [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated IDs, got {value!r}")
+
+
+# Commands
+
+def update_statuses(api: ApiService, args) -> int:
+    """Apply a status action to the selected rentals or purchases."""
+    status = (RENTAL_ACTIONS if args.entity == 'rentals' else PURCHASE_ACTIONS)[args.action]
+    if args.ids:
+        ids = args.ids
+    else:
+        ids = [int(r['id']) for r in select_records(api, args.entity, args.status,
+                                                      args.start, args.end)]
+    if args.dry_run or not ids:
+        print(f"{len(ids)} {args.entity} would be set to {status}" if args.dry_run
+              else f"No {args.entity} match", file=sys.stderr)
+        return 0
+
+    if args.entity == 'rentals':
+        bulk, single = api.update_rental_statuses, api.update_rental_status
+    else:
+        bulk, single = api.update_purchase_statuses, api.update_purchase_status
+    failures: Dict[int, str] = {}
+    lock = threading.Lock()
+
+    def apply(batch):
+        result = bulk(batch, status)
+        if result is None:
+            # The bulk request failed as a whole (or the server predates it)
+            failed = {record_id: "update failed" for record_id in batch
+                      if not single(record_id, status)}
+        else:
+            failed = result['failed']
+        with lock:
+            failures.update(failed)
+        return len(batch) - len(failed), len(failed)
+
+    progress = Progress(f"{args.action} {args.entity}", len(ids), not args.quiet)
+    run_parallel(chunks(ids, args.batch_size), apply, args.workers, progress)
+    progress.finish()
+    for record_id, reason in sorted(failures.items()):
+        print(f"{args.entity[:-1]} {record_id}: {reason}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def import_cars(api: ApiService, args) -> int:
+    """Create cars from a CSV or JSON feed through the batch endpoint."""
+    car_service = CarService(api)
+    # Plates already registered count as duplicates before anything is sent
+    known_cars = car_service.get_all_cars()
+    importer = CarImporter(car_service, args.workers, args.batch_size)
+    progress = Progress("validate cars" if args.dry_run else "import cars", None, not args.quiet)
+    try:
+        report = importer.run(read_rows(args.file, args.format), known_cars,
+                              progress.advance, args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {args.file}: {e}", file=sys.stderr)
+        return 2
+    progress.finish()
+    for error in report.errors:
+        print(error, file=sys.stderr)
+    if args.dry_run:
+        print(f"{report.valid} cars would be created, {len(report.errors)} rows rejected",
+              file=sys.stderr)
+    else:
+        print(report.summary(), file=sys.stderr)
+        if report.fallback:
+            print(f"{report.fallback} cars were created one by one", file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+def export(api: ApiService, args) -> int:
+    if args.from_cache:
+        from services.local_store import LocalStore
+        records = cached_records(LocalStore(), args.entity, args.status, args.start, args.end)
+    else:
+        records = select_records(api, args.entity, args.status, args.start, args.end)
+    progress = Progress(f"export {args.entity}", None, not args.quiet)
+    try:
+        write_export(records, args.output, args.entity, args.format, progress.advance)
+    except (OSError, RuntimeError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    progress.finish()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description=__doc__.split("\n\n")[0],
+                                     epilog=__doc__.split("\n\n", 1)[1],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--api', default=config.API_URL, help="API base URL (default %(default)s)")
+    parser.add_argument('--workers', type=int, default=8, help="requests in flight (default 8)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="no progress display")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every request")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_filters(command):
+        command.add_argument('--status', help="only records with this status")
+        command.add_argument('--from', dest='start', type=date.fromisoformat, metavar='DATE',
+                             help="only records from this date (YYYY-MM-DD)")
+        command.add_argument('--to', dest='end', type=date.fromisoformat, metavar='DATE',
+                             help="only records up to this date (YYYY-MM-DD)")
+
+    for entity, actions in (('rentals', RENTAL_ACTIONS), ('purchases', PURCHASE_ACTIONS)):
+        command = commands.add_parser(entity, help=f"change the status of {entity} in bulk")
+        command.set_defaults(handler=update_statuses, entity=entity)
+        command.add_argument('action', choices=sorted(actions))
+        command.add_argument('--ids', type=parse_ids, help="comma-separated IDs instead of filters")
+        add_filters(command)
+        command.add_argument('--batch-size', type=int, default=200, help="IDs per bulk request")
+        command.add_argument('--dry-run', action='store_true', help="only count the matches")
+
+    cars = commands.add_parser('cars', help="car inventory")
+    car_commands = cars.add_subparsers(dest='car_command', required=True)
+    command = car_commands.add_parser('import', help="create cars from a CSV or JSON file")
+    command.set_defaults(handler=import_cars)
+    command.add_argument('file')
+    command.add_argument('--format', choices=('csv', 'json'),
+                         help="csv, or a json array or json lines (default: from the file name)")
+    command.add_argument('--batch-size', type=int, default=200, help="cars per batch request")
+    command.add_argument('--dry-run', action='store_true', help="only validate the file")
+
+    command = commands.add_parser('export', help="write rentals, purchases or cars to a file")
+    command.set_defaults(handler=export)
+    command.add_argument('entity', choices=sorted(ENTITIES))
+    command.add_argument('-o', '--output', required=True)
+    command.add_argument('--format', choices=FORMATS,
+                         help="csv, json lines or parquet (default: from the file name)")
+    command.add_argument('--from-cache', action='store_true',
+                         help="read the desktop app's local copy instead of the API")
+    add_filters(command)
+    return parser
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging('DEBUG' if args.verbose else None, log_file='')
+    from services.http_transport import HttpTransport
+    # One pooled connection per worker
+    api = ApiService(args.api, transport=HttpTransport(pool_size=max(args.workers, 1)))
+    return args.handler(api, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
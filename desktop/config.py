@@ -0,0 +1,34 @@
+# config.py
+"""Connection settings of the desktop client.
+
+Every value can be overridden with the environment variable of the same
+name prefixed with ``CAR_DEALERSHIP_``, e.g. ``CAR_DEALERSHIP_API_URL``.
+"""
+import os
+
+
+def _env(name: str, default: str) -> str:
+    return os.environ.get(f"CAR_DEALERSHIP_{name}", default)
+
+
+API_URL = _env("API_URL", "http://localhost:8080")
+
+# Worker threads of the shared RequestExecutor
+REQUEST_WORKERS = int(_env("REQUEST_WORKERS", "4"))
+
+# Pooled keep-alive connections per host: one per worker, one for the change
+# feed stream and a few spare for calls made from the GUI thread
+HTTP_POOL_SIZE = int(_env("HTTP_POOL_SIZE", str(REQUEST_WORKERS + 4)))
+
+# (connect, read) budgets in seconds. Connecting to a reachable server takes
+# milliseconds, so the connect budget is short; reads get what the slowest
+# endpoint of a class needs.
+CONNECT_TIMEOUT = float(_env("CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(_env("READ_TIMEOUT", "15"))
+BULK_READ_TIMEOUT = float(_env("BULK_READ_TIMEOUT", "60"))
+# The server sends a change feed heartbeat every 20 s; longer silence means a
+# dead connection
+STREAM_READ_TIMEOUT = float(_env("STREAM_READ_TIMEOUT", "60"))
+
+# Idle seconds before TCP keep-alive probes start on pooled connections
+TCP_KEEPALIVE_IDLE = int(_env("TCP_KEEPALIVE_IDLE", "30"))
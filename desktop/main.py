@@ -1,51 +1,116 @@
-import sys
+import argparse
+import logging
 import os
-from pathlib import Path
-from PyQt5.QtWidgets import QApplication
+import sys
+import time
+
+# Taken before anything heavy is imported, for --profile-startup
+_started = time.perf_counter()
+
+from services.logging_service import configure_logging
+
+logger = logging.getLogger(__name__)
+
+STYLESHEET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ui', 'styles', 'main_style.qss')
 
-# Add the project root (parent of desktop) to Python path
-project_root = str(Path(__file__).parent.parent.absolute())
-if project_root not in sys.path:
-    sys.path.append(project_root)
+# Modules whose import shows up in the startup time, reported by --profile-startup
+HEAVY_MODULES = ('PyQt5.QtWidgets', 'PyQt5.QtNetwork', 'requests', 'numpy', 'sqlite3')
 
-# Import local modules
-from ui.main_window import MainWindow
 
-def load_stylesheet(app):
+def load_stylesheet(app, path: str = STYLESHEET):
     """Load and apply the stylesheet."""
-    # Try multiple possible paths
-    possible_paths = [
-        os.path.join(os.path.dirname(__file__), 'ui', 'styles', 'main_style.qss'),  # From desktop/
-        os.path.join(os.path.dirname(__file__), 'styles', 'main_style.qss'),  # From desktop/ui/
-        'main_style.qss'  # Current directory
-    ]
-    
-    for path in possible_paths:
-        try:
-            if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    stylesheet = f.read()
-                    app.setStyleSheet(stylesheet)
-                    return True
-        except Exception as e:
-            print(f"Error loading stylesheet from {path}: {e}")
-    
-    print("Failed to load stylesheet from any path")
-    return False
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            app.setStyleSheet(f.read())
+        return True
+    except OSError as e:
+        logger.warning("Error loading stylesheet from %s: %s", path, e)
+        return False
+
+
+class StartupProfile:
+    """Wall-clock time and newly imported modules of each startup phase."""
+
+    def __init__(self, started: float):
+        self.phases = []
+        self._last = started
+        self._modules = len(sys.modules)
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last, len(sys.modules) - self._modules))
+        self._last = now
+        self._modules = len(sys.modules)
+
+    def report(self) -> str:
+        lines = [f"{'phase':<28}{'ms':>9}{'total ms':>10}{'modules':>9}"]
+        total = 0.0
+        for phase, seconds, modules in self.phases:
+            total += seconds
+            lines.append(f"{phase:<28}{seconds * 1000:>9.1f}{total * 1000:>10.1f}{modules:>9}")
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        lines.append(f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+        return "\n".join(lines)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Car Rental Admin")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print how long each startup phase takes (up to the end of "
+                             "the open tab's load and the prefetches), then exit")
+    args, qt_args = parser.parse_known_args()
+    configure_logging()
+    profile = StartupProfile(_started) if args.profile_startup else None
+
+    # Qt and the window are imported here so --profile-startup can time them
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+    if profile:
+        profile.mark("imports")
+
     # Create the application
-    app = QApplication(sys.argv)
-    
+    app = QApplication(sys.argv[:1] + qt_args)
+    if profile:
+        profile.mark("QApplication")
+
     # Load and apply stylesheet
     load_stylesheet(app)
-    
+    if profile:
+        profile.mark("stylesheet")
+
     # Create and show the main window
     window = MainWindow()
+    if profile:
+        profile.mark("window construction")
     window.show()
-    
+
+    if profile:
+        window.repaint()
+        profile.mark("show and first paint")
+
+        def tab_built():
+            profile.mark("open tab built")
+            # Wait for the loads the window's start_up began
+            if window.request_executor.is_idle():
+                first_data()
+            else:
+                window.request_executor.idle.connect(first_data)
+
+        def first_data():
+            if any(phase == "first data" for phase, _, _ in profile.phases):
+                return
+            app.processEvents()
+            profile.mark("first data")
+            print(profile.report(), file=sys.stderr)
+            window.close()
+            app.quit()
+
+        # Runs right after the window's start_up
+        QTimer.singleShot(0, tab_built)
+
     # Run the application
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -2,7 +2,9 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+from .decoder import Field, compile_decoder
+
+@dataclass(slots=True)
 class Car:
     id: Optional[int] = None
     name: str = ""
@@ -41,32 +43,33 @@ class Car:
         
     @classmethod
     def from_dict(cls, data: dict):
-        # Handle both pricePerDay and dailyRate fields
-        price_per_day = data.get("pricePerDay")
-        if price_per_day is None:
-            price_per_day = data.get("dailyRate", 0.0)
-            
-        # Handle price field
-        price = data.get("price")
-        if price is None:
-            price = float(price_per_day) * 200 if price_per_day else 0.0
-            
-        return cls(
-            id=data.get("id"),
-            name=data.get("name", ""),
-            model=data.get("model", ""),
-            year=data.get("year", datetime.now().year),
-            color=data.get("color", ""),
-            license_plate=data.get("licensePlate", ""),
-            price_per_day=float(price_per_day) if price_per_day is not None else 0.0,
-            price=float(price) if price is not None else 0.0,
-            available=bool(data.get("available", True)),
-            for_sale=bool(data.get("forSale", float(price) > 0 if price is not None else False)),
-            for_rent=bool(data.get("forRent", float(price_per_day) > 0 if price_per_day is not None else False)),
-            image_url=data.get("imageUrl", data.get("image_url", "")),
-            description=data.get("description", ""),
-            car_type=data.get("type", "SEDAN")
-        )
+        car = _decode_car(data)
+        # Older records have no sale price or flags: derive them from the daily rate
+        if car.price is None:
+            car.price = car.price_per_day * 200 if car.price_per_day else 0.0
+        if car.for_sale is None:
+            car.for_sale = car.price > 0
+        if car.for_rent is None:
+            car.for_rent = car.price_per_day > 0
+        return car
     
     def __str__(self):
         return f"{self.year} {self.name} {self.model} - {self.color}"
+
+
+_decode_car = compile_decoder(Car, (
+    Field('id', ('id',)),
+    Field('name', ('name',)),
+    Field('model', ('model',)),
+    Field('year', ('year',)),
+    Field('color', ('color',)),
+    Field('license_plate', ('licensePlate',)),
+    Field('price_per_day', ('pricePerDay', 'dailyRate'), float),
+    Field('price', ('price',), float, default=None),
+    Field('available', ('available',), bool),
+    Field('for_sale', ('forSale',), bool, default=None),
+    Field('for_rent', ('forRent',), bool, default=None),
+    Field('image_url', ('imageUrl', 'image_url')),
+    Field('description', ('description',)),
+    Field('car_type', ('type',)),
+))
@@ -0,0 +1,421 @@
+# models/columnar.py
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+DateLike = Union[str, np.datetime64, None]
+
+
+class Column(NamedTuple):
+    """One column of a ``ColumnarTable`` and how to read it from a record.
+
+    ``kind`` is ``"int"``, ``"float"``, ``"date"`` (stored as days since the
+    epoch) or ``"str"`` (dictionary-encoded).
+    """
+    name: str
+    kind: str
+    get: Callable[[Dict[str, Any]], Any]
+
+
+class ColumnarTable:
+    """Immutable table that keeps every column in one NumPy array.
+
+    IDs and prices are int64/float64 arrays and dates are ``datetime64[D]``.
+    String columns are dictionary-encoded: the array holds int32 codes into a
+    list of the distinct values, so a status column costs four bytes per row
+    and comparing it against a value is an integer comparison. Filters return
+    boolean masks, sorts return row positions, and both can be combined with
+    plain NumPy operations. ``patch`` and ``with_values`` return a copy with
+    some records or values replaced; unchanged arrays are shared.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], kinds: Dict[str, str],
+                 dictionaries: Dict[str, List[str]], schema: Sequence[Column] = ()):
+        self._arrays = arrays
+        self._kinds = kinds
+        self._dictionaries = dictionaries
+        self._schema = tuple(schema)
+        self._codes: Dict[str, Dict[str, int]] = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in dictionaries.items()}
+        self._length = len(next(iter(arrays.values()))) if arrays else 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], schema: Sequence[Column]) -> 'ColumnarTable':
+        """Build a table with the columns of ``schema`` from API/local-store records.
+
+        ``records`` is read once, keeping only the column values, so a
+        generator over the local store never has every record in memory.
+        """
+        collected: List[List[Any]] = [[] for _ in schema]
+        readers = [(values.append, column.get) for values, column in zip(collected, schema)]
+        for record in records:
+            for append, get in readers:
+                append(get(record))
+        arrays: Dict[str, np.ndarray] = {}
+        kinds: Dict[str, str] = {}
+        dictionaries: Dict[str, List[str]] = {}
+        for column, values in zip(schema, collected):
+            kinds[column.name] = column.kind
+            if column.kind == "str":
+                arrays[column.name], dictionaries[column.name] = _encode_strings(values)
+            elif column.kind == "date":
+                arrays[column.name] = _parse_dates(values)
+            elif column.kind == "float":
+                arrays[column.name] = np.array([_number(v, float) for v in values], dtype=np.float64)
+            elif column.kind == "int":
+                arrays[column.name] = np.array([_number(v, int) for v in values], dtype=np.int64)
+            else:
+                raise ValueError(f"Unknown column kind {column.kind!r}")
+        return cls(arrays, kinds, dictionaries, schema)
+
+    def patch(self, records: Iterable[Dict[str, Any]] = (),
+              deleted_ids: Iterable[int] = ()) -> 'ColumnarTable':
+        """Return a copy with ``records`` upserted by ``id`` and ``deleted_ids`` removed.
+
+        Records whose ID is already present replace that row in place; new
+        ones are appended. Only the given records are read through the
+        schema, so patching a few rows of a large table costs one copy of
+        its arrays rather than a rebuild from every record.
+        """
+        if not self._schema:
+            raise ValueError("Only tables built by from_records can be patched")
+        records = [record for record in records if record.get('id') is not None]
+        ids = self._arrays['id']
+        arrays = {name: array.copy() for name, array in self._arrays.items()}
+        dictionaries = {name: list(values) for name, values in self._dictionaries.items()}
+        codes = {name: dict(values) for name, values in self._codes.items()}
+
+        # Position of every patched ID that is already in the table
+        wanted = np.array([int(record['id']) for record in records], dtype=np.int64)
+        existing = np.flatnonzero(np.isin(ids, wanted))
+        position = dict(zip(ids[existing].tolist(), existing.tolist()))
+        appended = [record for record in records if int(record['id']) not in position]
+        if appended:
+            extra = len(appended)
+            for name, array in arrays.items():
+                filler = np.full(extra, np.datetime64("NaT", "D")) if self._kinds[name] == "date" \
+                    else np.zeros(extra, dtype=array.dtype)
+                arrays[name] = np.concatenate([array, filler])
+            for offset, record in enumerate(appended):
+                position[int(record['id'])] = self._length + offset
+
+        for record in records:
+            row = position[int(record['id'])]
+            for column in self._schema:
+                value = column.get(record)
+                if column.kind == "str":
+                    text = "" if value is None else str(value)
+                    code = codes[column.name].get(text)
+                    if code is None:
+                        code = codes[column.name][text] = len(dictionaries[column.name])
+                        dictionaries[column.name].append(text)
+                    arrays[column.name][row] = code
+                elif column.kind == "date":
+                    arrays[column.name][row] = _to_day(value)
+                else:
+                    arrays[column.name][row] = _number(value, float if column.kind == "float" else int)
+
+        deleted = np.array(list(deleted_ids), dtype=np.int64)
+        if len(deleted):
+            keep = ~np.isin(arrays['id'], deleted)
+            arrays = {name: array[keep] for name, array in arrays.items()}
+        return ColumnarTable(arrays, dict(self._kinds), dictionaries, self._schema)
+
+    def with_values(self, name: str, rows: np.ndarray, value: Any) -> 'ColumnarTable':
+        """Return a copy with ``name`` set to ``value`` at ``rows`` (a mask or positions).
+
+        Only the array of ``name`` is copied; the other columns are shared
+        with this table.
+        """
+        arrays = dict(self._arrays)
+        dictionaries = dict(self._dictionaries)
+        array = arrays[name] = self._arrays[name].copy()
+        kind = self._kinds[name]
+        if kind == "str":
+            text = "" if value is None else str(value)
+            code = self._codes[name].get(text)
+            if code is None:
+                dictionaries[name] = self._dictionaries[name] + [text]
+                code = len(dictionaries[name]) - 1
+            array[rows] = code
+        elif kind == "date":
+            array[rows] = _to_day(value)
+        else:
+            array[rows] = _number(value, float if kind == "float" else int)
+        return ColumnarTable(arrays, self._kinds, dictionaries, self._schema)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._arrays)
+
+    def array(self, name: str) -> np.ndarray:
+        """Return the raw array of ``name`` (the codes, for string columns)."""
+        return self._arrays[name]
+
+    def dictionary(self, name: str) -> List[str]:
+        """Return the distinct values of the string column ``name`` in code order."""
+        return self._dictionaries[name]
+
+    def categories(self, name: str) -> List[str]:
+        """Return the distinct values of the string column ``name``, sorted."""
+        return sorted(value for value in self._dictionaries[name] if value)
+
+    def value(self, name: str, row: int) -> Any:
+        """Return the value of ``name`` at ``row`` as a Python object."""
+        raw = self._arrays[name][row]
+        kind = self._kinds[name]
+        if kind == "str":
+            return self._dictionaries[name][raw]
+        if kind == "date":
+            return "" if np.isnat(raw) else str(raw)
+        return raw.item()
+
+    def values(self, name: str, rows: Optional[np.ndarray] = None) -> List[Any]:
+        """Return the values of ``name`` (at ``rows``) as Python objects."""
+        raw = self._arrays[name] if rows is None else self._arrays[name][rows]
+        kind = self._kinds[name]
+        if kind == "str":
+            return np.asarray(self._dictionaries[name], dtype=object)[raw].tolist() \
+                if len(self._dictionaries[name]) else [""] * len(raw)
+        if kind == "date":
+            return ["" if np.isnat(day) else str(day) for day in raw]
+        return raw.tolist()
+
+    # Filters (boolean masks over all rows)
+
+    def equals(self, name: str, value: Any) -> np.ndarray:
+        """Mask of the rows where ``name`` equals ``value``."""
+        if self._kinds[name] == "str":
+            code = self._codes[name].get(value)
+            if code is None:
+                return np.zeros(self._length, dtype=bool)
+            return self._arrays[name] == code
+        if self._kinds[name] == "date":
+            return self._arrays[name] == _to_day(value)
+        return self._arrays[name] == value
+
+    def isin(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        """Mask of the rows where ``name`` is one of ``values``."""
+        values = list(values)
+        if self._kinds[name] == "str":
+            codes = [self._codes[name][v] for v in values if v in self._codes[name]]
+            return np.isin(self._arrays[name], np.array(codes, dtype=np.int32))
+        return np.isin(self._arrays[name], values)
+
+    def between(self, name: str, start: DateLike = None, end: DateLike = None) -> np.ndarray:
+        """Mask of the rows where ``name`` lies in ``[start, end]``; either bound may be None.
+
+        Rows without a value in a date column never match.
+        """
+        array = self._arrays[name]
+        if self._kinds[name] == "date":
+            mask = ~np.isnat(array)
+            if start is not None:
+                mask &= array >= _to_day(start)
+            if end is not None:
+                mask &= array <= _to_day(end)
+            return mask
+        mask = np.ones(self._length, dtype=bool)
+        if start is not None:
+            mask &= array >= start
+        if end is not None:
+            mask &= array <= end
+        return mask
+
+    def contains(self, names: Sequence[str], text: str) -> np.ndarray:
+        """Mask of the rows where any of the string columns ``names`` contains ``text``.
+
+        The text is only compared against each column's distinct values; rows
+        are then matched through a lookup table indexed by their codes.
+        """
+        text = text.strip().lower()
+        mask = np.zeros(self._length, dtype=bool)
+        if not text:
+            mask[:] = True
+            return mask
+        for name in names:
+            dictionary = self._dictionaries[name]
+            matches = np.fromiter((text in value.lower() for value in dictionary),
+                                  dtype=bool, count=len(dictionary))
+            if matches.any():
+                mask |= matches[self._arrays[name]]
+        return mask
+
+    # Aggregates and ordering
+
+    def group_sum(self, name: str, weights: Optional[str] = None,
+                  rows: Optional[np.ndarray] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Group ``rows`` by the string column ``name``.
+
+        Returns the group labels, the row count of each group and the sum of the
+        numeric column ``weights`` per group (zeros without ``weights``). Groups
+        without rows are left out.
+        """
+        codes = self._arrays[name] if rows is None else self._arrays[name][rows]
+        size = len(self._dictionaries[name])
+        counts = np.bincount(codes, minlength=size)
+        if weights is None:
+            sums = np.zeros(size)
+        else:
+            values = self._arrays[weights] if rows is None else self._arrays[weights][rows]
+            sums = np.bincount(codes, weights=values, minlength=size)
+        present = np.flatnonzero(counts)
+        labels = [self._dictionaries[name][code] for code in present]
+        return labels, counts[present], sums[present]
+
+    def sum(self, name: str, rows: Optional[np.ndarray] = None) -> float:
+        """Sum the numeric column ``name`` over ``rows`` (a mask or positions), or all rows."""
+        array = self._arrays[name] if rows is None else self._arrays[name][rows]
+        return float(array.sum())
+
+    def order(self, name: str, rows: Optional[np.ndarray] = None,
+              descending: bool = False) -> np.ndarray:
+        """Return ``rows`` (default: all positions) sorted stably by ``name``.
+
+        Strings sort case-insensitively through the rank of their dictionary
+        entry; missing dates sort first.
+        """
+        if rows is None:
+            rows = np.arange(self._length)
+        keys = self.sort_keys(name)[rows]
+        if descending:
+            # Reversing the stable order of the reversed rows keeps ties in row order
+            positions = np.argsort(keys[::-1], kind="stable")[::-1]
+            return rows[::-1][positions]
+        return rows[np.argsort(keys, kind="stable")]
+
+    def sort_keys(self, name: str) -> np.ndarray:
+        """Return an array that sorts like ``name`` (ranks for strings, day numbers for dates)."""
+        array = self._arrays[name]
+        kind = self._kinds[name]
+        if kind == "str":
+            dictionary = self._dictionaries[name]
+            ranks = np.empty(len(dictionary), dtype=np.int32)
+            ranks[sorted(range(len(dictionary)), key=lambda code: dictionary[code].lower())] = \
+                np.arange(len(dictionary), dtype=np.int32)
+            return ranks[array] if len(dictionary) else array
+        if kind == "date":
+            # NaT is the smallest int64
+            return array.astype(np.int64)
+        return array
+
+
+def _encode_strings(values: List[Any]):
+    dictionary: List[str] = []
+    codes_of: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for row, value in enumerate(values):
+        text = "" if value is None else str(value)
+        code = codes_of.get(text)
+        if code is None:
+            code = codes_of[text] = len(dictionary)
+            dictionary.append(text)
+        codes[row] = code
+    return codes, dictionary
+
+
+def _parse_dates(values: List[Any]) -> np.ndarray:
+    # "2024-05-01" and "2024-05-01T10:30:00" both become the day 2024-05-01
+    days = [str(value)[:10] if value else "NaT" for value in values]
+    try:
+        return np.array(days, dtype="datetime64[D]")
+    except ValueError:
+        return np.array([_to_day(day) for day in days], dtype="datetime64[D]")
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    try:
+        return np.datetime64(str(value)[:10], "D") if value else np.datetime64("NaT", "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+def _number(value: Any, kind):
+    try:
+        return kind(value) if value is not None else kind(0)
+    except (TypeError, ValueError):
+        return kind(0)
+
+
+def _car_name(record: Dict[str, Any]) -> str:
+    car = record.get('car')
+    if not isinstance(car, dict):
+        return ""
+    return f"{car.get('name', '')} {car.get('model', '')}".strip()
+
+
+def _car_id(record: Dict[str, Any]) -> Any:
+    # Purchases may only reference their car by ID
+    car = record.get('car')
+    return car.get('id') if isinstance(car, dict) else record.get('carId')
+
+
+def _car_field(name: str, default: Any = None) -> Callable[[Dict[str, Any]], Any]:
+    def get(record: Dict[str, Any]) -> Any:
+        car = record.get('car')
+        return car.get(name, default) if isinstance(car, dict) else default
+    return get
+
+
+def _payment_label(record: Dict[str, Any]) -> str:
+    method = record.get('paymentMethod')
+    return str(method).replace('_', ' ').title() if method else ""
+
+
+RENTAL_SCHEMA = (
+    Column('id', 'int', lambda r: r.get('id')),
+    Column('customer_name', 'str', lambda r: r.get('customerName')),
+    Column('customer_email', 'str', lambda r: r.get('customerEmail')),
+    Column('car_id', 'int', _car_id),
+    Column('car_name', 'str', _car_name),
+    Column('car_type', 'str', _car_field('type', "")),
+    Column('start_date', 'date', lambda r: r.get('startDate')),
+    Column('end_date', 'date', lambda r: r.get('endDate')),
+    Column('period', 'str', lambda r: f"{r.get('startDate') or ''} to {r.get('endDate') or ''}"),
+    Column('status', 'str', lambda r: r.get('status') or "PENDING"),
+    Column('total_price', 'float', lambda r: r.get('totalPrice')),
+)
+
+PURCHASE_SCHEMA = (
+    Column('id', 'int', lambda r: r.get('id')),
+    Column('customer_name', 'str', lambda r: r.get('customerName')),
+    Column('customer_email', 'str', lambda r: r.get('customerEmail')),
+    Column('customer_phone', 'str', lambda r: r.get('customerPhone')),
+    Column('customer_address', 'str', lambda r: r.get('customerAddress')),
+    Column('car_id', 'int', _car_id),
+    Column('car_name', 'str', _car_name),
+    Column('car_type', 'str', _car_field('type', "")),
+    Column('purchase_date', 'date', lambda r: r.get('purchaseDate')),
+    Column('payment_method', 'str', _payment_label),
+    Column('status', 'str', lambda r: r.get('status') or "PENDING"),
+    # Older records only carry the purchase price
+    Column('total_amount', 'float', lambda r: r.get('totalAmount') or r.get('purchasePrice')),
+)
+
+CAR_SCHEMA = (
+    Column('id', 'int', lambda r: r.get('id')),
+    Column('name', 'str', lambda r: f"{r.get('name') or ''} {r.get('model') or ''}".strip()),
+    Column('car_type', 'str', lambda r: r.get('type')),
+    # The server sends dailyRate; pricePerDay is the client's own name for it
+    Column('price_per_day', 'float', lambda r: r.get('pricePerDay', r.get('dailyRate'))),
+    Column('price', 'float', lambda r: r.get('price')),
+    Column('available', 'str', lambda r: "YES" if r.get('available', True) else "NO"),
+)
+
+
+def car_table(records: Iterable[Dict[str, Any]]) -> ColumnarTable:
+    return ColumnarTable.from_records(records, CAR_SCHEMA)
+
+
+def rental_table(records: Iterable[Dict[str, Any]]) -> ColumnarTable:
+    return ColumnarTable.from_records(records, RENTAL_SCHEMA)
+
+
+def purchase_table(records: Iterable[Dict[str, Any]]) -> ColumnarTable:
+    return ColumnarTable.from_records(records, PURCHASE_SCHEMA)
@@ -0,0 +1,82 @@
+# models/decoder.py
+import dataclasses
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+
+class Field(NamedTuple):
+    """How one model attribute is read from an API record.
+
+    ``keys`` are tried in order and the first value that is not None is passed
+    through ``convert``. When every key is missing the attribute gets
+    ``default``, or the dataclass default if no ``default`` is given.
+    """
+    name: str
+    keys: Tuple[str, ...]
+    convert: Optional[Callable[[Any], Any]] = None
+    default: Any = dataclasses.MISSING
+
+
+def compile_decoder(cls: Type[T], fields: Sequence[Field]) -> Callable[[Mapping[str, Any]], T]:
+    """Generate a function that builds ``cls`` objects from API records.
+
+    The key lookups of every field are unrolled into straight-line code and the
+    object is filled in without calling ``__init__``, so decoding a record costs
+    one ``dict.get`` per key and one attribute store per field. Attributes of
+    the dataclass that are not in ``fields`` are set to their defaults.
+    """
+    specs = {spec.name: spec for spec in fields}
+    model_fields = {f.name: f for f in dataclasses.fields(cls)}
+    unknown = set(specs) - set(model_fields)
+    if unknown:
+        raise ValueError(f"{cls.__name__} has no fields {sorted(unknown)}")
+
+    namespace: Dict[str, Any] = {'_new': object.__new__, '_cls': cls}
+    lines: List[str] = ["def decode(data):", "    get = data.get", "    obj = _new(_cls)"]
+    for index, (name, model_field) in enumerate(model_fields.items()):
+        spec = specs.get(name)
+        default = _default_expression(model_field, spec, index, namespace)
+        if spec is None:
+            lines.append(f"    obj.{name} = {default}")
+            continue
+
+        lines.append(f"    v = get({spec.keys[0]!r})")
+        for key in spec.keys[1:]:
+            lines.append("    if v is None:")
+            lines.append(f"        v = get({key!r})")
+        value = "v"
+        if spec.convert is not None:
+            namespace[f"_c{index}"] = spec.convert
+            value = f"_c{index}(v)"
+        lines.append(f"    obj.{name} = {default} if v is None else {value}")
+    lines.append("    return obj")
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<decoder {cls.__name__}>", "exec"), namespace)
+    decode = namespace['decode']
+    decode.__qualname__ = f"{cls.__name__}.decode"
+    decode.__source__ = source
+    return decode
+
+
+def _default_expression(model_field: dataclasses.Field, spec: Optional[Field],
+                        index: int, namespace: Dict[str, Any]) -> str:
+    if spec is not None and spec.default is not dataclasses.MISSING:
+        namespace[f"_d{index}"] = spec.default
+        return f"_d{index}"
+    if model_field.default is not dataclasses.MISSING:
+        namespace[f"_d{index}"] = model_field.default
+        return f"_d{index}"
+    if model_field.default_factory is not dataclasses.MISSING:
+        namespace[f"_f{index}"] = model_field.default_factory
+        return f"_f{index}()"
+    raise ValueError(f"Field {model_field.name!r} needs a default to be decoded")
+
+
+def to_int(value: Any) -> int:
+    """Convert IDs that may arrive as strings; unusable values become 0."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
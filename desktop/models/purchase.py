@@ -3,11 +3,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, Union, TYPE_CHECKING
-import json
+import logging
+
+from .decoder import Field, compile_decoder, to_int
 
 if TYPE_CHECKING:
     from services.api_service import ApiService  # only for type hints
-@dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class Purchase:
     id: int = 0
     customer_name: str = ""
@@ -15,47 +21,31 @@ class Purchase:
     customer_phone: str = ""
     customer_address: str = ""
     car: Dict[str, Any] = field(default_factory=dict)
+    car_id: int = 0
     purchase_date: str = ""
     status: str = "PENDING"
     payment_method: str = ""
     purchase_price: float = 0.0
     total_amount: float = 0.0
     created_at: str = ""
-    
-    # Add camelCase fields for API compatibility
-    customerName: str = field(init=False, repr=False)
-    customerEmail: str = field(init=False, repr=False)
-    customerPhone: str = field(init=False, repr=False)
-    customerAddress: str = field(init=False, repr=False)
-    purchaseDate: str = field(init=False, repr=False)
-    paymentMethod: str = field(init=False, repr=False)
-    purchasePrice: float = field(init=False, repr=False)
-    totalAmount: float = field(init=False, repr=False)
-    createdAt: str = field(init=False, repr=False)
-    carId: int = field(init=False, repr=False, default=0)
     _car: Dict[str, Any] = field(init=False, repr=False, default_factory=dict)
     _api_service: Optional[ApiService] = field(init=False, repr=False, default=None)
     
     @property
     def car_name(self) -> str:
         """Get the car name from the car dictionary."""
-        if not self.car:
-            # If no car data but we have a car_id, try to fetch it
-            if self.car_id and self._api_service:
-                self._fetch_car_details()
-            return ""
-        
-        if isinstance(self.car, dict):
-            name = self.car.get('name', '')
-            model = self.car.get('model', '')
+        car = self.car or self._car
+        if isinstance(car, dict):
+            name = car.get('name', '')
+            model = car.get('model', '')
         else:
-            name = getattr(self.car, 'name', '')
-            model = getattr(self.car, 'model', '')
+            name = getattr(car, 'name', '')
+            model = getattr(car, 'model', '')
         
         result = f"{name} {model}".strip()
         
-        # If still empty and we have a car_id, try to fetch
-        if not result and self.car_id and self._api_service:
+        # If still empty and we have a car_id, resolve it through the shared lookup
+        if not result and self.car_id and self._api_service and not self._car:
             self._fetch_car_details()
             # Retry getting name and model after fetching
             if self._car:
@@ -69,130 +59,70 @@ class Purchase:
         
         return result
     
-    def __post_init__(self):
-        """Handle both snake_case and camelCase field names."""
-        # Initialize all fields with empty/default values if not already set
-        if not hasattr(self, 'customer_name'): self.customer_name = ""
-        if not hasattr(self, 'customer_email'): self.customer_email = ""
-        if not hasattr(self, 'customer_phone'): self.customer_phone = ""
-        if not hasattr(self, 'customer_address'): self.customer_address = ""
-        if not hasattr(self, 'purchase_date'): self.purchase_date = ""
-        if not hasattr(self, 'payment_method'): self.payment_method = ""
-        if not hasattr(self, 'purchase_price'): self.purchase_price = 0.0
-        if not hasattr(self, 'total_amount'): self.total_amount = 0.0
-        if not hasattr(self, 'created_at'): self.created_at = ""
-        if not hasattr(self, 'car_id'): self.car_id = 0
-
-        # Handle camelCase to snake case
-        if hasattr(self, 'customerName'):
-            self.customer_name = getattr(self, 'customerName')
-        if hasattr(self, 'customerEmail'):
-            self.customer_email = getattr(self, 'customerEmail')
-        if hasattr(self, 'customerPhone'):
-            self.customer_phone = getattr(self, 'customerPhone')
-        if hasattr(self, 'customerAddress'):
-            self.customer_address = getattr(self, 'customerAddress')
-        if hasattr(self, 'purchaseDate'):
-            self.purchase_date = getattr(self, 'purchaseDate')
-        if hasattr(self, 'paymentMethod'):
-            self.payment_method = getattr(self, 'paymentMethod')
-        if hasattr(self, 'purchasePrice'):
-            self.purchase_price = float(getattr(self, 'purchasePrice'))
-        if hasattr(self, 'totalAmount'):
-            self.total_amount = float(getattr(self, 'totalAmount'))
-        if hasattr(self, 'createdAt'):
-            self.created_at = getattr(self, 'createdAt')
-        if hasattr(self, 'carId'):
-            self.car_id = getattr(self, 'carId')
-            
-        # If total_amount is not set but purchase_price is, use purchase_price
-        if not self.total_amount and self.purchase_price:
-            self.total_amount = self.purchase_price
-            
-        # If we have a car_id but no car data, try to get it from the car field
-        if (self.car_id and (not hasattr(self, 'car') or not self.car) and 
-            hasattr(self, '_api_service') and self._api_service):
-            self._fetch_car_details()
-    
     @classmethod
     def from_dict(cls, data: Dict[str, Any], api_service: Optional[ApiService] = None) -> 'Purchase':
-        """Create a Purchase object from a dictionary."""
-        instance = cls()
-        
-        if api_service:
-            instance._api_service = api_service
+        """Create a Purchase object from a dictionary (camelCase or snake_case keys)."""
+        instance = _decode_purchase(data)
+        instance._api_service = api_service
         
-        field_mapping = {
-            'id': 'id',
-            'customerName': 'customer_name',
-            'customerEmail': 'customer_email',
-            'customerPhone': 'customer_phone',
-            'customerAddress': 'customer_address',
-            'purchaseDate': 'purchase_date',
-            'paymentMethod': 'payment_method',
-            'purchasePrice': 'purchase_price',
-            'totalAmount': 'total_amount',
-            'createdAt': 'created_at',
-            'carId': 'car_id',
-            'status': 'status'
-        }
+        # "car" is either the embedded car record or just its ID
+        if instance.car.get('id'):
+            instance.car_id = to_int(instance.car['id'])
+        elif not instance.car_id and isinstance(data.get('car'), int):
+            instance.car_id = data['car']
         
-        for key, value in data.items():
-            if value is None:
-                continue
-                
-            if key == 'car' and value:
-                if isinstance(value, dict) and 'id' in value:
-                    instance.car = value
-                    instance.car_id = value['id']
-                elif isinstance(value, int):
-                    instance.car_id = value
-                continue
-                
-            if key in field_mapping:
-                target_field = field_mapping[key]
-                if key == 'id' and value is not None:
-                    try:
-                        value = int(value) if str(value).strip() else 0
-                    except (ValueError, TypeError):
-                        value = 0
-                setattr(instance, target_field, value)
-            else:
-                setattr(instance, key, value)
-                
-        if hasattr(instance, 'car') and instance.car and 'id' in instance.car and not instance.car_id:
-            instance.car_id = instance.car['id']
-        
-        # If we have a car_id but no car data, and we have an API service, fetch the car details
-        if instance.car_id and (not hasattr(instance, '_car') or not instance._car) and api_service:
-            instance._fetch_car_details()
-        
-        # Format payment method if it exists
-        if hasattr(instance, 'payment_method') and instance.payment_method:
-            instance.payment_method = str(instance.payment_method).replace('_', ' ').title()
-        
-        # Call post_init to handle field mapping
-        instance.__post_init__()
+        # Car details are attached in bulk by ApiService.get_purchases; missing
+        # ones are looked up lazily through the shared car lookup in car_name.
         
+        if not instance.total_amount and instance.purchase_price:
+            instance.total_amount = instance.purchase_price
         return instance
     
     def set_api_service(self, api_service: ApiService):
         """Set the API service for fetching car details."""
         self._api_service = api_service
-        if self.car_id and not self._car:
-            self._fetch_car_details()
     
     def _fetch_car_details(self):
-        """Fetch car details from the API using the car ID."""
+        """Fetch car details through the API service's shared car lookup."""
         if not self.car_id or not self._api_service:
             return
             
         try:
-            car_data = self._api_service.get_car(self.car_id)
+            lookup = getattr(self._api_service, 'car_lookup', None)
+            if lookup is not None:
+                car_data = lookup.get(self.car_id)
+            else:
+                car_data = self._api_service.get_car(self.car_id)
             if car_data:
                 self._car = car_data
         except Exception as e:
-            print(f"Error fetching car details: {e}")
+            logger.warning("Error fetching car %s for purchase %s: %s", self.car_id, self.id, e)
     
     def __str__(self) -> str:
-        return f"Purchase(id={self.id}, customer='{self.customer_name}', car='{self.car_name}', amount=${self.total_amount:.2f}, status='{self.status}')"
\ No newline at end of file
+        return f"Purchase(id={self.id}, customer='{self.customer_name}', car='{self.car_name}', amount=${self.total_amount:.2f}, status='{self.status}')"
+
+
+def _car_record(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _payment_label(value: Any) -> str:
+    # "CREDIT_CARD" -> "Credit Card"
+    return str(value).replace('_', ' ').title()
+
+
+_decode_purchase = compile_decoder(Purchase, (
+    Field('id', ('id',), to_int),
+    Field('customer_name', ('customerName', 'customer_name')),
+    Field('customer_email', ('customerEmail', 'customer_email')),
+    Field('customer_phone', ('customerPhone', 'customer_phone')),
+    Field('customer_address', ('customerAddress', 'customer_address')),
+    Field('car', ('car',), _car_record),
+    Field('car_id', ('carId', 'car_id'), to_int),
+    Field('purchase_date', ('purchaseDate', 'purchase_date')),
+    Field('status', ('status',)),
+    Field('payment_method', ('paymentMethod', 'payment_method'), _payment_label),
+    Field('purchase_price', ('purchasePrice', 'purchase_price'), float),
+    Field('total_amount', ('totalAmount', 'total_amount'), float),
+    Field('created_at', ('createdAt', 'created_at')),
+))
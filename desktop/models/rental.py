@@ -1,41 +1,20 @@
 # models/rental.py
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
-import json
 
-@dataclass
+from .decoder import Field, compile_decoder, to_int
+
+@dataclass(slots=True)
 class Rental:
     id: int = 0
     customer_name: str = ""
     customer_email: str = ""
-    customerName: str = field(init=False, repr=False)
-    customerEmail: str = field(init=False, repr=False)
     car: Dict[str, Any] = field(default_factory=dict)
     start_date: str = ""
     end_date: str = ""
-    startDate: str = field(init=False, repr=False)
-    endDate: str = field(init=False, repr=False)
     status: str = "PENDING"
     total_price: float = 0.0
-    totalPrice: float = field(init=False, repr=False)
     created_at: str = ""
-    createdAt: str = field(init=False, repr=False)
-    
-    def __post_init__(self):
-        """Handle both snake_case and camelCase field names."""
-        # Handle camelCase to snake_case
-        if hasattr(self, 'customerName'):
-            self.customer_name = getattr(self, 'customerName', self.customer_name)
-        if hasattr(self, 'customerEmail'):
-            self.customer_email = getattr(self, 'customerEmail', self.customer_email)
-        if hasattr(self, 'startDate'):
-            self.start_date = getattr(self, 'startDate', self.start_date)
-        if hasattr(self, 'endDate'):
-            self.end_date = getattr(self, 'endDate', self.end_date)
-        if hasattr(self, 'totalPrice'):
-            self.total_price = float(getattr(self, 'totalPrice', self.total_price))
-        if hasattr(self, 'createdAt'):
-            self.created_at = getattr(self, 'createdAt', self.created_at)
     
     @property
     def car_name(self) -> str:
@@ -55,18 +34,8 @@ class Rental:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Rental':
-        """Create a Rental instance from a dictionary."""
-        return cls(**{
-            'id': data.get('id', 0),
-            'customer_name': data.get('customerName', data.get('customer_name', '')),
-            'customer_email': data.get('customerEmail', data.get('customer_email', '')),
-            'car': data.get('car', {}),
-            'start_date': data.get('startDate', data.get('start_date', '')),
-            'end_date': data.get('endDate', data.get('end_date', '')),
-            'status': data.get('status', 'PENDING'),
-            'total_price': float(data.get('totalPrice', data.get('total_price', 0.0))),
-            'created_at': data.get('createdAt', data.get('created_at', ''))
-        })
+        """Create a Rental instance from a dictionary (camelCase or snake_case keys)."""
+        return _decode_rental(data)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary with camelCase keys for JSON serialization."""
@@ -83,4 +52,17 @@ class Rental:
         }
     
     def __str__(self) -> str:
-        return f"Rental(id={self.id}, customer='{self.customer_name}', car='{self.car_name}', status='{self.status}')"
\ No newline at end of file
+        return f"Rental(id={self.id}, customer='{self.customer_name}', car='{self.car_name}', status='{self.status}')"
+
+
+_decode_rental = compile_decoder(Rental, (
+    Field('id', ('id',), to_int),
+    Field('customer_name', ('customerName', 'customer_name')),
+    Field('customer_email', ('customerEmail', 'customer_email')),
+    Field('car', ('car',)),
+    Field('start_date', ('startDate', 'start_date')),
+    Field('end_date', ('endDate', 'end_date')),
+    Field('status', ('status',)),
+    Field('total_price', ('totalPrice', 'total_price'), float),
+    Field('created_at', ('createdAt', 'created_at')),
+))
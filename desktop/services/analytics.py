@@ -0,0 +1,205 @@
+# services/analytics.py
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from models.columnar import ColumnarTable
+
+# Rentals in these states never occupied a car
+INACTIVE_RENTAL_STATUSES = ("CANCELLED", "REJECTED")
+
+TIME_GROUPINGS = ("day", "week", "month")
+
+
+class Aggregate(NamedTuple):
+    """Result of one report: a label, a row count and a value per group."""
+    labels: List[str]
+    counts: np.ndarray
+    values: np.ndarray
+
+    def rows(self) -> List[Tuple[str, int, float]]:
+        return list(zip(self.labels, self.counts.tolist(), self.values.tolist()))
+
+    @property
+    def total_count(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def total_value(self) -> float:
+        return float(self.values.sum())
+
+
+class Analytics:
+    """Revenue, utilization and sales reports over columnar rentals/purchases.
+
+    Every report is a vectorized group-by over the ``ColumnarTable`` columns:
+    dates are bucketed by day, ISO week (starting Monday) or month, and string
+    columns are grouped through their dictionary codes with ``np.bincount``.
+    Results are cached per combination of report, grouping and filters; build
+    a new ``Analytics`` when the data changes.
+    """
+
+    REPORTS: Dict[str, Tuple[str, ...]] = {
+        'rental_revenue': TIME_GROUPINGS + ("car_type", "car", "status"),
+        'utilization': TIME_GROUPINGS + ("car_type",),
+        'purchase_totals': TIME_GROUPINGS + ("payment_method", "car_type", "status"),
+    }
+
+    def __init__(self, rentals: ColumnarTable, purchases: ColumnarTable, cars: ColumnarTable,
+                 cache_size: int = 64):
+        self.rentals = rentals
+        self.purchases = purchases
+        self.cars = cars
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Aggregate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def without_cars(self, car_ids) -> 'Analytics':
+        """Return the same reports without ``car_ids`` and their rentals and purchases."""
+        car_ids = list(car_ids)
+        rentals, purchases = (table.patch(deleted_ids=table.values('id', table.isin('car_id', car_ids)))
+                              for table in (self.rentals, self.purchases))
+        return Analytics(rentals, purchases, self.cars.patch(deleted_ids=car_ids), self.cache_size)
+
+    def report(self, name: str, group_by: str, start: Optional[str] = None,
+               end: Optional[str] = None, status: Optional[str] = None) -> Aggregate:
+        """Run report ``name`` (a key of ``REPORTS``) grouped by ``group_by``.
+
+        ``start``/``end`` are ISO dates bounding the rental start or purchase
+        date (inclusive); ``status`` keeps only rentals/purchases in that state.
+        """
+        if group_by not in self.REPORTS.get(name, ()):
+            raise ValueError(f"Report {name!r} cannot be grouped by {group_by!r}")
+        key = (name, group_by, start, end, status)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        if name == 'rental_revenue':
+            result = self.rental_revenue(group_by, start, end, status)
+        elif name == 'utilization':
+            result = self.utilization(group_by, start, end)
+        else:
+            result = self.purchase_totals(group_by, start, end, status)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def rental_revenue(self, group_by: str, start: Optional[str] = None,
+                       end: Optional[str] = None, status: Optional[str] = None) -> Aggregate:
+        """Sum of ``total_price`` of the rentals starting in ``[start, end]``."""
+        rows = self._rows(self.rentals, 'start_date', start, end, status)
+        if group_by == "car":
+            group_by = "car_name"
+        return self._group(self.rentals, group_by, 'start_date', 'total_price', rows)
+
+    def purchase_totals(self, group_by: str, start: Optional[str] = None,
+                        end: Optional[str] = None, status: Optional[str] = None) -> Aggregate:
+        """Sum of ``total_amount`` of the purchases made in ``[start, end]``."""
+        rows = self._rows(self.purchases, 'purchase_date', start, end, status)
+        return self._group(self.purchases, group_by, 'purchase_date', 'total_amount', rows)
+
+    def utilization(self, group_by: str, start: Optional[str] = None,
+                    end: Optional[str] = None) -> Aggregate:
+        """Share of available car-days that were rented, per period or car type.
+
+        Every active rental occupies its car from the start to the end date
+        (inclusive). The counts are the rented car-days; the values divide
+        them by the fleet size (of that car type) times the days in the group.
+        """
+        table = self.rentals
+        starts, ends = table.array('start_date'), table.array('end_date')
+        active = ~np.isnat(starts) & ~np.isnat(ends) & \
+            ~table.isin('status', INACTIVE_RENTAL_STATUSES)
+        if not active.any():
+            return _empty()
+        first = np.datetime64(start, 'D') if start else starts[active].min()
+        last = np.datetime64(end, 'D') if end else ends[active].max()
+        if last < first:
+            return _empty()
+
+        # Clip each rental to the reporting period; rentals outside it get no days
+        clipped_starts = np.maximum(starts[active], first)
+        clipped_ends = np.minimum(ends[active], last)
+        lengths = np.maximum((clipped_ends - clipped_starts).astype(np.int64) + 1, 0)
+        period_days = int((last - first).astype(np.int64)) + 1
+
+        if group_by == "car_type":
+            codes = table.array('car_type')[active]
+            names = table.dictionary('car_type')
+            rented = np.bincount(codes, weights=lengths, minlength=len(names))
+            fleet_labels, fleet_counts, _ = self.cars.group_sum('car_type')
+            fleet = dict(zip(fleet_labels, fleet_counts.tolist()))
+            labels = sorted(set(fleet) | {names[code] for code in np.flatnonzero(rented)})
+            rented_by_label = {names[code]: rented[code] for code in range(len(names))}
+            counts = np.array([rented_by_label.get(label, 0) for label in labels], dtype=np.int64)
+            capacity = np.array([fleet.get(label, 0) for label in labels], dtype=np.float64) * period_days
+            return Aggregate([label or "Unknown" for label in labels], counts,
+                             _ratio(counts, capacity))
+
+        # Expand the rentals into one entry per rented day, then bucket the days
+        total = int(lengths.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        rented_days = np.repeat(clipped_starts, lengths) + offsets
+        keys, counts = np.unique(_bucket(rented_days, group_by), return_counts=True)
+        period_keys, period_counts = np.unique(
+            _bucket(np.arange(first, last + 1), group_by), return_counts=True)
+        capacity = period_counts.astype(np.float64) * len(self.cars)
+        # Every rented day lies in the period, so its bucket is one of the period's
+        occupied = np.zeros(len(period_keys), dtype=np.int64)
+        occupied[np.searchsorted(period_keys, keys)] = counts
+        return Aggregate(_labels(period_keys), occupied, _ratio(occupied, capacity))
+
+    # Internals
+
+    @staticmethod
+    def _rows(table: ColumnarTable, date_column: str, start: Optional[str],
+              end: Optional[str], status: Optional[str]) -> np.ndarray:
+        mask = table.between(date_column, start, end) if (start or end) \
+            else np.ones(len(table), dtype=bool)
+        if status:
+            mask &= table.equals('status', status)
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def _group(table: ColumnarTable, group_by: str, date_column: str, value_column: str,
+               rows: np.ndarray) -> Aggregate:
+        if group_by in TIME_GROUPINGS:
+            dates = table.array(date_column)[rows]
+            dated = ~np.isnat(dates)
+            keys, inverse = np.unique(_bucket(dates[dated], group_by), return_inverse=True)
+            values = table.array(value_column)[rows][dated]
+            counts = np.bincount(inverse, minlength=len(keys))
+            sums = np.bincount(inverse, weights=values, minlength=len(keys))
+            return Aggregate(_labels(keys), counts, sums)
+        labels, counts, sums = table.group_sum(group_by, value_column, rows)
+        order = np.argsort(-sums, kind="stable")
+        return Aggregate([labels[i] or "Unknown" for i in order], counts[order], sums[order])
+
+
+def _bucket(days: np.ndarray, group_by: str) -> np.ndarray:
+    if group_by == "week":
+        # 1970-01-01 was a Thursday: shift every day back to its Monday
+        return days - (days.astype(np.int64) + 3) % 7
+    if group_by == "month":
+        return days.astype('datetime64[M]')
+    return days
+
+
+def _labels(keys: np.ndarray) -> List[str]:
+    return np.datetime_as_string(keys).tolist() if len(keys) else []
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def _empty() -> Aggregate:
+    return Aggregate([], np.zeros(0, dtype=np.int64), np.zeros(0))
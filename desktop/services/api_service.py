@@ -2,55 +2,170 @@
 from __future__ import annotations
 
 import json
-import os
-import sys
-import requests
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, List, Optional, Dict, Any, TYPE_CHECKING
 
-# Add the project root to the Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
-# Now we can use absolute imports
-from desktop.models.purchase import Purchase
+import config
+from models.purchase import Purchase
+from services.car_lookup import CarLookup
+from services.http_cache import HttpCache
+from services.json_stream import iter_array, iter_response
 
 if TYPE_CHECKING:
-    from desktop.models.rental import Rental
+    from models.rental import Rental
+    from services.http_transport import HttpTransport
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Page:
+    """One page of a paged list endpoint."""
+    items: List[Dict[str, Any]]
+    number: int
+    size: int
+    total_elements: int
+    total_pages: int
+    
+    @property
+    def is_last(self) -> bool:
+        return self.number + 1 >= self.total_pages
+    
+    @classmethod
+    def from_response(cls, data: Any, number: int = 0, size: int = 0) -> 'Page':
+        """Read the page shapes Spring may return (paged DTO, raw ``PageImpl``, HAL or a plain list)."""
+        if isinstance(data, list):
+            return cls(data, 0, len(data), len(data), 1)
+        if not isinstance(data, dict):
+            return cls([], number, size, 0, 0)
+        
+        if 'content' in data:
+            items = data['content']
+        elif '_embedded' in data:
+            # HAL: the collection is the single list inside "_embedded"
+            items = next((v for v in data['_embedded'].values() if isinstance(v, list)), [])
+        else:
+            items = []
+        meta = data.get('page') if isinstance(data.get('page'), dict) else data
+        return cls(
+            items=items,
+            number=int(meta.get('number', number)),
+            size=int(meta.get('size', size)),
+            total_elements=int(meta.get('totalElements', len(items))),
+            total_pages=int(meta.get('totalPages', 1)),
+        )
+
 
 class ApiService:
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(self, base_url: str = config.API_URL, http_cache: Optional[HttpCache] = None,
+                 transport: Optional[HttpTransport] = None):
         # Ensure base_url doesn't end with /api to avoid double /api in paths
         self.base_url = base_url.rstrip('/')
         if self.base_url.endswith('/api'):
             self.base_url = self.base_url[:-4]
-        self.session = requests.Session()
+        # Pooled keep-alive connections and per-endpoint timeouts; pass a shared
+        # transport so every service reuses the same connections
+        self._transport = transport
+        self._transport_lock = threading.Lock()
+        self.car_lookup = CarLookup(self)
+        # GET responses, revalidated with ETags once their TTL runs out; pass a
+        # shared cache so writes made through one service invalidate the others
+        self.http_cache = http_cache or HttpCache()
+    
+    @property
+    def transport(self) -> HttpTransport:
+        """The HTTP transport, created on first use.
+        
+        ``requests`` takes longer to import than the rest of the client, so
+        it is loaded by the first request (on a worker thread) instead of
+        delaying the window.
+        """
+        if self._transport is None:
+            with self._transport_lock:
+                if self._transport is None:
+                    from services.http_transport import HttpTransport
+                    self._transport = HttpTransport()
+        return self._transport
+    
+    @property
+    def session(self):
+        return self.transport.session
         
     def _make_request(self, method: str, endpoint: str, **kwargs):
-        """Helper method to make HTTP requests with error handling."""
+        """Helper method to make HTTP requests with error handling.
+        
+        GET responses go through ``http_cache``: fresh entries are served
+        without a request and stale ones are revalidated. Streamed GETs are
+        revalidated the same way but their body is stored by ``iter_records``
+        once it has been read. Successful writes
+        invalidate the cached responses of the touched collection. The
+        transport retries what is safe to retry; when the backend still fails
+        (or its circuit breaker is open) a stale cached GET response is
+        served rather than nothing.
+        """
+        import requests
+        from services.resilience import CircuitOpenError
+        
+        transport = self.transport
         url = f"{self.base_url}{endpoint}"
+        entry = None
+        if method == 'GET':
+            url = requests.Request(method, url, params=kwargs.pop('params', None)).prepare().url
+            entry = self.http_cache.lookup(url)
+            if entry is not None:
+                if entry.is_fresh():
+                    return entry.response
+                kwargs['headers'] = {**self.http_cache.conditional_headers(entry),
+                                     **kwargs.get('headers', {})}
         try:
-            print(f"Making {method} request to {url}")  # Debug log
+            logger.debug("%s %s", method, url)
             if 'json' in kwargs:
-                print(f"Request data: {kwargs['json']}")  # Debug log
-                
-            response = self.session.request(method, url, **kwargs)
+                logger.debug("Request data: %s", kwargs['json'])
+            
+            started = time.perf_counter()
+            response = transport.request(method, url, endpoint, **kwargs)
             
-            # Log response status and content for debugging
-            print(f"Response status: {response.status_code}")
-            if response.status_code >= 400:  # Log error responses
-                print(f"Error response: {response.text}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s %s -> %s", method, url, response.status_code,
+                             extra={'method': method, 'endpoint': endpoint,
+                                    'status': response.status_code,
+                                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)})
                 
             response.raise_for_status()
+            
+            if method == 'GET':
+                if entry is not None and response.status_code == 304:
+                    response.close()
+                    return self.http_cache.revalidated(entry, response)
+                if kwargs.get('stream'):
+                    return response
+                return self.http_cache.store(url, response) or response
+            self.http_cache.invalidate(endpoint)
             return response
             
         except requests.exceptions.HTTPError as e:
-            error_msg = f"HTTP Error: {e.response.status_code} - {e.response.text}"
-            print(f"API request failed: {error_msg}")
+            logger.warning("%s %s failed: HTTP %s - %s", method, url,
+                           e.response.status_code, e.response.text,
+                           extra={'method': method, 'endpoint': endpoint,
+                                  'status': e.response.status_code})
+            if entry is not None and e.response.status_code >= 500:
+                logger.info("Serving the cached response for %s", url)
+                return entry.response
             return e.response  # Return the response even on error
             
+        except CircuitOpenError as e:
+            logger.debug("%s", e, extra={'method': method, 'endpoint': endpoint})
+            return entry.response if entry is not None else None
+            
         except requests.exceptions.RequestException as e:
-            error_msg = f"Request failed: {str(e)}"
-            print(f"API request failed: {error_msg}")
+            logger.error("%s %s failed: %s", method, url, e,
+                         extra={'method': method, 'endpoint': endpoint})
+            if entry is not None:
+                logger.info("Serving the cached response for %s", url)
+                return entry.response
             return None
     
     # Generic HTTP methods
@@ -69,96 +184,241 @@ class ApiService:
         
     def delete(self, endpoint: str, **kwargs):
         return self._make_request('DELETE', endpoint, **kwargs)
+    
+    def get_stream(self, endpoint: str, **kwargs):
+        """GET ``endpoint`` without reading the body; the caller must close the response."""
+        return self._make_request('GET', endpoint, stream=True, **kwargs)
+    
+    def iter_records(self, endpoint: str, key: Optional[str] = None,
+                     fields: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[Any]:
+        """Yield the elements of a JSON list response while it downloads.
         
+        The list is the whole body or the member ``key`` of a body object; the
+        other members end up in ``fields``. Nothing is yielded on errors.
+        A body read to the end (and no larger than
+        ``HttpCache.MAX_STREAMED_BODY``) is cached, so the next call is a
+        conditional request; unchanged lists and failed requests are then
+        served from the cache.
+        """
+        response = self.get_stream(endpoint, **kwargs)
+        if response is None:
+            return
+        try:
+            if response.status_code != 200:
+                return
+            if getattr(response, 'from_cache', False):
+                yield from iter_response(response, key, fields)
+                return
+            body: Optional[List[bytes]] = []
+            
+            def recorded(chunks):
+                nonlocal body
+                size = 0
+                for chunk in chunks:
+                    if body is not None:
+                        size += len(chunk)
+                        if size > self.http_cache.MAX_STREAMED_BODY:
+                            body = None
+                        else:
+                            body.append(chunk)
+                    yield chunk
+            
+            yield from iter_array(recorded(response.iter_content(chunk_size=64 * 1024)), key, fields)
+            if body is not None:
+                self.http_cache.store(response.url, response, b"".join(body))
+        finally:
+            response.close()
+        
+    # Paging
+    def get_page(self, endpoint: str, page: int = 0, size: int = 100,
+                 sort: Optional[str] = None, **filters) -> Optional[Page]:
+        """Fetch one page from a paged list endpoint such as ``/api/rentals/page``.
+        
+        ``sort`` uses Spring's ``property,asc|desc`` form; ``filters`` are sent as
+        query parameters (``None`` values are skipped, dates sent as ISO strings).
+        """
+        params: Dict[str, Any] = {'page': page, 'size': size}
+        if sort:
+            params['sort'] = sort
+        for key, value in filters.items():
+            if value is None:
+                continue
+            params[key] = value.isoformat() if isinstance(value, date) else value
+        
+        response = self.get(endpoint, params=params)
+        if response is None or response.status_code != 200:
+            return None
+        return Page.from_response(response.json(), page, size)
+    
+    def iter_pages(self, endpoint: str, size: int = 100, sort: Optional[str] = None,
+                   **filters) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the records of a paged endpoint one page at a time."""
+        number = 0
+        while True:
+            page = self.get_page(endpoint, number, size, sort, **filters)
+            if page is None:
+                return
+            if page.items:
+                yield page.items
+            if page.is_last or not page.items:
+                return
+            number += 1
+    
     def get_rentals(self) -> List[Rental]:
         """Fetch all rentals from the API."""
-        from desktop.models.rental import Rental
-        response = self.get("/api/rentals")
-        if response and response.status_code == 200:
-            return [Rental.from_dict(rental) for rental in response.json()]
-        return []
+        return list(self.iter_rentals())
+    
+    def iter_rentals(self) -> Iterator[Rental]:
+        """Yield the rentals one by one as the list response is downloaded."""
+        from models.rental import Rental
+        for record in self.iter_records("/api/rentals"):
+            if isinstance(record, dict):
+                yield Rental.from_dict(record)
+    
+    def build_rentals(self, records: List[Dict[str, Any]]) -> List[Rental]:
+        """Create Rental objects from raw API (or local store) records."""
+        from models.rental import Rental
+        return [Rental.from_dict(rental) for rental in records]
     
     def update_rental_status(self, rental_id: int, status: str) -> bool:
         """Update the status of a rental."""
         try:
-            print(f"[API] Updating rental {rental_id} status to {status}")
+            logger.info("Updating rental %s status to %s", rental_id, status)
             
             # Simple PUT request to update status
-            url = f"{self.base_url}/api/rentals/{rental_id}/status"
-            print(f"[API] Sending status update to: {url}")
+            endpoint = f"/api/rentals/{rental_id}/status"
             
-            response = self.session.put(
-                url,
+            response = self.transport.request(
+                'PUT', f"{self.base_url}{endpoint}", endpoint,
                 json={"status": status},
                 headers={"Content-Type": "application/json"}
             )
             
-            print(f"[API] Status code: {response.status_code}")
-            print(f"[API] Response: {response.text}")
-            
-            return response.status_code == 200
+            if response.status_code == 200:
+                self.http_cache.invalidate(f"/api/rentals/{rental_id}")
+                return True
+            logger.warning("Rental %s status update failed: HTTP %s - %s",
+                           rental_id, response.status_code, response.text)
+            return False
             
-        except Exception as e:
-            print(f"[API] Error: {str(e)}")
+        except Exception:
+            logger.exception("Rental %s status update failed", rental_id)
             return False
     
+    def update_rental_statuses(self, rental_ids: List[int], status: str) -> Optional[Dict[str, Any]]:
+        """Set the status of many rentals in one request (see ``_update_statuses``)."""
+        return self._update_statuses('/api/rentals/status', rental_ids, status)
+    
     def get_purchases(self) -> List[Purchase]:
         """Fetch all purchases from the API."""
         try:
-            response = self.session.get(f"{self.base_url}/api/purchases")
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Handle different response formats
-            purchases_data = []
-            
-            if isinstance(data, list):
-                purchases_data = data
-            elif isinstance(data, dict) and '_embedded' in data and 'purchases' in data['_embedded']:
-                purchases_data = data['_embedded']['purchases']
-            elif isinstance(data, dict) and 'content' in data:
-                purchases_data = data['content']
-            elif isinstance(data, dict) and 'id' in data:
-                purchases_data = [data]
-            else:
-                return []
-            
-            if not isinstance(purchases_data, list):
-                return []
-            
-            # Process and validate each purchase
-            valid_purchases = []
-            for purchase in purchases_data:
-                try:
-                    if isinstance(purchase, str):
-                        purchase = json.loads(purchase)
-                    
-                    if not isinstance(purchase, dict):
-                        continue
-                        
-                    # Try to extract ID from _links.self.href if not present
-                    if 'id' not in purchase and '_links' in purchase and 'self' in purchase['_links']:
-                        href = purchase['_links']['self'].get('href', '')
-                        if href:
-                            purchase_id = href.split('/')[-1]
-                            if purchase_id.isdigit():
-                                purchase['id'] = int(purchase_id)
-                    
-                    valid_purchases.append(purchase)
-                    
-                except (json.JSONDecodeError, Exception):
-                    continue
-            
-            # Create Purchase objects from the valid purchases
-            return [Purchase.from_dict(p, self) for p in valid_purchases]
-            
-        except requests.exceptions.RequestException:
-            return []
-            
+            return list(self.iter_purchases())
         except Exception:
+            logger.exception("Error fetching purchases")
             return []
     
+    def iter_purchases(self, batch_size: int = 200) -> Iterator[Purchase]:
+        """Yield the purchases as the list response is downloaded.
+        
+        Records are collected in batches of ``batch_size`` so the cars of a
+        batch are resolved together before its purchases are yielded.
+        """
+        self.car_lookup.invalidate()
+        fields: Dict[str, Any] = {}
+        batch: List[Dict[str, Any]] = []
+        for record in self.iter_records("/api/purchases", fields=fields):
+            record = self._purchase_record(record)
+            if record is None:
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield from self.build_purchases(batch)
+                batch = []
+        
+        # Other response formats wrap the list in an object
+        if not batch and fields:
+            if isinstance(fields.get('_embedded'), dict):
+                records = fields['_embedded'].get('purchases') or []
+            elif 'content' in fields:
+                records = fields['content'] or []
+            elif 'id' in fields:
+                records = [fields]
+            else:
+                records = []
+            batch = [r for r in map(self._purchase_record, records) if r is not None]
+        if batch:
+            yield from self.build_purchases(batch)
+    
+    @staticmethod
+    def _purchase_record(purchase: Any) -> Optional[Dict[str, Any]]:
+        """Return ``purchase`` as a dict with an ``id``, or None if it is unusable."""
+        try:
+            if isinstance(purchase, str):
+                purchase = json.loads(purchase)
+            if not isinstance(purchase, dict):
+                return None
+            
+            # Try to extract ID from _links.self.href if not present
+            if 'id' not in purchase and '_links' in purchase and 'self' in purchase['_links']:
+                href = purchase['_links']['self'].get('href', '')
+                if href:
+                    purchase_id = href.split('/')[-1]
+                    if purchase_id.isdigit():
+                        purchase['id'] = int(purchase_id)
+            return purchase
+        except Exception:
+            return None
+    
+    def build_purchases(self, records: List[Dict[str, Any]], resolve_cars: bool = True) -> List[Purchase]:
+        """Create Purchase objects from raw API (or local store) records.
+        
+        With ``resolve_cars=False`` only cars already in the car lookup are
+        attached, so the call never touches the network.
+        """
+        if not resolve_cars:
+            self.attach_cars(records, self.car_lookup.known)
+            return [Purchase.from_dict(p) for p in records]
+        
+        # Resolve all referenced cars in one pass before building the objects
+        self.attach_cars(records)
+        return [Purchase.from_dict(p, self) for p in records]
+    
+    def attach_cars(self, records: List[Dict[str, Any]], resolve=None):
+        """Embed the car record into every purchase that only references it by ID."""
+        needed = set()
+        for record in records:
+            car = record.get('car')
+            if isinstance(car, dict) and car.get('name'):
+                self.car_lookup.prime([car])
+                continue
+            car_id = self._car_id_of(record)
+            if car_id:
+                needed.add(car_id)
+        
+        if not needed:
+            return
+        
+        cars = (resolve or self.car_lookup.resolve)(needed)
+        for record in records:
+            car_id = self._car_id_of(record)
+            if car_id in cars and not (isinstance(record.get('car'), dict) and record['car'].get('name')):
+                record['car'] = cars[car_id]
+    
+    @staticmethod
+    def _car_id_of(record: Dict[str, Any]) -> Optional[int]:
+        """Extract the car ID from a purchase record, whatever shape it uses."""
+        car = record.get('car')
+        if isinstance(car, dict):
+            car_id = car.get('id')
+        elif isinstance(car, int):
+            car_id = car
+        else:
+            car_id = record.get('carId')
+        try:
+            return int(car_id) if car_id else None
+        except (TypeError, ValueError):
+            return None
+    
     def update_purchase_status(self, purchase_id: int, status: str) -> bool:
         """
         Update the status of a purchase.
@@ -171,84 +431,113 @@ class ApiService:
             bool: True if the update was successful, False otherwise
         """
         if not purchase_id or purchase_id <= 0:
-            print(f"[API] Error: Invalid purchase ID: {purchase_id}")
+            logger.error("Invalid purchase ID: %s", purchase_id)
             return False
             
         if not status or status not in ["PENDING", "COMPLETED", "CANCELLED"]:
-            print(f"[API] Error: Invalid status: {status}")
+            logger.error("Invalid purchase status: %s", status)
             return False
+        
+        import requests
             
         try:
-            print(f"[API] Updating purchase {purchase_id} status to {status}")
+            logger.info("Updating purchase %s status to %s", purchase_id, status)
             
             # First try with /api/purchases/{id}/status endpoint
-            url = f"{self.base_url}/api/purchases/{purchase_id}/status"
-            print(f"[API] Sending status update to: {url}")
+            endpoint = f"/api/purchases/{purchase_id}/status"
             
-            response = self.session.put(
-                url,
+            response = self.transport.request(
+                'PUT', f"{self.base_url}{endpoint}", endpoint,
                 json={"status": status},
-                headers={"Content-Type": "application/json"},
-                timeout=10
+                headers={"Content-Type": "application/json"}
             )
             
-            print(f"[API] Status code: {response.status_code}")
-            print(f"[API] Response: {response.text}")
-            
             if response.status_code == 200:
+                self.http_cache.invalidate(f"/api/purchases/{purchase_id}")
                 return True
+            # Only a server without the status endpoint gets the full update; any
+            # other failure would fail (and load the server) the same way again
+            if response.status_code not in (404, 405):
+                logger.warning("Purchase %s status update failed: HTTP %s - %s",
+                               purchase_id, response.status_code, response.text)
+                return False
                 
-            # If the first attempt failed, try the full update endpoint as fallback
-            print(f"[API] First attempt failed, trying full update endpoint...")
-            url = f"{self.base_url}/api/purchases/{purchase_id}"
+            # The status endpoint is missing: try the full update endpoint as fallback
+            logger.warning("Purchase %s status endpoint returned HTTP %s, trying full update",
+                           purchase_id, response.status_code)
+            endpoint = f"/api/purchases/{purchase_id}"
             
             # First get the current purchase data
             purchase_data = self.get_purchase(purchase_id)
             if not purchase_data:
-                print(f"[API] Error: Could not retrieve purchase {purchase_id}")
+                logger.error("Could not retrieve purchase %s", purchase_id)
                 return False
                 
-            # Update the status
-            purchase_data['status'] = status
+            # Update the status (on a copy; the fetched record may be cached)
+            purchase_data = {**purchase_data, 'status': status}
             
             # Send the update
-            response = self.session.put(
-                url,
+            response = self.transport.request(
+                'PUT', f"{self.base_url}{endpoint}", endpoint,
                 json=purchase_data,
-                headers={"Content-Type": "application/json"},
-                timeout=10
+                headers={"Content-Type": "application/json"}
             )
             
-            print(f"[API] Full update status code: {response.status_code}")
-            print(f"[API] Full update response: {response.text}")
-            
-            return response.status_code == 200
+            if response.status_code == 200:
+                self.http_cache.invalidate(f"/api/purchases/{purchase_id}")
+                return True
+            logger.warning("Purchase %s full update failed: HTTP %s - %s",
+                           purchase_id, response.status_code, response.text)
+            return False
             
         except requests.exceptions.RequestException as re:
-            print(f"[API] Request error: {str(re)}")
-            if hasattr(re, 'response') and re.response is not None:
-                print(f"[API] Response status: {re.response.status_code}")
-                print(f"[API] Response text: {re.response.text}")
+            if getattr(re, 'response', None) is not None:
+                logger.error("Purchase %s status update failed: HTTP %s - %s",
+                             purchase_id, re.response.status_code, re.response.text)
+            else:
+                logger.error("Purchase %s status update failed: %s", purchase_id, re)
             return False
             
-        except Exception as e:
-            print(f"[API] Unexpected error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Unexpected error updating purchase %s", purchase_id)
             return False
     
+    def update_purchase_statuses(self, purchase_ids: List[int], status: str) -> Optional[Dict[str, Any]]:
+        """Set the status of many purchases in one request (see ``_update_statuses``)."""
+        return self._update_statuses('/api/purchases/status', purchase_ids, status)
+    
+    def _update_statuses(self, endpoint: str, ids: List[int], status: str) -> Optional[Dict[str, Any]]:
+        """PUT a bulk status change to ``endpoint``.
+        
+        Returns the server's result: the ``updated`` records, the ``deletedIds``
+        of cancelled records and the ``failed`` IDs with the reason, or None
+        if the request as a whole failed.
+        """
+        ids = [int(record_id) for record_id in ids]
+        logger.info("Updating %d records at %s to %s", len(ids), endpoint, status)
+        response = self.put(endpoint, data={'ids': ids, 'status': status})
+        if response is None or response.status_code != 200:
+            return None
+        try:
+            result = response.json()
+        except ValueError:
+            logger.error("Invalid bulk status response from %s", endpoint)
+            return None
+        return {
+            'updated': result.get('updated') or [],
+            'deletedIds': [int(record_id) for record_id in result.get('deletedIds') or []],
+            'failed': {int(record_id): reason for record_id, reason in (result.get('failed') or {}).items()},
+        }
+    
     def get_car(self, car_id: int) -> Optional[Dict[str, Any]]:
         """Fetch car details by ID from the API."""
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/cars/{car_id}",
-                timeout=10
-            )
-            if response.status_code == 200:
+            response = self.get(f"/api/cars/{car_id}")
+            if response is not None and response.status_code == 200:
                 return response.json()
             return None
         except Exception as e:
-            print(f"Error fetching car details: {e}")
+            logger.error("Error fetching car %s: %s", car_id, e)
             return None
             
     # Rental methods
@@ -260,7 +549,7 @@ class ApiService:
                 return response.json()
             return None
         except Exception as e:
-            print(f"Error fetching rental {rental_id}: {e}")
+            logger.error("Error fetching rental %s: %s", rental_id, e)
             return None
             
     def create_rental(self, rental_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -271,7 +560,7 @@ class ApiService:
                 return response.json()
             return None
         except Exception as e:
-            print(f"Error creating rental: {e}")
+            logger.error("Error creating rental: %s", e)
             return None
             
     def update_rental(self, rental_id: int, rental_data: Dict[str, Any]) -> bool:
@@ -280,7 +569,7 @@ class ApiService:
             response = self.put(f"/api/rentals/{rental_id}", data=rental_data)
             return response is not None and response.status_code == 200
         except Exception as e:
-            print(f"Error updating rental {rental_id}: {e}")
+            logger.error("Error updating rental %s: %s", rental_id, e)
             return False
             
     def delete_rental(self, rental_id: int) -> bool:
@@ -289,7 +578,7 @@ class ApiService:
             response = self.delete(f"/api/rentals/{rental_id}")
             return response is not None and response.status_code == 204
         except Exception as e:
-            print(f"Error deleting rental {rental_id}: {e}")
+            logger.error("Error deleting rental %s: %s", rental_id, e)
             return False
             
     # Purchase methods
@@ -301,7 +590,7 @@ class ApiService:
                 return response.json()
             return None
         except Exception as e:
-            print(f"Error fetching purchase {purchase_id}: {e}")
+            logger.error("Error fetching purchase %s: %s", purchase_id, e)
             return None
             
     def create_purchase(self, purchase_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -312,7 +601,7 @@ class ApiService:
                 return response.json()
             return None
         except Exception as e:
-            print(f"Error creating purchase: {e}")
+            logger.error("Error creating purchase: %s", e)
             return None
             
     def update_purchase(self, purchase_id: int, purchase_data: Dict[str, Any]) -> bool:
@@ -321,7 +610,7 @@ class ApiService:
             response = self.put(f"/api/purchases/{purchase_id}", data=purchase_data)
             return response is not None and response.status_code == 200
         except Exception as e:
-            print(f"Error updating purchase {purchase_id}: {e}")
+            logger.error("Error updating purchase %s: %s", purchase_id, e)
             return False
             
     def delete_purchase(self, purchase_id: int) -> bool:
@@ -330,5 +619,5 @@ class ApiService:
             response = self.delete(f"/api/purchases/{purchase_id}")
             return response is not None and response.status_code == 204
         except Exception as e:
-            print(f"Error deleting purchase {purchase_id}: {e}")
+            logger.error("Error deleting purchase %s: %s", purchase_id, e)
             return False
\ No newline at end of file
@@ -0,0 +1,287 @@
+# services/car_import.py
+import csv
+import json
+import logging
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from models.car import Car
+from services.car_service import CarService
+from services.json_stream import iter_array
+
+logger = logging.getLogger(__name__)
+
+# Values of the server's Car.CarType
+CAR_TYPES = ('SEDAN', 'SUV', 'HATCHBACK', 'CONVERTIBLE', 'SPORTS', 'MINIVAN', 'PICKUP')
+REQUIRED_FIELDS = ('name', 'model', 'licensePlate')
+# Column names accepted besides the API's own
+ROW_ALIASES = {
+    'license_plate': 'licensePlate',
+    'price_per_day': 'pricePerDay',
+    'daily_rate': 'dailyRate',
+    'for_sale': 'forSale',
+    'for_rent': 'forRent',
+    'car_type': 'type',
+    'image_url': 'imageUrl',
+}
+_TRUE = ('1', 'true', 'yes', 'y')
+_FALSE = ('0', 'false', 'no', 'n')
+
+# (number of the row, car built from it)
+Row = Tuple[int, Car]
+
+
+def read_rows(path: str, file_format: Optional[str] = None,
+              chunk_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a CSV file, a JSON array of objects or JSON lines.
+
+    Files are read as a stream; ``file_format`` (``csv`` or ``json``)
+    defaults to the file's extension.
+    """
+    lowered = path.lower()
+    file_format = file_format or ('json' if lowered.endswith(('.json', '.jsonl', '.ndjson')) else 'csv')
+    if file_format == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            yield from csv.DictReader(f)
+        return
+
+    with open(path, 'rb') as f:
+        chunks = iter(lambda: f.read(chunk_size), b"")
+        first = next(chunks, b"").removeprefix(b"\xef\xbb\xbf")
+        if first.lstrip().startswith(b"["):
+            yield from iter_array(_prepend(first, chunks))
+            return
+        # One object per line, as written by ``cli.py export``
+        f.seek(0)
+        for line in f:
+            line = line.strip().removeprefix(b"\xef\xbb\xbf")
+            if line:
+                yield json.loads(line)
+
+
+def _prepend(first: bytes, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    yield first
+    yield from chunks
+
+
+def normalize_plate(plate: str) -> str:
+    """Plate as compared for duplicates: upper case, without spaces and dashes."""
+    return re.sub(r'[\s-]', '', plate or '').upper()
+
+
+def car_from_row(row: Dict[str, Any]) -> Car:
+    """Validate an import row and build a Car from it.
+
+    CSV values are all strings and are parsed here; JSON values may already
+    be typed. Raises ValueError describing the first problem found.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("expected an object")
+    values = {}
+    for key, value in row.items():
+        if not key:
+            continue
+        key = key.strip()
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ('', None):
+            continue
+        values[ROW_ALIASES.get(key, key)] = value
+    values.pop('id', None)
+
+    for name in REQUIRED_FIELDS:
+        if name not in values:
+            raise ValueError(f"{name} is required")
+    for name in ('available', 'forSale', 'forRent'):
+        if name in values:
+            values[name] = _parse_bool(name, values[name])
+    if 'year' in values:
+        try:
+            values['year'] = int(values['year'])
+        except (TypeError, ValueError):
+            raise ValueError(f"year: expected a number, got {values['year']!r}")
+        if not 1886 <= values['year'] <= datetime.now().year + 1:
+            raise ValueError(f"year {values['year']} is out of range")
+    for name in ('pricePerDay', 'dailyRate', 'price'):
+        if name in values:
+            try:
+                values[name] = float(values[name])
+            except (TypeError, ValueError):
+                raise ValueError(f"{name}: expected a number, got {values[name]!r}")
+            if values[name] < 0:
+                raise ValueError(f"{name} must not be negative")
+    if 'type' in values:
+        values['type'] = str(values['type']).upper()
+        if values['type'] not in CAR_TYPES:
+            raise ValueError(f"type {values['type']!r} is not one of {', '.join(CAR_TYPES)}")
+    for name in ('name', 'model', 'licensePlate', 'color', 'imageUrl', 'description'):
+        if name in values:
+            values[name] = str(values[name])
+    return Car.from_dict(values)
+
+
+def _parse_bool(name: str, value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = str(value).lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"{name}: expected true or false, got {value!r}")
+
+
+@dataclass
+class RowError:
+    """A row that was not imported; ``row`` counts the data rows from 1."""
+    row: int
+    license_plate: str
+    message: str
+
+    def __str__(self):
+        plate = f" ({self.license_plate})" if self.license_plate else ""
+        return f"row {self.row}{plate}: {self.message}"
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    # Rows that passed validation and the duplicate check
+    valid: int = 0
+    duplicates: int = 0
+    created: List[Car] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+    # Rows sent to the batch endpoint and rows created one by one
+    batched: int = 0
+    fallback: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Rows processed per second."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.rows} rows: {len(self.created)} created, {len(self.errors)} failed "
+                f"({self.duplicates} duplicates) in {self.elapsed:.1f} s "
+                f"({self.throughput:,.0f} rows/s)")
+
+
+class CarImporter:
+    """Creates cars from a stream of import rows.
+
+    Rows are validated and checked for duplicate license plates (in the feed
+    and against ``known_cars``) as they are read, and the valid cars are sent
+    to the batch endpoint ``batch_size`` at a time with up to ``workers``
+    batches in flight. A batch the server rejects as a whole (or a server
+    without the batch endpoint) is retried car by car on the same workers.
+    """
+
+    def __init__(self, car_service: CarService, workers: int = 4, batch_size: int = 200):
+        self.car_service = car_service
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+
+    def run(self, rows: Iterable[Dict[str, Any]], known_cars: Iterable[Car] = (),
+            progress: Optional[Callable[[int, int], None]] = None,
+            dry_run: bool = False) -> ImportReport:
+        """Import ``rows`` and return the report.
+
+        ``progress(done, failed)`` is called with the counts of every step,
+        from the thread calling ``run``. With ``dry_run`` the rows are only
+        validated.
+        """
+        report = ImportReport()
+        progress = progress or (lambda done, failed: None)
+        started = time.perf_counter()
+        batches = self._batches(rows, known_cars, report, progress)
+        if dry_run:
+            for batch in batches:
+                progress(len(batch), 0)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                # future -> (sent as a batch, rows it covers)
+                pending: Dict[Future, Tuple[bool, List[Row]]] = {}
+                for batch in batches:
+                    report.batched += len(batch)
+                    pending[pool.submit(self.car_service.create_cars, [car for _, car in batch])] = \
+                        (True, batch)
+                    # Bounded so a large feed is not read ahead of the uploads
+                    while len(pending) >= self.workers * 2:
+                        self._collect(pool, pending, report, progress)
+                while pending:
+                    self._collect(pool, pending, report, progress)
+        report.elapsed = time.perf_counter() - started
+        report.errors.sort(key=lambda error: error.row)
+        logger.info("Car import: %s", report.summary())
+        return report
+
+    def _batches(self, rows: Iterable[Dict[str, Any]], known_cars: Iterable[Car],
+                 report: ImportReport, progress: Callable[[int, int], None]) -> Iterator[List[Row]]:
+        seen: Set[str] = {normalize_plate(car.license_plate) for car in known_cars if car.license_plate}
+        batch: List[Row] = []
+        for number, row in enumerate(rows, start=1):
+            report.rows = number
+            try:
+                car = car_from_row(row)
+            except ValueError as e:
+                plate = str(row.get('licensePlate') or row.get('license_plate') or '') \
+                    if isinstance(row, dict) else ''
+                report.errors.append(RowError(number, plate, str(e)))
+                progress(0, 1)
+                continue
+            plate = normalize_plate(car.license_plate)
+            if plate in seen:
+                report.duplicates += 1
+                report.errors.append(RowError(number, car.license_plate, "duplicate license plate"))
+                progress(0, 1)
+                continue
+            seen.add(plate)
+            report.valid += 1
+            batch.append((number, car))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _collect(self, pool: ThreadPoolExecutor, pending: Dict[Future, Tuple[bool, List[Row]]],
+                 report: ImportReport, progress: Callable[[int, int], None]):
+        """Wait for at least one request to finish and record its outcome."""
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            is_batch, batch = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception:
+                logger.exception("Creating cars failed")
+                result = None
+
+            if not is_batch:
+                number, car = batch[0]
+                if result is None:
+                    report.errors.append(RowError(number, car.license_plate, "create failed"))
+                    progress(0, 1)
+                else:
+                    report.created.append(result)
+                    progress(1, 0)
+            elif result is None:
+                logger.warning("Batch of %d cars failed, creating them one by one", len(batch))
+                report.batched -= len(batch)
+                report.fallback += len(batch)
+                for row in batch:
+                    pending[pool.submit(self.car_service.create_car, row[1])] = (False, [row])
+            else:
+                created, failed = result
+                report.created.extend(created)
+                for index, reason in sorted(failed.items()):
+                    if 0 <= index < len(batch):
+                        number, car = batch[index]
+                        report.errors.append(RowError(number, car.license_plate, reason))
+                progress(len(created), len(failed))
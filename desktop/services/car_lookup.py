@@ -0,0 +1,155 @@
+# services/car_lookup.py
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from services.api_service import ApiService
+
+
+class CarLookup:
+    """Shared cache of car records keyed by ID.
+
+    Missing cars are resolved with a single bulk ``GET /api/cars`` and only the
+    IDs that are still unknown afterwards fall back to ``GET /api/cars/{id}``.
+    The lookup is shared between the GUI thread and request workers, so every
+    public method holds the same lock, but never across an HTTP call.
+    """
+
+    def __init__(self, api_service: ApiService):
+        self.api_service = api_service
+        self._cars: Dict[int, Dict[str, Any]] = {}
+        self._missing: Set[int] = set()
+        self._bulk_loaded = False
+        # Set while one thread downloads the car list for everyone
+        self._bulk_loading: Optional[threading.Event] = None
+        # Bumped by invalidate, so fetches started before it are not cached
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    def invalidate(self):
+        """Forget every cached car so the next lookup hits the API again."""
+        with self._lock:
+            self._cars.clear()
+            self._missing.clear()
+            self._bulk_loaded = False
+            self._generation += 1
+
+    def prime(self, cars: Iterable[Dict[str, Any]]):
+        """Store car records that are already known (e.g. embedded in a response)."""
+        with self._lock:
+            for car in cars:
+                car_id = _as_id(car.get('id')) if isinstance(car, dict) else None
+                if car_id:
+                    self._cars[car_id] = car
+                    self._missing.discard(car_id)
+
+    def refresh(self, cars: Iterable[Dict[str, Any]]):
+        """Bring the cache in line with a complete car list (e.g. the synced local copy).
+
+        Changed cars replace the cached records and cars that are no longer
+        in the list are forgotten; the rest of the cache is kept, so no car
+        is downloaded again. An empty list leaves the cache as it is.
+        """
+        records = {}
+        for car in cars:
+            car_id = _as_id(car.get('id')) if isinstance(car, dict) else None
+            if car_id:
+                records[car_id] = car
+        if not records:
+            return
+        with self._lock:
+            for car_id in self._cars.keys() - records.keys():
+                del self._cars[car_id]
+            self._cars.update(records)
+            self._missing -= records.keys()
+            # The list is complete: unknown IDs do not need another list download
+            self._bulk_loaded = True
+
+    def forget(self, car_ids: Iterable[Any]):
+        """Drop deleted cars; looking them up again returns nothing without a request."""
+        with self._lock:
+            for car_id in (_as_id(i) for i in car_ids):
+                if car_id:
+                    self._cars.pop(car_id, None)
+                    self._missing.add(car_id)
+
+    def get(self, car_id: int) -> Optional[Dict[str, Any]]:
+        """Return the car with the given ID, or None if it does not exist."""
+        car_id = _as_id(car_id)
+        if not car_id:
+            return None
+        return self.resolve([car_id]).get(car_id)
+
+    def known(self, car_ids: Iterable[Any]) -> Dict[int, Dict[str, Any]]:
+        """Like ``resolve`` but only returns cached cars, never calling the API."""
+        with self._lock:
+            return {car_id: self._cars[car_id]
+                    for car_id in (_as_id(i) for i in car_ids) if car_id in self._cars}
+
+    def resolve(self, car_ids: Iterable[Any]) -> Dict[int, Dict[str, Any]]:
+        """Return a mapping of ID to car record for every resolvable ID.
+
+        The lock is only held to read and merge the cache; the HTTP calls run
+        without it, so ``prime`` and ``known`` on the GUI thread never wait
+        for the network.
+        """
+        wanted = {car_id for car_id in (_as_id(i) for i in car_ids) if car_id}
+        with self._lock:
+            pending = wanted - self._cars.keys() - self._missing
+            loading = self._bulk_loading
+            load_all = bool(pending) and not self._bulk_loaded and loading is None
+            if load_all:
+                loading = self._bulk_loading = threading.Event()
+            generation = self._generation
+
+        if pending and loading is not None:
+            if load_all:
+                records = []
+                try:
+                    records = self._fetch_all()
+                finally:
+                    with self._lock:
+                        self._bulk_loading = None
+                        if self._generation == generation:
+                            self._bulk_loaded = True
+                            self.prime(records)
+                    loading.set()
+            else:
+                # Another thread is loading the list: use its result
+                loading.wait()
+            with self._lock:
+                pending -= self._cars.keys()
+
+        fetched = {car_id: self.api_service.get_car(car_id) for car_id in pending}
+
+        with self._lock:
+            # Results fetched before an invalidate are returned but not cached
+            if self._generation == generation:
+                for car_id, car in fetched.items():
+                    if car:
+                        self._cars[car_id] = car
+                    else:
+                        self._missing.add(car_id)
+            found = {car_id: self._cars[car_id] for car_id in wanted if car_id in self._cars}
+        found.update((car_id, car) for car_id, car in fetched.items() if car)
+        return found
+
+    def _fetch_all(self) -> List[Dict[str, Any]]:
+        """Fetch the whole car list (called without the lock)."""
+        response = self.api_service.get("/api/cars")
+        if response is None or response.status_code != 200:
+            return []
+        try:
+            data = response.json()
+        except ValueError:
+            return []
+        return data if isinstance(data, list) else []
+
+
+def _as_id(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,143 @@
+# services/car_search_index.py
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from models.car import Car
+
+
+class CarSearchIndex:
+    """Trigram index over the searchable fields of ``Car`` objects.
+
+    Each car's name, model, color, year and license plate are lowercased and
+    split into trigrams. A query of three or more characters only checks the
+    cars that contain every trigram of the query; shorter queries scan the
+    precomputed texts. When the new query contains the previous one (the user
+    kept typing), the previous result is refined instead of searching again.
+    Results keep the order in which cars were added.
+    """
+
+    NGRAM = 3
+
+    def __init__(self, cars: Iterable[Car] = ()):
+        self._lock = threading.RLock()
+        self.rebuild(cars)
+
+    def rebuild(self, cars: Iterable[Car]):
+        """Replace the indexed cars."""
+        with self._lock:
+            self._cars: Dict[int, Car] = {}
+            self._texts: Dict[int, str] = {}
+            self._order: Dict[int, int] = {}
+            self._grams: Dict[str, Set[int]] = defaultdict(set)
+            self._next_position = 0
+            for car in cars:
+                self._add(car)
+            self._reset_last_query()
+
+    def add(self, car: Car):
+        """Index a newly created car."""
+        with self._lock:
+            self._add(car)
+            self._reset_last_query()
+
+    def update(self, car: Car):
+        """Re-index an edited car, keeping its position in the results."""
+        with self._lock:
+            key = self._key(car)
+            position = self._order.get(key)
+            self._remove(key)
+            self._add(car, position)
+            self._reset_last_query()
+
+    def remove(self, car_id: int):
+        """Drop a deleted car from the index."""
+        with self._lock:
+            self._remove(car_id)
+            self._reset_last_query()
+
+    def __len__(self):
+        return len(self._cars)
+
+    def search(self, query: str) -> List[Car]:
+        """Return the cars whose searchable fields contain ``query`` (case-insensitive)."""
+        query = query.strip().lower()
+        with self._lock:
+            if not query:
+                result = sorted(self._cars, key=self._order.__getitem__)
+            elif (self._last_query and self._last_query in query
+                    and self._last_result is not None):
+                # The user kept typing: refine the previous (already ordered) result
+                texts = self._texts
+                result = [key for key in self._last_result if query in texts[key]]
+            else:
+                result = self._lookup(query)
+
+            self._last_query = query
+            self._last_result = result
+            cars = self._cars
+            return [cars[key] for key in result]
+
+    # Internals
+
+    @staticmethod
+    def _key(car: Car) -> int:
+        return car.id if car.id is not None else id(car)
+
+    @staticmethod
+    def _text(car: Car) -> str:
+        fields = (
+            getattr(car, 'name', ''),
+            getattr(car, 'model', ''),
+            getattr(car, 'color', ''),
+            str(getattr(car, 'year', '')),
+            str(getattr(car, 'license_plate', '')),
+        )
+        # Newlines keep n-grams from matching across fields
+        return "\n".join(str(field or '') for field in fields).lower()
+
+    def _grams_of(self, text: str) -> Set[str]:
+        n = self.NGRAM
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _add(self, car: Car, position: Optional[int] = None):
+        key = self._key(car)
+        if key in self._cars:
+            self._remove(key)
+        text = self._text(car)
+        self._cars[key] = car
+        self._texts[key] = text
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+        self._order[key] = position
+        for gram in self._grams_of(text):
+            self._grams[gram].add(key)
+
+    def _remove(self, key: int):
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        del self._cars[key]
+        del self._order[key]
+        for gram in self._grams_of(text):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._grams[gram]
+
+    def _lookup(self, query: str) -> List[int]:
+        texts = self._texts
+        if len(query) < self.NGRAM:
+            candidates = texts.keys()
+        else:
+            postings = sorted((self._grams.get(gram, set()) for gram in self._grams_of(query)), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+        matches = [key for key in candidates if query in texts[key]]
+        matches.sort(key=self._order.__getitem__)
+        return matches
+
+    def _reset_last_query(self):
+        self._last_query = None
+        self._last_result = None
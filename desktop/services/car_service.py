@@ -1,29 +1,56 @@
-import os
-import sys
-from pathlib import Path
-
-# Add the project root to Python path if not already there
-project_root = str(Path(__file__).parent.parent.absolute())
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
-import requests
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
 from models.car import Car
 from services.api_service import ApiService
+from services.car_search_index import CarSearchIndex
+from services.sync_engine import SyncEngine
+
+logger = logging.getLogger(__name__)
 
 class CarService:
-    def __init__(self, base_url: str):
-        self.base_url = f"{base_url}/api/cars"
-        self.api_service = ApiService(base_url)
+    def __init__(self, api_service: ApiService, sync_engine: Optional[SyncEngine] = None):
+        # Shared with the other services: one connection pool and one HTTP cache
+        self.api_service = api_service
+        self.base_url = f"{api_service.base_url}/api/cars"
+        # When set, cars are mirrored locally and refreshed with delta syncs
+        self.sync_engine = sync_engine
+        # Kept in sync with every list/create/update/delete made through this service
+        self.search_index = CarSearchIndex()
     
     def get_all_cars(self) -> List[Car]:
         """Get all cars from the API"""
+        if self.sync_engine is not None:
+            self.sync_engine.sync('cars')
+            return self._index_cars(self.sync_engine.cached('cars'))
         response = self.api_service.get("/api/cars")
         if response and response.status_code == 200:
-            return [Car.from_dict(car_data) for car_data in response.json()]
+            return self._index_cars(response.json())
         return []
     
+    def get_cached_cars(self) -> List[Car]:
+        """Get the cars from the local store without contacting the API"""
+        if self.sync_engine is None:
+            return []
+        return self._index_cars(self.sync_engine.cached('cars'))
+    
+    def _index_cars(self, records) -> List[Car]:
+        cars = [Car.from_dict(car_data) for car_data in records]
+        self.search_index.rebuild(cars)
+        return cars
+    
+    def search_cars(self, query: str) -> List[Car]:
+        """Search the cars loaded through this service"""
+        return self.search_index.search(query)
+    
+    def apply_changes(self, records, deleted_ids=()) -> List[Car]:
+        """Index cars changed elsewhere (e.g. pushed by the server) and return them as Cars"""
+        cars = [Car.from_dict(car_data) for car_data in records]
+        for car in cars:
+            self.search_index.update(car)
+        for car_id in deleted_ids:
+            self.search_index.remove(car_id)
+        return cars
+    
     def get_car_by_id(self, car_id: int) -> Optional[Car]:
         """Get a single car by ID"""
         response = self.api_service.get(f"/api/cars/{car_id}")
@@ -35,30 +62,62 @@ class CarService:
         """Create a new car"""
         try:
             car_data = car.to_dict()
-            print(f"Sending car data to API: {car_data}")  # Debug log
+            logger.debug("Creating car: %s", car_data)
             
             response = self.api_service.post("/api/cars", data=car_data)
             
             if response is None:
-                print("Failed to get response from API")
+                logger.error("Failed to get response from API")
                 return None
                 
-            print(f"API Response Status: {response.status_code}")
             if response.status_code in (200, 201):  # Accept both 200 and 201 as success
                 try:
                     car_data = response.json()
-                    print(f"Successfully created car: {car_data}")
-                    return Car.from_dict(car_data)
+                    created = Car.from_dict(car_data)
+                    self.search_index.add(created)
+                    self._store_changes([car_data])
+                    logger.info("Created car %s", created.id)
+                    return created
                 except Exception as e:
-                    print(f"Error parsing response: {str(e)}")
+                    logger.error("Error parsing created car: %s", e)
                     return None
             else:
-                print(f"API Error: {response.status_code} - {response.text}")
+                logger.warning("Creating car failed: HTTP %s - %s", response.status_code, response.text)
                 return None
-        except Exception as e:
-            print(f"Error in create_car: {str(e)}")
+        except Exception:
+            logger.exception("Error in create_car")
             return None
     
+    def create_cars(self, cars: Sequence[Car]) -> Optional[Tuple[List[Car], Dict[int, str]]]:
+        """Create many cars in one request to the batch endpoint.
+        
+        Returns the created cars and the reason for every rejected car, keyed
+        by its position in ``cars``, or None if the request as a whole failed
+        (or the server has no batch endpoint) so the caller can fall back to
+        ``create_car``.
+        """
+        payload = []
+        for car in cars:
+            car_data = car.to_dict()
+            car_data.pop('id', None)
+            payload.append(car_data)
+        logger.info("Creating %d cars", len(payload))
+        response = self.api_service.post("/api/cars/batch", data=payload)
+        if response is None or response.status_code not in (200, 201):
+            return None
+        try:
+            result = response.json()
+            records = result.get('created') or []
+            failed = {int(index): reason for index, reason in (result.get('failed') or {}).items()}
+        except (ValueError, AttributeError):
+            logger.error("Invalid batch create response")
+            return None
+        created = [Car.from_dict(car_data) for car_data in records]
+        for car in created:
+            self.search_index.add(car)
+        self._store_changes(records)
+        return created, failed
+    
     def update_car(self, car: Car) -> Optional[Car]:
         """Update an existing car"""
         if not car.id:
@@ -66,28 +125,40 @@ class CarService:
             
         response = self.api_service.put(f"/api/cars/{car.id}", data=car.to_dict())
         if response and response.status_code == 200:
-            return Car.from_dict(response.json())
+            car_data = response.json()
+            updated = Car.from_dict(car_data)
+            self.search_index.update(updated)
+            self._store_changes([car_data])
+            return updated
         return None
     
     def delete_car(self, car_id: int) -> bool:
         """Delete a car by ID"""
         try:
-            print(f"Attempting to delete car with ID: {car_id}")
             response = self.api_service.delete(f"/api/cars/{car_id}")
             
             if response is None:
-                print("No response received from server")
+                logger.error("No response received when deleting car %s", car_id)
                 return False
                 
-            print(f"Delete response status: {response.status_code}")
             # Consider both 200 (OK) and 204 (No Content) as success
             if response.status_code in (200, 204):
-                print(f"Successfully deleted car with ID: {car_id}")
+                logger.info("Deleted car %s", car_id)
+                self.search_index.remove(car_id)
+                self._store_changes(deleted_ids=[car_id])
                 return True
             else:
-                print(f"Failed to delete car. Status: {response.status_code}, Response: {response.text}")
+                logger.warning("Deleting car %s failed: HTTP %s - %s",
+                               car_id, response.status_code, response.text)
                 return False
                 
-        except Exception as e:
-            print(f"Error in delete_car: {str(e)}")
+        except Exception:
+            logger.exception("Error in delete_car")
             return False
+    
+    def _store_changes(self, records=(), deleted_ids=()):
+        """Mirror a successful write into the local store so cached reads see it without a sync"""
+        if self.sync_engine is None:
+            return
+        store = self.sync_engine.store
+        store.apply_changes('cars', records, deleted_ids, store.cursor('cars'))
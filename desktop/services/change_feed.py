@@ -0,0 +1,191 @@
+# services/change_feed.py
+from __future__ import annotations
+
+import codecs
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple, TYPE_CHECKING
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from services.local_store import LocalStore
+from services.sync_engine import SyncEngine
+
+if TYPE_CHECKING:
+    from services.api_service import ApiService
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeFeed(QObject):
+    """Applies the changes the server pushes on ``/api/events``.
+
+    A daemon thread keeps one streamed GET open and parses the server-sent
+    events. Every change is written to the ``LocalStore`` as it arrives (the
+    sync cursor is left alone, so the next delta sync still covers any gap)
+    and handed to the GUI thread, where the changes of ``batch_interval`` ms
+    are emitted together: one ``changes(entity, records, deleted_ids)`` per
+    entity, so a burst of updates patches each table once.
+
+    When the stream drops the thread reconnects with a growing delay and
+    emits ``reconnected`` once it is back, so listeners can run a delta sync
+    for whatever was published in between. Servers without the endpoint
+    (404) are left alone. ``stop`` takes effect at the next event or
+    heartbeat; the thread is a daemon, so it never delays shutdown.
+    """
+
+    changes = pyqtSignal(str, list, list)
+    reconnected = pyqtSignal()
+    # (entity, record or None, id) from the reader thread
+    _received = pyqtSignal(object)
+
+    ENDPOINT = '/api/events'
+    RETRY_DELAYS = (1, 2, 5, 10, 30)
+
+    def __init__(self, api_service: ApiService, store: LocalStore, batch_interval: int = 200,
+                 parent=None):
+        super().__init__(parent)
+        self.api_service = api_service
+        self.store = store
+        self.connected = False
+        self._pending: Dict[str, Tuple[Dict[int, Dict[str, Any]], Set[int]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(batch_interval)
+        self._timer.timeout.connect(self._flush)
+        self._received.connect(self._queue)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop applying changes and let the reader thread exit."""
+        self._stop.set()
+
+    # Reader thread
+
+    def _run(self):
+        attempt = 0
+        subscribed_before = False
+        while not self._stop.is_set():
+            # The read timeout (STREAM_READ_TIMEOUT) outlasts the server's heartbeat
+            response = self.api_service.get_stream(
+                self.ENDPOINT, headers={'Accept': 'text/event-stream'})
+            if response is not None and response.status_code == 404:
+                response.close()
+                logger.info("Server has no change feed; changes show up on refresh")
+                return
+            if response is not None and response.status_code == 200:
+                self.connected = True
+                attempt = 0
+                if subscribed_before:
+                    self.reconnected.emit()
+                subscribed_before = True
+                logger.info("Subscribed to the change feed")
+                try:
+                    for name, data in iter_events(_iter_lines(response)):
+                        if self._stop.is_set():
+                            return
+                        self._apply(name, data)
+                except Exception as e:
+                    if not self._stop.is_set():
+                        logger.info("Change feed disconnected: %s", e)
+                finally:
+                    self.connected = False
+                    response.close()
+            elif response is not None:
+                response.close()
+            if self._stop.wait(self.RETRY_DELAYS[min(attempt, len(self.RETRY_DELAYS) - 1)]):
+                return
+            attempt += 1
+
+    def _apply(self, name: str, data: str):
+        try:
+            change = json.loads(data)
+        except ValueError:
+            logger.warning("Ignoring malformed change event: %.200s", data)
+            return
+        entity = change.get('entity') or name
+        record_id = change.get('id')
+        if entity not in SyncEngine.ENDPOINTS or record_id is None:
+            return
+        record = change.get('record')
+        if change.get('type') == 'delete':
+            self.store.apply_changes(entity, (), (record_id,), self.store.cursor(entity))
+            record = None
+        elif isinstance(record, dict):
+            self.store.upsert(entity, (record,))
+        else:
+            return
+        self._received.emit((entity, record, int(record_id)))
+
+    # GUI thread
+
+    def _queue(self, change):
+        entity, record, record_id = change
+        records, deleted = self._pending.setdefault(entity, ({}, set()))
+        if record is None:
+            records.pop(record_id, None)
+            deleted.add(record_id)
+        else:
+            deleted.discard(record_id)
+            records[record_id] = record
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        for entity, (records, deleted) in pending.items():
+            logger.debug("Applying %d pushed %s changes", len(records) + len(deleted), entity)
+            self.changes.emit(entity, list(records.values()), sorted(deleted))
+
+
+def iter_events(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yield ``(event name, data)`` for every event of a ``text/event-stream``.
+
+    Comment lines (heartbeats) are skipped and multi-line data is joined
+    with newlines, as in the EventSource specification.
+    """
+    name, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield name, "\n".join(data)
+            name, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            name = value
+        elif field == "data":
+            data.append(value)
+
+
+def _iter_lines(response) -> Iterator[str]:
+    # iter_lines() waits for a full chunk before yielding; read1 returns each
+    # event as soon as it arrives
+    raw = response.raw
+    if not hasattr(raw, 'read1'):
+        yield from response.iter_lines(chunk_size=1, decode_unicode=True)
+        return
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ""
+    while True:
+        chunk = raw.read1(8192)
+        if not chunk:
+            return
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
@@ -0,0 +1,236 @@
+# services/exporter.py
+import csv
+import importlib.util
+import json
+import logging
+import os
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from services.api_service import ApiService
+from services.local_store import LocalStore
+
+logger = logging.getLogger(__name__)
+
+# entity -> (paged endpoint, list endpoint, date fields matched by the from/to filter)
+ENTITIES = {
+    'rentals': ('/api/rentals/page', '/api/rentals', ('startDate', 'endDate')),
+    'purchases': ('/api/purchases/page', '/api/purchases', ('purchaseDate', 'purchaseDate')),
+    'cars': (None, '/api/cars', None),
+}
+EXPORT_COLUMNS = {
+    'rentals': ('id', 'customerName', 'customerEmail', 'carId', 'carName', 'startDate', 'endDate',
+                'status', 'totalPrice', 'createdAt'),
+    'purchases': ('id', 'customerName', 'customerEmail', 'carId', 'purchasePrice', 'purchaseDate',
+                  'paymentMethod', 'status'),
+    'cars': ('id', 'name', 'model', 'year', 'color', 'licensePlate', 'dailyRate', 'price', 'type',
+             'available', 'forSale', 'forRent', 'imageUrl', 'description'),
+}
+# Parquet column types; the other columns are strings
+COLUMN_TYPES = {
+    'id': 'int', 'carId': 'int', 'year': 'int',
+    'totalPrice': 'float', 'purchasePrice': 'float', 'dailyRate': 'float', 'price': 'float',
+    'available': 'bool', 'forSale': 'bool', 'forRent': 'bool',
+    'startDate': 'date', 'endDate': 'date', 'purchaseDate': 'date',
+}
+FORMATS = ('csv', 'json', 'parquet')
+# Rows between progress reports and cancellation checks of the writer's caller
+PROGRESS_INTERVAL = 1000
+
+
+class ExportCancelled(Exception):
+    """Raised by ``write_export`` when its ``cancelled`` check returns True."""
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def format_for(path: str, file_format: Optional[str] = None) -> str:
+    """``file_format``, or the format named by the extension of ``path`` (CSV by default)."""
+    if file_format:
+        return file_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.json', '.jsonl', '.ndjson'):
+        return 'json'
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    return 'csv'
+
+
+# Sources
+
+def select_records(api: ApiService, entity: str, status: Optional[str] = None,
+                   start: Optional[date] = None, end: Optional[date] = None,
+                   page_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Yield the records of ``entity`` from the API matching the filters.
+
+    The paged endpoint filters on the server and is read one page at a time;
+    servers without it stream the full list and the records are filtered here.
+    """
+    page_endpoint, list_endpoint, date_fields = ENTITIES[entity]
+    filters = {'status': status, 'from': start, 'to': end}
+    if page_endpoint and api.get_page(page_endpoint, 0, 1, **filters) is not None:
+        for items in api.iter_pages(page_endpoint, page_size, 'id,asc', **filters):
+            yield from items
+        return
+    for record in api.iter_records(list_endpoint):
+        if isinstance(record, dict) and _in_range(record, date_fields, start, end) and \
+                (not status or record.get('status') == status):
+            yield record
+
+
+def cached_records(store: LocalStore, entity: str, status: Optional[str] = None,
+                   start: Optional[date] = None, end: Optional[date] = None,
+                   batch_size: int = LocalStore.BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield the records of ``entity`` from the local store matching the filters."""
+    date_fields = ENTITIES[entity][2]
+    for batch in store.iter_records(entity, status, batch_size):
+        for record in batch:
+            if _in_range(record, date_fields, start, end):
+                yield record
+
+
+def _in_range(record: Dict[str, Any], date_fields, start: Optional[date], end: Optional[date]) -> bool:
+    if not date_fields or not (start or end):
+        return True
+    first, last = (str(record.get(name) or '')[:10] for name in date_fields)
+    return not ((start and last < start.isoformat()) or (end and first > end.isoformat()))
+
+
+def export_row(entity: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a record for export (rentals embed their car)."""
+    car = record.get('car')
+    if isinstance(car, dict):
+        record = {**record, 'carId': car.get('id'),
+                  'carName': f"{car.get('name', '')} {car.get('model', '')}".strip()}
+    elif car is not None and 'carId' not in record:
+        record = {**record, 'carId': car}
+    return {column: record.get(column) for column in EXPORT_COLUMNS[entity]}
+
+
+# Writers
+
+class _CsvWriter:
+    def __init__(self, path: str, columns):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, columns)
+        self._writer.writeheader()
+
+    def write(self, row: Dict[str, Any]):
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class _JsonLinesWriter:
+    """One object per line, so the file is written (and read) as a stream."""
+
+    def __init__(self, path: str, columns):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, row: Dict[str, Any]):
+        self._file.write(json.dumps(row) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Buffers ``row_group_size`` rows per column and writes them as one row group."""
+
+    def __init__(self, path: str, columns, row_group_size: int = 10000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        types = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(),
+                 'date': pa.date32(), 'string': pa.string()}
+        self._columns = [(name, COLUMN_TYPES.get(name, 'string')) for name in columns]
+        self._schema = pa.schema([(name, types[kind]) for name, kind in self._columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._row_group_size = row_group_size
+        self._buffer: Dict[str, List[Any]] = {name: [] for name in columns}
+        self._rows = 0
+
+    def write(self, row: Dict[str, Any]):
+        for name, kind in self._columns:
+            self._buffer[name].append(_coerce(row.get(name), kind))
+        self._rows += 1
+        if self._rows >= self._row_group_size:
+            self._flush()
+
+    def close(self):
+        if self._rows:
+            self._flush()
+        self._writer.close()
+
+    def _flush(self):
+        self._writer.write_table(self._pa.Table.from_pydict(self._buffer, self._schema))
+        for values in self._buffer.values():
+            values.clear()
+        self._rows = 0
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """``value`` as the Python type of a Parquet column; None if it does not convert."""
+    if value is None or value == '':
+        return None
+    try:
+        if kind == 'int':
+            return int(value)
+        if kind == 'float':
+            return float(value)
+        if kind == 'bool':
+            return value if isinstance(value, bool) else str(value).lower() in ('1', 'true', 'yes')
+        if kind == 'date':
+            return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+_WRITERS = {'csv': _CsvWriter, 'json': _JsonLinesWriter, 'parquet': _ParquetWriter}
+
+
+def write_export(records: Iterable[Dict[str, Any]], path: str, entity: str,
+                 file_format: Optional[str] = None,
+                 progress: Optional[Callable[[int], None]] = None,
+                 cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """Write ``records`` of ``entity`` to ``path`` as they arrive and return the row count.
+
+    Rows are written one at a time (Parquet buffers one row group), so the
+    size of the export does not matter. The file is written next to
+    ``path`` and only renamed to it once complete. ``progress(rows)`` is
+    called with the rows written since the last call; when ``cancelled()``
+    returns True the partial file is removed and ``ExportCancelled`` raised.
+    """
+    file_format = format_for(path, file_format)
+    if file_format == 'parquet' and not parquet_available():
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    partial = f"{path}.part"
+    writer = _WRITERS[file_format](partial, EXPORT_COLUMNS[entity])
+    count = 0
+    try:
+        try:
+            for record in records:
+                writer.write(export_row(entity, record))
+                count += 1
+                if count % PROGRESS_INTERVAL == 0:
+                    if progress:
+                        progress(PROGRESS_INTERVAL)
+                    if cancelled and cancelled():
+                        raise ExportCancelled()
+        finally:
+            writer.close()
+        if cancelled and cancelled():
+            raise ExportCancelled()
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    if progress and count % PROGRESS_INTERVAL:
+        progress(count % PROGRESS_INTERVAL)
+    logger.info("Exported %d %s to %s", count, entity, path)
+    return count
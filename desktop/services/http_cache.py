@@ -0,0 +1,181 @@
+# services/http_cache.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+
+class CachedResponse:
+    """Stand-in for ``requests.Response`` served from the ``HttpCache``.
+
+    The JSON body is parsed once and shared by every caller, so callers must
+    treat the result of ``json()`` as read-only.
+    """
+
+    from_cache = True
+
+    def __init__(self, response: requests.Response, content: Optional[bytes] = None):
+        self.url = response.url
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = response.content if content is None else content
+        self.encoding = response.encoding
+        self._json: Any = None
+        self._parsed = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self) -> Any:
+        if not self._parsed:
+            self._json = json.loads(self.content)
+            self._parsed = True
+        return self._json
+
+    def raise_for_status(self):
+        pass
+
+    # Served in place of streamed responses, which callers close
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class _Entry:
+    __slots__ = ('response', 'path', 'etag', 'last_modified', 'expires')
+
+    def __init__(self, response: CachedResponse, path: str, ttl: float):
+        self.response = response
+        self.path = path
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.expires = time.monotonic() + ttl
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+
+class HttpCache:
+    """Cache of successful GET responses for ``ApiService``.
+
+    Each endpoint gets a time-to-live from ``ttls`` (longest matching path
+    prefix wins; ``None`` means "never cache"). Fresh entries are returned
+    without a request. Stale entries are revalidated with ``If-None-Match`` /
+    ``If-Modified-Since`` so an unchanged list costs a 304 and no parsing.
+    A POST, PUT or DELETE drops every cached response of the collection it
+    touched and of the collections that embed it (see ``RELATED``).
+    """
+
+    DEFAULT_TTLS: Dict[str, Optional[float]] = {
+        '/api/cars': 30.0,
+        '/api/rentals': 5.0,
+        '/api/purchases': 5.0,
+        # Delta responses differ on every call
+        '/api/cars/changes': None,
+        '/api/rentals/changes': None,
+        '/api/purchases/changes': None,
+    }
+    # Rentals and purchases embed their car, and both change a car's availability
+    # Largest streamed body kept; bigger lists are streamed again every time
+    MAX_STREAMED_BODY = 16 * 1024 * 1024
+    RELATED: Dict[str, Iterable[str]] = {
+        '/api/cars': ('/api/rentals', '/api/purchases'),
+        '/api/rentals': ('/api/cars',),
+        '/api/purchases': ('/api/cars',),
+    }
+
+    def __init__(self, ttls: Optional[Dict[str, Optional[float]]] = None,
+                 default_ttl: Optional[float] = 0.0, max_entries: int = 256):
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        """Return the time-to-live of ``path``, or None if it must not be cached."""
+        best = None
+        for prefix in self.ttls:
+            if (path == prefix or path.startswith(prefix.rstrip('/') + '/')) and \
+                    (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.ttls[best] if best is not None else self.default_ttl
+
+    def lookup(self, url: str) -> Optional[_Entry]:
+        """Return the cached entry for ``url`` (fresh or stale), if any."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    @staticmethod
+    def conditional_headers(entry: _Entry) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, response: requests.Response,
+              content: Optional[bytes] = None) -> Optional[CachedResponse]:
+        """Cache a 200 response to ``url``; returns the cached view or None if not cacheable.
+
+        ``content`` is the body of a streamed response, read by the caller.
+        """
+        path = urlsplit(url).path
+        ttl = self.ttl_for(path)
+        if ttl is None or response.status_code != 200:
+            return None
+        cached = CachedResponse(response, content)
+        with self._lock:
+            self._entries[url] = _Entry(cached, path, ttl)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def revalidated(self, entry: _Entry, response: requests.Response) -> CachedResponse:
+        """Mark ``entry`` fresh again after a 304 and return its response."""
+        ttl = self.ttl_for(entry.path) or 0.0
+        with self._lock:
+            entry.expires = time.monotonic() + ttl
+            entry.etag = response.headers.get('ETag', entry.etag)
+        return entry.response
+
+    def invalidate(self, path: str):
+        """Drop the responses of the collection containing ``path`` and of its related collections."""
+        collection = self._collection(path)
+        prefixes = (collection, *self.RELATED.get(collection, ()))
+        with self._lock:
+            for url in [url for url, entry in self._entries.items()
+                        if any(entry.path == p or entry.path.startswith(p + '/') for p in prefixes)]:
+                del self._entries[url]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _collection(path: str) -> str:
+        # "/api/cars/5/status" -> "/api/cars"
+        parts = [part for part in urlsplit(path).path.split('/') if part]
+        return '/' + '/'.join(parts[:2])
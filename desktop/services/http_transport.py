@@ -0,0 +1,129 @@
+# services/http_transport.py
+import logging
+import socket
+import time
+from typing import Callable, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+import config
+from services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+Timeout = Tuple[float, float]
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose pooled sockets send TCP keep-alive probes.
+
+    Idle pooled connections and the long-lived change feed stream are
+    otherwise silently dropped by NAT gateways and proxies, and the next
+    request on them fails instead of reconnecting.
+    """
+
+    def __init__(self, keepalive_idle: int = config.TCP_KEEPALIVE_IDLE, **kwargs):
+        self.socket_options = list(HTTPConnection.default_socket_options)
+        self.socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # The probe timing options are Linux/macOS/Windows specific
+        for name, value in (('TCP_KEEPIDLE', keepalive_idle), ('TCP_KEEPINTVL', 10),
+                            ('TCP_KEEPCNT', 3)):
+            if hasattr(socket, name):
+                self.socket_options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class HttpTransport:
+    """The HTTP session shared by every service of the client.
+
+    One ``requests.Session`` means one connection pool, so the TCP (and TLS)
+    connections opened by any service are reused by all of them. The pool
+    holds ``pool_size`` connections per host, enough for every worker thread
+    plus the change feed stream, so concurrent requests never open and close
+    throwaway connections.
+
+    Requests made without a ``timeout`` get the ``(connect, read)`` budget of
+    their endpoint: the longest matching prefix in ``timeouts``, or
+    ``default_timeout``. Failed requests are retried as ``retry`` allows, and
+    ``breaker`` stops all requests while the backend keeps failing;
+    ``sleep`` waits out the delays between attempts.
+    """
+
+    def __init__(self, pool_size: int = config.HTTP_POOL_SIZE,
+                 default_timeout: Optional[Timeout] = None,
+                 timeouts: Optional[Sequence[Tuple[str, Timeout]]] = None,
+                 retry: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self.session = requests.Session()
+        adapter = KeepAliveAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.default_timeout = default_timeout or (config.CONNECT_TIMEOUT, config.READ_TIMEOUT)
+        if timeouts is None:
+            bulk = (config.CONNECT_TIMEOUT, config.BULK_READ_TIMEOUT)
+            timeouts = (
+                ('/api/events', (config.CONNECT_TIMEOUT, config.STREAM_READ_TIMEOUT)),
+                # Bulk status changes and batch creates write every record in one transaction
+                ('/api/rentals/status', bulk),
+                ('/api/purchases/status', bulk),
+                ('/api/cars/batch', bulk),
+            )
+        # Longest prefix first, so the most specific budget wins
+        self.timeouts = sorted(timeouts, key=lambda item: len(item[0]), reverse=True)
+
+    def timeout_for(self, endpoint: str) -> Timeout:
+        """Return the ``(connect, read)`` timeout for ``endpoint`` (a path such as ``/api/cars``)."""
+        path = endpoint.split('?', 1)[0]
+        for prefix, timeout in self.timeouts:
+            if path == prefix or path.startswith(prefix.rstrip('/') + '/'):
+                return timeout
+        return self.default_timeout
+
+    def request(self, method: str, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a request on the shared session, applying the endpoint's timeout if none is given.
+
+        Raises ``CircuitOpenError`` without sending anything while the circuit
+        is open, and the last error once the retries are used up. Responses
+        are returned whatever their status.
+        """
+        method = method.upper()
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout_for(endpoint)
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Backend unavailable; not sending {method} {endpoint}")
+        attempt = 0
+        while True:
+            can_retry = attempt + 1 < self.retry.attempts
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if not (can_retry and self.retry.should_retry_error(method, e)):
+                    self.breaker.record_failure()
+                    raise
+                delay = self.retry.delay(attempt)
+                logger.info("%s %s failed (%s); retrying in %.2f s", method, endpoint, e, delay)
+            else:
+                if not (can_retry and self.retry.should_retry_response(method, response)):
+                    if response.status_code >= 500:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    return response
+                delay = self.retry.delay(attempt, response)
+                logger.info("%s %s returned HTTP %s; retrying in %.2f s", method, endpoint,
+                            response.status_code, delay)
+                response.close()
+            self.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self.session.close()
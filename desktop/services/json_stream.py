@@ -0,0 +1,133 @@
+# services/json_stream.py
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+# Characters that may continue a number ("1." and "1e" decode as 1 until the rest arrives)
+_NUMBER = "0123456789.eE+-"
+
+
+class _Reader:
+    """Text buffer over an iterable of byte chunks, refilled on demand."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; returns False once the input is exhausted."""
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+                text = self._decoder.decode(b"", final=True)
+            else:
+                text = self._decoder.decode(chunk)
+            if text:
+                # Drop what has been consumed so the buffer only holds unread text
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ("" at the end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode one complete JSON value, reading more input until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if not self.eof and (end == len(self.buffer) or (
+                    isinstance(value, (int, float)) and
+                    all(char in _NUMBER for char in self.buffer[end:]))) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array(chunks: Iterable[bytes], key: Optional[str] = None,
+               fields: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """Yield the elements of a JSON array one at a time as ``chunks`` arrive.
+
+    The document is either the array itself or an object with the array
+    under ``key`` (e.g. the ``items`` of a ChangeSet). The other members of
+    such an object are decoded whole into ``fields``, which is complete
+    once the generator is exhausted. Without ``key`` and ``fields`` the
+    document must be an array. Only the unread part of the input and the
+    element being decoded are held in memory.
+    """
+    reader = _Reader(chunks)
+    decoder = json.JSONDecoder()
+
+    first = reader.peek()
+    if first == "[":
+        yield from _elements(reader, decoder)
+    elif first == "{" and (key is not None or fields is not None):
+        fields = fields if fields is not None else {}
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.expect("}")
+            return
+        while True:
+            name = reader.value(decoder)
+            reader.expect(":")
+            if name == key and reader.peek() == "[":
+                yield from _elements(reader, decoder)
+            else:
+                fields[name] = reader.value(decoder)
+            if reader.peek() == ",":
+                reader.expect(",")
+                continue
+            reader.expect("}")
+            break
+    elif first:
+        raise ValueError(f"Expected a JSON array, got {first!r}")
+
+
+def iter_response(response, key: Optional[str] = None, fields: Optional[Dict[str, Any]] = None,
+                  chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """``iter_array`` over the body of a streamed ``requests`` response.
+
+    Responses served from the ``HttpCache`` already hold their body and are
+    iterated from memory.
+    """
+    if getattr(response, 'from_cache', False):
+        return iter_array((response.content,), key, fields)
+    return iter_array(response.iter_content(chunk_size=chunk_size), key, fields)
+
+
+def _elements(reader: _Reader, decoder: json.JSONDecoder) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.expect("]")
+        return
+    while True:
+        yield reader.value(decoder)
+        if reader.peek() == ",":
+            reader.expect(",")
+            continue
+        reader.expect("]")
+        return
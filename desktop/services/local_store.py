@@ -0,0 +1,187 @@
+# services/local_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class LocalStore:
+    """SQLite mirror of the cars, rentals and purchases returned by the API.
+
+    Every record is stored as the JSON object the server sent, keyed by entity
+    name and ID, next to the sync cursor of that entity. The app reads its first
+    screen from here and ``SyncEngine`` keeps it current with delta requests.
+    One connection is shared by the GUI thread and request workers, so every
+    method holds the same lock.
+    """
+
+    SCHEMA_VERSION = 1
+    # Records written per transaction when a stream of records is stored
+    BATCH_SIZE = 500
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or self.default_path()
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._create_schema()
+
+    @staticmethod
+    def default_path() -> str:
+        return os.path.join(os.path.expanduser("~"), ".car_dealership", "local_store.sqlite3")
+
+    def records(self, entity: str) -> List[Dict[str, Any]]:
+        """Return every stored record of ``entity``, ordered by ID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM records WHERE entity = ? ORDER BY id", (entity,)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def iter_records(self, entity: str, status: Optional[str] = None,
+                     batch_size: int = BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the stored records of ``entity`` in ID order, ``batch_size`` at a time.
+
+        Each batch is one short query that resumes after the last ID seen, so
+        the lock is not held between batches and memory stays bounded.
+        ``status`` keeps only the records with that status.
+        """
+        where, params = self._where(entity, status)
+        last_id = None
+        while True:
+            query = f"SELECT id, data FROM records WHERE {where}"
+            args = list(params)
+            if last_id is not None:
+                query += " AND id > ?"
+                args.append(last_id)
+            with self._lock:
+                rows = self._conn.execute(f"{query} ORDER BY id LIMIT ?",
+                                          args + [batch_size]).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [json.loads(data) for _, data in rows]
+
+    def count(self, entity: str, status: Optional[str] = None) -> int:
+        """Return how many records ``iter_records`` yields for the same filter."""
+        where, params = self._where(entity, status)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM records WHERE {where}", params).fetchone()[0]
+
+    def cursor(self, entity: str) -> Optional[str]:
+        """Return the server time of the last successful sync of ``entity``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor FROM sync_state WHERE entity = ?", (entity,)).fetchone()
+        return row[0] if row else None
+
+    def replace(self, entity: str, records: Iterable[Dict[str, Any]], cursor: Optional[str]):
+        """Replace all records of ``entity`` (used for full syncs).
+
+        ``records`` may be a generator over a download in progress: it is
+        written in batches under a staging name, and the old records are only
+        swapped out once it is exhausted, so readers never see a partial list.
+        """
+        staging = f"{entity}:staging"
+        try:
+            self.upsert(staging, records)
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM records WHERE entity = ?", (entity,))
+                self._conn.execute("UPDATE records SET entity = ? WHERE entity = ?", (entity, staging))
+                self._set_cursor(entity, cursor)
+        finally:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM records WHERE entity = ?", (staging,))
+
+    def upsert(self, entity: str, records: Iterable[Dict[str, Any]]):
+        """Insert or update ``records``, one short transaction per ``BATCH_SIZE`` records."""
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.BATCH_SIZE:
+                with self._lock, self._conn:
+                    self._upsert(entity, batch)
+                batch = []
+        if batch:
+            with self._lock, self._conn:
+                self._upsert(entity, batch)
+
+    def apply_changes(self, entity: str, records: Iterable[Dict[str, Any]],
+                      deleted_ids: Iterable[int], cursor: Optional[str]):
+        """Upsert changed records and drop deleted ones in a single transaction."""
+        with self._lock, self._conn:
+            self._upsert(entity, records)
+            self._conn.executemany(
+                "DELETE FROM records WHERE entity = ? AND id = ?",
+                [(entity, int(record_id)) for record_id in deleted_ids])
+            self._set_cursor(entity, cursor)
+
+    def set_cursor(self, entity: str, cursor: Optional[str]):
+        """Record ``cursor`` as the server time of the last sync of ``entity``."""
+        with self._lock, self._conn:
+            self._set_cursor(entity, cursor)
+
+    def clear(self):
+        """Forget every record and cursor; the next sync downloads everything."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM records")
+            self._conn.execute("DELETE FROM sync_state")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Internals
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                # The store is only a cache of the server, so rebuild it on schema changes
+                self._conn.execute("DROP TABLE IF EXISTS records")
+                self._conn.execute("DROP TABLE IF EXISTS sync_state")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    entity TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (entity, id)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    entity TEXT PRIMARY KEY,
+                    cursor TEXT,
+                    synced_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        if self.path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode = WAL")
+
+    @staticmethod
+    def _where(entity: str, status: Optional[str] = None):
+        clauses = ["entity = ?"]
+        params: List[Any] = [entity]
+        if status is not None:
+            clauses.append("json_extract(data, '$.status') = ?")
+            params.append(status)
+        return " AND ".join(clauses), params
+
+    def _upsert(self, entity: str, records: Iterable[Dict[str, Any]]):
+        rows = []
+        for record in records:
+            record_id = record.get('id') if isinstance(record, dict) else None
+            if record_id is None:
+                continue
+            rows.append((entity, int(record_id), json.dumps(record)))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO records (entity, id, data) VALUES (?, ?, ?)", rows)
+
+    def _set_cursor(self, entity: str, cursor: Optional[str]):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state (entity, cursor, synced_at) VALUES (?, ?, ?)",
+            (entity, cursor, time.time()))
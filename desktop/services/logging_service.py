@@ -0,0 +1,87 @@
+# services/logging_service.py
+import json
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+from typing import Optional, Union
+
+LOG_LEVEL_ENV = "CAR_DEALERSHIP_LOG_LEVEL"
+LOG_FILE_ENV = "CAR_DEALERSHIP_LOG_FILE"
+DEFAULT_LEVEL = "WARNING"
+
+CONSOLE_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line.
+
+    Besides time, level, logger and message, every field passed through
+    ``extra={...}`` is written as its own key, so log files can be filtered
+    by e.g. ``endpoint`` or ``status`` without parsing messages.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def default_log_file() -> str:
+    return os.path.join(os.path.expanduser("~"), ".car_dealership", "logs", "desktop.log")
+
+
+def configure_logging(level: Union[str, int, None] = None, log_file: Optional[str] = None,
+                      max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3) -> logging.Logger:
+    """Set up console and rotating-file logging for the desktop app.
+
+    The level comes from ``level``, then the ``CAR_DEALERSHIP_LOG_LEVEL``
+    environment variable, then ``WARNING``. At that default the per-request and
+    per-row debug calls are filtered before their messages are formatted.
+    The file sink writes JSON lines to ``log_file`` (or
+    ``CAR_DEALERSHIP_LOG_FILE``, or ``~/.car_dealership/logs/desktop.log``);
+    pass an empty string to disable it.
+    """
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, DEFAULT_LEVEL)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.WARNING
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    root.addHandler(console)
+
+    if log_file is None:
+        log_file = os.environ.get(LOG_FILE_ENV, default_log_file())
+    if log_file:
+        try:
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                               backupCount=backup_count, encoding='utf-8')
+            file_handler.setFormatter(JsonFormatter())
+            root.addHandler(file_handler)
+        except OSError as e:
+            root.warning("Cannot write log file %s: %s", log_file, e)
+
+    # Connection-level chatter from requests is only useful when debugging it
+    logging.getLogger("urllib3").setLevel(max(level, logging.WARNING))
+    return root
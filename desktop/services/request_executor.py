@@ -0,0 +1,169 @@
+# services/request_executor.py
+import itertools
+from typing import Any, Callable, Dict
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class RequestHandle(QObject):
+    """Tracks one in-flight request and delivers its outcome through Qt signals.
+
+    Handles live on the GUI thread, so signals emitted from the worker thread are
+    queued and the connected slots always run on the GUI thread. The worker
+    only posts the outcome; it is emitted once the GUI thread gets to it, so
+    slots connected right after ``submit`` never miss a request that
+    finished at once.
+    """
+
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+    # Whatever a long job reports through report_progress
+    progress = pyqtSignal(object)
+    # Posted by the worker thread: (succeeded, result or error message)
+    _outcome = pyqtSignal(bool, object)
+    _progress = pyqtSignal(object)
+
+    def __init__(self, key: str, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.cancelled = False
+        self._outcome.connect(self._deliver)
+        self._progress.connect(self._deliver_progress)
+
+    def cancel(self):
+        """Drop the result of this request; connected slots will not be called.
+
+        Jobs submitted ``with_handle`` can also check ``cancelled`` and stop early.
+        """
+        self.cancelled = True
+
+    def report_progress(self, value: Any):
+        """Emit ``progress`` from the worker thread unless the request was cancelled."""
+        if not self.cancelled:
+            self._progress.emit(value)
+
+    def _deliver(self, succeeded: bool, value: Any):
+        try:
+            if not self.cancelled:
+                if succeeded:
+                    self.succeeded.emit(value)
+                else:
+                    self.failed.emit(value)
+        finally:
+            self.finished.emit()
+
+    def _deliver_progress(self, value: Any):
+        if not self.cancelled:
+            self.progress.emit(value)
+
+
+class _RequestRunnable(QRunnable):
+    def __init__(self, handle: RequestHandle, fn: Callable, args, kwargs):
+        super().__init__()
+        self.handle = handle
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        # The executor keeps the Python reference alive until the handle finishes
+        self.setAutoDelete(False)
+
+    def run(self):
+        handle = self.handle
+        if handle.cancelled:
+            handle._outcome.emit(False, None)
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            handle._outcome.emit(False, str(e))
+        else:
+            handle._outcome.emit(True, result)
+
+
+class RequestExecutor(QObject):
+    """Runs blocking ApiService calls on a bounded thread pool.
+
+    Requests are identified by a key; submitting a key that is already in flight
+    returns the existing handle instead of sending a duplicate request. Queued
+    requests start in ``priority`` order (higher first), so background
+    prefetches never delay what the user is waiting for.
+    """
+
+    # Emitted when the last queued or running request has finished
+    idle = pyqtSignal()
+
+    # Priorities of submitted work
+    PREFETCH = -10
+    NORMAL = 0
+
+    def __init__(self, max_workers: int = 4, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._in_flight: Dict[str, RequestHandle] = {}
+        self._runnables: Dict[RequestHandle, _RequestRunnable] = {}
+        self._sequence = itertools.count(1)
+
+    def submit(self, key: str, fn: Callable, *args: Any, priority: int = NORMAL,
+               coalesce: bool = True, with_handle: bool = False, **kwargs: Any) -> RequestHandle:
+        """Run ``fn(*args, **kwargs)`` in the pool, coalescing on ``key``.
+
+        Writes must pass ``coalesce=False``: every call then runs, under a
+        unique key derived from ``key``. With ``with_handle`` the handle is
+        passed to ``fn`` as the ``handle`` keyword, so a long job can report
+        progress and see cancellation.
+        """
+        if coalesce:
+            handle = self._in_flight.get(key)
+            if handle is not None and not handle.cancelled:
+                return handle
+        else:
+            key = f"{key}#{next(self._sequence)}"
+
+        handle = RequestHandle(key, self)
+        if with_handle:
+            kwargs['handle'] = handle
+        handle.finished.connect(lambda h=handle: self._discard(h))
+        runnable = _RequestRunnable(handle, fn, args, kwargs)
+        self._in_flight[key] = handle
+        self._runnables[handle] = runnable
+        self.pool.start(runnable, priority)
+        return handle
+
+    def is_running(self, key: str) -> bool:
+        """Return True if a request with ``key`` is queued or running."""
+        handle = self._in_flight.get(key)
+        return handle is not None and not handle.cancelled
+
+    def is_idle(self) -> bool:
+        """Return True if no request is queued or running."""
+        return not self._runnables
+
+    def cancel(self, key: str):
+        """Cancel the request with ``key``; queued work is removed from the pool."""
+        handle = self._in_flight.pop(key, None)
+        if handle is None:
+            return
+        handle.cancel()
+        runnable = self._runnables.get(handle)
+        if runnable is not None and self.pool.tryTake(runnable):
+            self._discard(handle)
+
+    def cancel_all(self):
+        """Cancel every queued or running request."""
+        for key in list(self._in_flight):
+            self.cancel(key)
+
+    def shutdown(self, timeout_ms: int = 3000):
+        """Cancel pending work and wait for running requests to finish."""
+        self.cancel_all()
+        self.pool.waitForDone(timeout_ms)
+
+    def _discard(self, handle: RequestHandle):
+        if self._in_flight.get(handle.key) is handle:
+            del self._in_flight[handle.key]
+        self._runnables.pop(handle, None)
+        handle.deleteLater()
+        if not self._runnables:
+            self.idle.emit()
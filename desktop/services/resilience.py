@@ -0,0 +1,142 @@
+# services/resilience.py
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class RetryPolicy:
+    """Decides which failed requests are sent again, and after how long.
+
+    Only requests that are safe to repeat are retried:
+
+    * a connection that could not be opened never reached the server, so
+      any method is retried;
+    * gateway errors (``retry_statuses``) and dropped connections are
+      retried for idempotent methods only;
+    * a read timeout may mean the server is still working on the request,
+      so only safe methods (GET, HEAD) are retried.
+
+    Delays grow exponentially with "full jitter" (a random delay between 0
+    and ``base_delay * 2**attempt``, capped at ``max_delay``), so clients
+    that failed together do not retry in lockstep. A ``Retry-After`` header
+    is honoured up to ``max_delay``. ``rng`` draws the jitter (tests pass a
+    seeded ``random.Random``).
+    """
+
+    SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    IDEMPOTENT_METHODS = SAFE_METHODS | {'PUT', 'DELETE'}
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0,
+                 retry_statuses=frozenset({429, 502, 503, 504}),
+                 rng: Optional[random.Random] = None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.rng = rng or random
+
+    def should_retry_error(self, method: str, error: requests.exceptions.RequestException) -> bool:
+        if isinstance(error, CircuitOpenError):
+            return False
+        if isinstance(error, requests.exceptions.ConnectTimeout) or _not_connected(error):
+            return True
+        if isinstance(error, requests.exceptions.ReadTimeout):
+            return method in self.SAFE_METHODS
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return method in self.IDEMPOTENT_METHODS
+        return False
+
+    def should_retry_response(self, method: str, response: requests.Response) -> bool:
+        return method in self.IDEMPOTENT_METHODS and response.status_code in self.retry_statuses
+
+    def delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def _not_connected(error: requests.exceptions.RequestException) -> bool:
+    # requests wraps urllib3's MaxRetryError, whose reason says why the connection failed
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class CircuitBreaker:
+    """Stops sending requests to a backend that keeps failing.
+
+    After ``failure_threshold`` consecutive failures (errors or 5xx
+    responses) the circuit opens and ``allow`` refuses every request for
+    ``reset_timeout`` seconds, so callers fail fast instead of queueing
+    behind timeouts. Then one trial request is let through ("half open"):
+    its success closes the circuit, its failure opens it again. Time is
+    read from ``clock`` (``time.monotonic`` unless a test fakes it).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Backend is responding again; circuit closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or (
+                    self._state == self.CLOSED and self._failures >= self.failure_threshold):
+                if self._state == self.CLOSED:
+                    logger.warning("%d consecutive request failures; failing fast for %.0f s",
+                                   self._failures, self.reset_timeout)
+                self._state = self.OPEN
+                self._opened_at = self.clock()
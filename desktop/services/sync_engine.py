@@ -0,0 +1,107 @@
+# services/sync_engine.py
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from services.json_stream import iter_response
+from services.local_store import LocalStore
+
+if TYPE_CHECKING:
+    from services.api_service import ApiService
+
+logger = logging.getLogger(__name__)
+
+
+class SyncEngine:
+    """Keeps a ``LocalStore`` in step with the server using delta requests.
+
+    The first sync of an entity downloads every record from
+    ``/api/<entity>/changes``; later syncs send the server time returned last
+    time as ``since`` and only receive the rows changed (or deleted) after it.
+    Servers without the ``/changes`` endpoints fall back to a full download.
+    Response bodies are parsed as they stream in and written to the store in
+    batches, so a full download never holds the whole list in memory.
+    Concurrent syncs of one entity run one after the other, so a sync that
+    was waiting only fetches the delta of the one before it.
+    """
+
+    ENDPOINTS = {
+        'cars': '/api/cars',
+        'rentals': '/api/rentals',
+        'purchases': '/api/purchases',
+    }
+    # Re-read a few seconds before the cursor so rows committed while the
+    # previous delta was being built are not missed (upserts are idempotent)
+    CURSOR_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, api_service: ApiService, store: Optional[LocalStore] = None):
+        self.api_service = api_service
+        self.store = store or LocalStore()
+        self._locks = {entity: threading.Lock() for entity in self.ENDPOINTS}
+
+    def cached(self, entity: str) -> List[Dict[str, Any]]:
+        """Return the locally stored records of ``entity`` without touching the network."""
+        return self.store.records(entity)
+
+    def cached_batches(self, entity: str) -> Iterator[List[Dict[str, Any]]]:
+        """Like ``cached``, but a batch of records at a time."""
+        return self.store.iter_records(entity)
+
+    def sync(self, entity: str):
+        """Pull the changes of ``entity`` since the last sync into the local store.
+
+        If the server cannot be reached the stored records are left unchanged.
+        """
+        with self._locks[entity]:
+            self._sync(entity)
+
+    def _sync(self, entity: str):
+        endpoint = self.ENDPOINTS[entity]
+        cursor = self.store.cursor(entity)
+        params = {'since': self._since(cursor)} if cursor else None
+
+        response = self.api_service.get_stream(f"{endpoint}/changes", params=params)
+        if response is not None and response.status_code == 200:
+            # serverTime and deletedIds follow the items, so they are read once
+            # the items have been stored
+            fields: Dict[str, Any] = {}
+            with response:
+                items = iter_response(response, 'items', fields)
+                if cursor:
+                    self.store.upsert(entity, items)
+                    self.store.apply_changes(entity, (), fields.get('deletedIds') or [],
+                                             fields.get('serverTime'))
+                else:
+                    self.store.replace(entity, items, None)
+                    self.store.set_cursor(entity, fields.get('serverTime'))
+        elif response is not None:
+            response.close()
+            # Older servers route "/changes" to "/{id}" and answer with an error:
+            # mirror the full list instead
+            response = self.api_service.get_stream(endpoint)
+            if response is not None:
+                with response:
+                    if response.status_code == 200:
+                        try:
+                            self.store.replace(entity, iter_response(response), None)
+                        except ValueError as e:
+                            logger.warning("Unexpected %s list from %s: %s", entity, endpoint, e)
+        else:
+            logger.warning("Sync of %s failed, using the local copy", entity)
+
+    def reset(self):
+        """Drop the local copy; the next sync of every entity is a full download."""
+        self.store.clear()
+
+    def _since(self, cursor: str) -> str:
+        try:
+            moment = datetime.fromisoformat(cursor.replace('Z', '+00:00'))
+        except ValueError:
+            return cursor
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        moment = (moment - self.CURSOR_OVERLAP).astimezone(timezone.utc)
+        return moment.isoformat().replace('+00:00', 'Z')
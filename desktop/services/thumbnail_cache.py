@@ -0,0 +1,276 @@
+# services/thumbnail_cache.py
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QCoreApplication, QSize, QStandardPaths, QTimer, QUrl, Qt
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+ThumbnailCallback = Callable[[Optional[QPixmap]], None]
+
+
+class ThumbnailCache(QObject):
+    """Two-tier cache of already-scaled car images.
+
+    Thumbnails are stored on disk as PNG files named after a hash of the image
+    URL and the target size, with an LRU index bounded by ``max_bytes``. Recently
+    used thumbnails are also kept as ``QPixmap`` objects in memory. Remote images
+    are considered fresh for ``max_age`` seconds (or the server's ``max-age``);
+    after that they are served from disk immediately and revalidated in the
+    background with ``If-None-Match`` / ``If-Modified-Since``.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 200 * 1024 * 1024,
+                 memory_items: int = 300, max_age: int = 24 * 3600, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir or self.default_cache_dir()
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.max_age = max_age
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._index: "OrderedDict[str, Dict]" = OrderedDict()
+        self._memory: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._pending: Dict[str, List[ThumbnailCallback]] = {}
+        self._total_bytes = 0
+        self._load_index()
+
+        self.network_manager = QNetworkAccessManager(self)
+        self.network_manager.finished.connect(self._on_reply)
+
+        # Persist the index at most every couple of seconds
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(2000)
+        self._save_timer.timeout.connect(self.flush)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+    @staticmethod
+    def default_cache_dir() -> str:
+        base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+        if not base:
+            base = os.path.join(os.path.expanduser("~"), ".cache", "car_dealership")
+        return os.path.join(base, "thumbnails")
+
+    # Public API
+
+    def get(self, source: str, size: QSize, callback: ThumbnailCallback):
+        """Deliver the thumbnail of ``source`` scaled to fit ``size`` to ``callback``.
+
+        ``source`` may be an http(s) URL or a local file path. The callback
+        receives ``None`` if the image cannot be loaded; for stale remote images
+        it may be called a second time once revalidation returns new content.
+        """
+        if not source:
+            callback(None)
+            return
+
+        is_remote = source.startswith(('http://', 'https://'))
+        key = self._key(source, size, is_remote)
+
+        pixmap = self._memory.get(key)
+        if pixmap is not None:
+            self._memory.move_to_end(key)
+            self._touch(key)
+            callback(pixmap)
+            if is_remote and self._is_stale(key):
+                self._fetch(source, size, key, callback)
+            return
+
+        entry = self._index.get(key)
+        if entry is not None:
+            pixmap = QPixmap(self._path(key))
+            if not pixmap.isNull():
+                self._remember(key, pixmap)
+                self._touch(key)
+                callback(pixmap)
+                if is_remote and self._is_stale(key):
+                    self._fetch(source, size, key, callback)
+                return
+            self._drop(key)
+
+        if is_remote:
+            self._fetch(source, size, key, callback)
+        else:
+            callback(self._load_local(source, size, key))
+
+    def clear_memory(self):
+        """Drop the in-memory tier; thumbnails stay available on disk."""
+        self._memory.clear()
+
+    def flush(self):
+        """Write the index to disk."""
+        self._save_timer.stop()
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._index.items()), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Error saving thumbnail index: %s", e)
+
+    # Internals
+
+    def _key(self, source: str, size: QSize, is_remote: bool) -> str:
+        version = ""
+        if not is_remote:
+            # Local files are re-scaled when they change on disk
+            try:
+                stat = os.stat(source)
+                version = f"{stat.st_mtime_ns}:{stat.st_size}"
+            except OSError:
+                version = "missing"
+        raw = f"{source}|{size.width()}x{size.height()}|{version}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def _is_stale(self, key: str) -> bool:
+        entry = self._index.get(key)
+        return entry is None or time.time() > entry.get('expires', 0)
+
+    def _touch(self, key: str):
+        if key in self._index:
+            self._index.move_to_end(key)
+
+    def _remember(self, key: str, pixmap: QPixmap):
+        self._memory[key] = pixmap
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _load_local(self, path: str, size: QSize, key: str) -> Optional[QPixmap]:
+        if not os.path.exists(path):
+            return None
+        image = QImage(path)
+        if image.isNull():
+            return None
+        return self._store(key, image, size, {'url': path, 'expires': float('inf')})
+
+    def _fetch(self, url: str, size: QSize, key: str, callback: ThumbnailCallback):
+        waiting = self._pending.get(key)
+        if waiting is not None:
+            # Coalesce with the request that is already in flight
+            waiting.append(callback)
+            return
+        self._pending[key] = [callback]
+
+        request = QNetworkRequest(QUrl(url))
+        # Set a user agent to avoid 403 errors
+        request.setHeader(QNetworkRequest.UserAgentHeader, USER_AGENT)
+        entry = self._index.get(key)
+        if entry is not None:
+            if entry.get('etag'):
+                request.setRawHeader(b'If-None-Match', entry['etag'].encode('latin-1'))
+            if entry.get('last_modified'):
+                request.setRawHeader(b'If-Modified-Since', entry['last_modified'].encode('latin-1'))
+
+        reply = self.network_manager.get(request)
+        reply.setProperty('thumbnail_key', key)
+        reply.setProperty('thumbnail_url', url)
+        reply.setProperty('thumbnail_size', size)
+        # Revalidation callers already hold the cached image
+        reply.setProperty('thumbnail_revalidate', entry is not None)
+
+    def _on_reply(self, reply: QNetworkReply):
+        key = reply.property('thumbnail_key')
+        url = reply.property('thumbnail_url')
+        size = reply.property('thumbnail_size')
+        revalidate = bool(reply.property('thumbnail_revalidate'))
+        callbacks = self._pending.pop(key, [])
+        pixmap = None
+        try:
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            if status == 304 and key in self._index:
+                # Not modified: extend freshness, no download or decode needed
+                self._index[key]['expires'] = self._expires(reply)
+                self._schedule_save()
+            elif reply.error() == QNetworkReply.NoError:
+                image = QImage()
+                if image.loadFromData(reply.readAll()):
+                    entry = {
+                        'url': url,
+                        'etag': bytes(reply.rawHeader(b'ETag')).decode('latin-1'),
+                        'last_modified': bytes(reply.rawHeader(b'Last-Modified')).decode('latin-1'),
+                        'expires': self._expires(reply),
+                    }
+                    pixmap = self._store(key, image, size, entry)
+        except Exception:
+            logger.exception("Error processing thumbnail for %s", url)
+        finally:
+            reply.deleteLater()
+
+        if revalidate and pixmap is None:
+            # Keep showing the cached image on 304 or when revalidation failed
+            return
+        for callback in callbacks:
+            callback(pixmap)
+
+    def _expires(self, reply: QNetworkReply) -> float:
+        cache_control = bytes(reply.rawHeader(b'Cache-Control')).decode('latin-1')
+        match = re.search(r'max-age=(\d+)', cache_control)
+        max_age = int(match.group(1)) if match else self.max_age
+        return time.time() + max_age
+
+    def _store(self, key: str, image: QImage, size: QSize, entry: Dict) -> QPixmap:
+        scaled = image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        path = self._path(key)
+        if scaled.save(path, "PNG"):
+            self._drop(key, delete_file=False)
+            entry['bytes'] = os.path.getsize(path)
+            self._index[key] = entry
+            self._total_bytes += entry['bytes']
+            self._evict()
+            self._schedule_save()
+        pixmap = QPixmap.fromImage(scaled)
+        self._remember(key, pixmap)
+        return pixmap
+
+    def _drop(self, key: str, delete_file: bool = True):
+        entry = self._index.pop(key, None)
+        self._memory.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.get('bytes', 0)
+        if delete_file:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Remove least recently used thumbnails until the disk budget is met."""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            self._drop(oldest)
+
+    def _schedule_save(self):
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    def _load_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, entry in items:
+            if os.path.exists(self._path(key)):
+                self._index[key] = entry
+                self._total_bytes += entry.get('bytes', 0)
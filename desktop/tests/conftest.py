@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The app imports its packages from desktop/; Qt runs without a display
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+@pytest.fixture
+def wait_idle(qapp):
+    """Wait for an executor's requests and deliver their queued signals."""
+    def wait(executor, timeout_ms: int = 5000):
+        executor.pool.waitForDone(timeout_ms)
+        for _ in range(5):
+            qapp.processEvents()
+    return wait
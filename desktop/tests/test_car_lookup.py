@@ -0,0 +1,123 @@
+import threading
+
+from services.car_lookup import CarLookup
+
+
+class Response:
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class SlowApi:
+    """Fake ApiService whose car list request blocks until released."""
+
+    def __init__(self, cars):
+        self.cars = {car['id']: car for car in cars}
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.list_calls = 0
+        self.single_calls = []
+
+    def get(self, endpoint, **kwargs):
+        assert endpoint == "/api/cars"
+        self.list_calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return Response(list(self.cars.values()))
+
+    def get_car(self, car_id):
+        self.single_calls.append(car_id)
+        return self.cars.get(car_id)
+
+
+def test_gui_calls_do_not_wait_for_a_slow_resolve():
+    api = SlowApi([{'id': 1, 'name': 'Dacia'}])
+    lookup = CarLookup(api)
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(lookup.resolve([1])))
+    worker.start()
+    assert api.started.wait(5)
+
+    # The list request is still in flight; the cache stays usable
+    acquired = threading.Event()
+
+    def gui_calls():
+        lookup.prime([{'id': 2, 'name': 'Skoda'}])
+        lookup.known([2])
+        acquired.set()
+
+    threading.Thread(target=gui_calls).start()
+    assert acquired.wait(1)
+    api.release.set()
+    worker.join(5)
+    assert result == {1: {'id': 1, 'name': 'Dacia'}}
+    assert lookup.known([1, 2]).keys() == {1, 2}
+
+
+def test_concurrent_resolves_share_one_list_request():
+    api = SlowApi([{'id': 1}, {'id': 2}])
+    lookup = CarLookup(api)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(lookup.resolve([1, 2])))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert api.started.wait(5)
+    api.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert api.list_calls == 1
+    assert api.single_calls == []
+    assert all(result.keys() == {1, 2} for result in results)
+
+
+def test_unknown_ids_fall_back_to_single_requests_and_are_remembered():
+    api = SlowApi([{'id': 1}])
+    api.release.set()
+    lookup = CarLookup(api)
+    assert lookup.resolve([1, 7]) == {1: {'id': 1}}
+    assert api.single_calls == [7]
+    lookup.resolve([7])
+    assert api.single_calls == [7]
+
+
+def test_results_fetched_before_an_invalidate_are_not_cached():
+    api = SlowApi([{'id': 1}])
+    lookup = CarLookup(api)
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(lookup.resolve([1])))
+    worker.start()
+    assert api.started.wait(5)
+    lookup.invalidate()
+    api.release.set()
+    worker.join(5)
+    assert result == {1: {'id': 1}}
+    assert lookup.known([1]) == {}
+
+
+def test_refresh_keeps_unchanged_cars_and_forgets_deleted_ones():
+    api = SlowApi([{'id': 1}, {'id': 2}])
+    api.release.set()
+    lookup = CarLookup(api)
+    lookup.resolve([1, 2, 9])
+    assert api.list_calls == 1
+
+    lookup.refresh([{'id': 1, 'name': 'changed'}, {'id': 3}, {'id': 9}])
+    assert lookup.known([1, 2, 3, 9]) == {1: {'id': 1, 'name': 'changed'}, 3: {'id': 3}, 9: {'id': 9}}
+    # Nothing is downloaded again
+    assert lookup.resolve([1, 3, 9]).keys() == {1, 3, 9}
+    assert api.list_calls == 1
+    assert api.single_calls == [9]
+
+
+def test_refresh_with_an_empty_list_keeps_the_cache():
+    api = SlowApi([{'id': 1}])
+    api.release.set()
+    lookup = CarLookup(api)
+    lookup.resolve([1])
+    lookup.refresh([])
+    assert lookup.known([1]) == {1: {'id': 1}}
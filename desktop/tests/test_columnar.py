@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+
+from models.columnar import Column, ColumnarTable, car_table, rental_table
+
+RENTALS = [
+    {'id': 1, 'customerName': 'Ana', 'customerEmail': 'ana@x.ro', 'car': {'id': 10, 'name': 'Dacia', 'model': 'Logan', 'type': 'SEDAN'},
+     'startDate': '2024-01-01', 'endDate': '2024-01-05', 'status': 'PENDING', 'totalPrice': 200.0},
+    {'id': 2, 'customerName': 'bogdan', 'customerEmail': 'b@x.ro', 'car': {'id': 11, 'name': 'Skoda', 'model': 'Octavia', 'type': 'SUV'},
+     'startDate': '2024-02-10T09:30:00', 'endDate': '2024-02-12', 'status': 'APPROVED', 'totalPrice': 150.5},
+    {'id': 3, 'customerName': 'Carmen', 'customerEmail': None, 'car': {'id': 10, 'name': 'Dacia', 'model': 'Logan', 'type': 'SEDAN'},
+     'startDate': None, 'endDate': '2024-03-02', 'status': 'PENDING', 'totalPrice': None},
+    # Missing keys altogether
+    {'id': 4, 'customerName': 'Dan'},
+]
+
+
+@pytest.fixture
+def table():
+    return rental_table(RENTALS)
+
+
+def test_round_trip_of_records(table):
+    assert len(table) == 4
+    assert table.values('id') == [1, 2, 3, 4]
+    assert table.values('customer_name') == ['Ana', 'bogdan', 'Carmen', 'Dan']
+    assert table.values('car_id') == [10, 11, 10, 0]
+    assert table.values('car_name') == ['Dacia Logan', 'Skoda Octavia', 'Dacia Logan', '']
+    # Date-times become days; missing dates are empty
+    assert table.values('start_date') == ['2024-01-01', '2024-02-10', '', '']
+    assert table.value('end_date', 2) == '2024-03-02'
+    assert table.values('total_price') == [200.0, 150.5, 0.0, 0.0]
+    assert table.values('status') == ['PENDING', 'APPROVED', 'PENDING', 'PENDING']
+    assert table.value('customer_email', 2) == ''
+
+
+def test_records_are_read_in_a_single_pass(table):
+    streamed = rental_table(record for record in RENTALS)
+    for name in table.column_names:
+        assert streamed.values(name) == table.values(name)
+
+
+def test_strings_are_dictionary_encoded(table):
+    assert table.array('status').dtype == np.int32
+    assert table.dictionary('status') == ['PENDING', 'APPROVED']
+    assert table.array('status').tolist() == [0, 1, 0, 0]
+    assert table.categories('car_name') == ['Dacia Logan', 'Skoda Octavia']
+
+
+def test_empty_table():
+    table = rental_table([])
+    assert len(table) == 0
+    assert table.values('status') == []
+    assert not table.contains(('customer_name',), 'x').any()
+
+
+def test_unknown_column_kind_is_rejected():
+    with pytest.raises(ValueError):
+        ColumnarTable.from_records([{'id': 1}], (Column('id', 'uuid', lambda r: r['id']),))
+
+
+def test_equals_and_isin(table):
+    assert table.equals('status', 'PENDING').tolist() == [True, False, True, True]
+    assert not table.equals('status', 'CANCELLED').any()
+    assert table.equals('car_id', 10).tolist() == [True, False, True, False]
+    assert table.equals('start_date', '2024-02-10').tolist() == [False, True, False, False]
+    assert table.isin('status', ['APPROVED', 'UNKNOWN']).tolist() == [False, True, False, False]
+    assert table.isin('id', [2, 4]).tolist() == [False, True, False, True]
+
+
+def test_between_dates_and_numbers(table):
+    assert table.between('start_date', '2024-01-15').tolist() == [False, True, False, False]
+    assert table.between('start_date', None, '2024-01-31').tolist() == [True, False, False, False]
+    # Rows without a date never match, even without bounds
+    assert table.between('start_date').tolist() == [True, True, False, False]
+    assert table.between('total_price', 100, 180).tolist() == [False, True, False, False]
+
+
+def test_contains_is_case_insensitive_over_several_columns(table):
+    assert table.contains(('customer_name', 'car_name'), 'BOG').tolist() == [False, True, False, False]
+    assert table.contains(('customer_name', 'car_name'), 'dacia').tolist() == [True, False, True, False]
+    assert table.contains(('customer_name',), '  ').all()
+
+
+def test_group_sum(table):
+    labels, counts, sums = table.group_sum('status', 'total_price')
+    assert labels == ['PENDING', 'APPROVED']
+    assert counts.tolist() == [3, 1]
+    assert sums.tolist() == [200.0, 150.5]
+    # Groups without rows in the selection are left out
+    labels, counts, sums = table.group_sum('status', rows=table.equals('car_id', 11))
+    assert labels == ['APPROVED']
+    assert counts.tolist() == [1]
+    assert sums.tolist() == [0.0]
+
+
+def test_order(table):
+    # Case-insensitive strings
+    assert table.order('customer_name').tolist() == [0, 1, 2, 3]
+    assert table.order('customer_name', descending=True).tolist() == [3, 2, 1, 0]
+    # Missing dates first; ties keep row order in both directions
+    assert table.order('start_date').tolist() == [2, 3, 0, 1]
+    assert table.order('status').tolist() == [1, 0, 2, 3]
+    assert table.order('status', descending=True).tolist() == [0, 2, 3, 1]
+    # Only the given rows
+    assert table.order('total_price', np.array([0, 1])).tolist() == [1, 0]
+
+
+def test_patch_replaces_appends_and_deletes(table):
+    patched = table.patch([
+        dict(RENTALS[0], status='APPROVED', totalPrice=250.0),
+        {'id': 9, 'customerName': 'Eva', 'status': 'CANCELLED', 'startDate': '2024-05-01'},
+    ], deleted_ids=[2])
+    assert patched.values('id') == [1, 3, 4, 9]
+    assert patched.values('status') == ['APPROVED', 'PENDING', 'PENDING', 'CANCELLED']
+    assert patched.values('total_price') == [250.0, 0.0, 0.0, 0.0]
+    assert patched.values('start_date') == ['2024-01-01', '', '', '2024-05-01']
+    # The original is unchanged
+    assert table.values('id') == [1, 2, 3, 4]
+    assert table.values('status') == ['PENDING', 'APPROVED', 'PENDING', 'PENDING']
+
+
+def test_patch_then_filter(table):
+    patched = table.patch([{'id': 3, 'customerName': 'Carmen', 'status': 'REJECTED'}])
+    assert patched.equals('status', 'REJECTED').tolist() == [False, False, True, False]
+    assert patched.contains(('status',), 'rej').tolist() == [False, False, True, False]
+    assert patched.categories('status') == ['APPROVED', 'PENDING', 'REJECTED']
+    assert patched.between('start_date').tolist() == [True, True, False, False]
+
+
+def test_patch_skips_records_without_id_and_needs_a_schema(table):
+    assert table.patch([{'customerName': 'nobody'}]).values('id') == [1, 2, 3, 4]
+    plain = ColumnarTable({'id': np.array([1])}, {'id': 'int'}, {})
+    with pytest.raises(ValueError):
+        plain.patch([{'id': 1}])
+
+
+def test_with_values_copies_only_the_changed_column(table):
+    rows = table.isin('id', [1, 3])
+    changed = table.with_values('status', rows, 'CONFIRMED')
+    assert changed.values('status') == ['CONFIRMED', 'APPROVED', 'CONFIRMED', 'PENDING']
+    assert changed.equals('status', 'CONFIRMED').tolist() == [True, False, True, False]
+    assert changed.array('customer_name') is table.array('customer_name')
+    assert table.values('status') == ['PENDING', 'APPROVED', 'PENDING', 'PENDING']
+    # None is stored as the empty string / a missing date
+    cleared = table.with_values('start_date', np.array([0]), None)
+    assert cleared.value('start_date', 0) == ''
+    assert cleared.with_values('customer_name', np.array([1]), None).value('customer_name', 1) == ''
+
+
+def test_sum(table):
+    assert table.sum('total_price') == 350.5
+    assert table.sum('total_price', table.equals('status', 'PENDING')) == 200.0
+
+
+def test_car_daily_rate_is_read_from_either_field_name():
+    cars = car_table([{'id': 1, 'name': 'Dacia', 'dailyRate': 30.0},
+                      {'id': 2, 'name': 'Skoda', 'pricePerDay': 45.0, 'dailyRate': 45.0},
+                      {'id': 3, 'name': 'Ford'}])
+    assert cars.values('price_per_day') == [30.0, 45.0, 0.0]
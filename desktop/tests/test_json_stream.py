@@ -0,0 +1,125 @@
+import io
+import json
+
+import pytest
+import requests
+
+from services.api_service import ApiService
+from services.http_cache import HttpCache
+from services.json_stream import iter_array, iter_response
+
+
+def byte_chunks(data: bytes, size: int = 1):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_tokens_split_across_chunks():
+    document = b'[{"name": "Logan", "price": 12500.5}, -1.5e3, 2E+2, 123456, true, false, null]'
+    expected = json.loads(document)
+    for size in (1, 2, 3, 7):
+        assert list(iter_array(byte_chunks(document, size))) == expected
+
+
+def test_multibyte_characters_split_across_chunks():
+    document = json.dumps([{"city": "Brașov"}, "10 €", "日本"], ensure_ascii=False).encode('utf-8')
+    assert list(iter_array(byte_chunks(document))) == [{"city": "Brașov"}, "10 €", "日本"]
+
+
+def test_whitespace_and_commas_at_chunk_boundaries():
+    chunks = [b' \n[', b'1', b' ,', b'\t', b'', b' 2', b',', b'\r\n3 ', b' ]', b' \n']
+    assert list(iter_array(chunks)) == [1, 2, 3]
+
+
+@pytest.mark.parametrize('document', [b'[]', b'[ ]', b' [\n] ', b''])
+def test_empty_arrays(document):
+    assert list(iter_array(byte_chunks(document))) == []
+
+
+def test_array_under_key_with_other_fields():
+    document = b'{"serverTime": "2026-01-01T00:00:00Z", "items": [{"id": 1}, {"id": 2}], "deletedIds": [3]}'
+    fields = {}
+    assert list(iter_array(byte_chunks(document, 5), 'items', fields)) == [{"id": 1}, {"id": 2}]
+    assert fields == {"serverTime": "2026-01-01T00:00:00Z", "deletedIds": [3]}
+
+
+@pytest.mark.parametrize('document', [b'[{"id": 1}, {"id": 2', b'[1, 2', b'[1, 2,', b'["unterminated',
+                                      b'{"items": [1'])
+def test_truncated_input_raises(document):
+    with pytest.raises(ValueError):
+        list(iter_array(byte_chunks(document), 'items', {}))
+
+
+def test_non_array_document_raises():
+    with pytest.raises(ValueError, match="Expected a JSON array"):
+        list(iter_array([b'{"id": 1}']))
+
+
+def test_iter_response_reads_cached_bodies_from_memory():
+    class Cached:
+        from_cache = True
+        content = b'[1, 2]'
+
+        def iter_content(self, chunk_size):
+            raise AssertionError("cached responses are not streamed")
+
+    assert list(iter_response(Cached())) == [1, 2]
+
+
+# Streamed list requests and the HTTP cache
+
+def response(status_code, body=b'', headers=None, url="http://test/api/rentals"):
+    result = requests.Response()
+    result.status_code = status_code
+    result.raw = io.BytesIO(body)
+    result.headers.update(headers or {})
+    result.url = url
+    return result
+
+
+class FakeTransport:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, endpoint, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return self.responses.pop(0)
+
+
+def api_with(*responses):
+    # A zero TTL makes every cached list stale, so each load is a conditional request
+    transport = FakeTransport(*responses)
+    return ApiService("http://test", HttpCache(ttls={'/api/rentals': 0.0}), transport), transport
+
+
+def test_streamed_list_is_revalidated_with_its_etag():
+    body = b'[{"id": 1}, {"id": 2}]'
+    api, transport = api_with(response(200, body, {'ETag': '"v1"'}), response(304, headers={'ETag': '"v1"'}))
+
+    assert list(api.iter_records("/api/rentals")) == [{"id": 1}, {"id": 2}]
+    assert 'If-None-Match' not in (transport.requests[0][2].get('headers') or {})
+
+    assert list(api.iter_records("/api/rentals")) == [{"id": 1}, {"id": 2}]
+    assert transport.requests[1][2]['headers']['If-None-Match'] == '"v1"'
+
+
+def test_streamed_list_falls_back_to_the_cached_body_on_errors():
+    api, _ = api_with(response(200, b'[1, 2]', {'ETag': '"v1"'}), response(503, b'down'))
+    assert list(api.iter_records("/api/rentals")) == [1, 2]
+    assert list(api.iter_records("/api/rentals")) == [1, 2]
+
+
+def test_streamed_list_is_not_cached_when_read_partially_or_too_large():
+    api, transport = api_with(response(200, b'[1, 2, 3]', {'ETag': '"v1"'}),
+                              response(200, b'[1, 2, 3]', {'ETag': '"v1"'}),
+                              response(200, b'[4]'))
+    records = api.iter_records("/api/rentals")
+    assert next(records) == 1
+    records.close()
+    assert api.http_cache.lookup("http://test/api/rentals") is None
+
+    api.http_cache.MAX_STREAMED_BODY = 4
+    assert list(api.iter_records("/api/rentals")) == [1, 2, 3]
+    assert api.http_cache.lookup("http://test/api/rentals") is None
+    assert list(api.iter_records("/api/rentals")) == [4]
+    assert 'If-None-Match' not in (transport.requests[2][2].get('headers') or {})
@@ -0,0 +1,52 @@
+import pytest
+
+CARS = [{'id': 10, 'name': 'Dacia', 'model': 'Logan', 'type': 'SEDAN', 'pricePerDay': 30.0},
+        {'id': 11, 'name': 'Skoda', 'model': 'Octavia', 'type': 'SEDAN', 'pricePerDay': 45.0}]
+RENTALS = [
+    {'id': rental_id, 'customerName': name, 'car': CARS[car], 'startDate': '2024-01-02',
+     'endDate': '2024-01-05', 'status': 'CONFIRMED', 'totalPrice': 100.0}
+    for rental_id, name, car in ((1, 'Ana', 0), (2, 'Bogdan', 1), (3, 'Carmen', 0))
+]
+PURCHASES = [
+    {'id': 5, 'customerName': 'Dan', 'carId': 10, 'purchasePrice': 9000.0,
+     'purchaseDate': '2024-01-03', 'paymentMethod': 'CASH', 'status': 'COMPLETED'},
+    {'id': 6, 'customerName': 'Elena', 'carId': 11, 'purchasePrice': 15000.0,
+     'purchaseDate': '2024-01-04', 'paymentMethod': 'CARD', 'status': 'COMPLETED'},
+]
+
+
+@pytest.fixture
+def window(qapp, tmp_path, monkeypatch, wait_idle):
+    # The local store and thumbnail cache live under HOME; syncs only read the store
+    monkeypatch.setenv('HOME', str(tmp_path))
+    from services.sync_engine import SyncEngine
+    from ui.car_management_widget import CarManagementWidget
+    from ui.main_window import MainWindow
+    monkeypatch.setattr(SyncEngine, 'sync', lambda self, entity: None)
+    monkeypatch.setattr(CarManagementWidget, 'load_cars', lambda self: None)
+
+    window = MainWindow()
+    for entity, records in (('cars', CARS), ('rentals', RENTALS), ('purchases', PURCHASES)):
+        window.local_store.replace(entity, records, None)
+    for index in range(window.tabs.count()):
+        window.tabs.widget(index).build()
+    window.analytics_tab.load_data()
+    wait_idle(window.request_executor)
+    yield window
+    window.request_executor.shutdown()
+    window.local_store.close()
+
+
+def test_deleted_car_is_dropped_from_the_tabs_and_analytics(window):
+    assert len(window.rentals_tab.model.table) == 3
+    assert window.api_service.car_lookup.known([10])
+
+    window.car_management_tab.car_removed.emit(10)
+
+    assert window.rentals_tab.model.table.values('id') == [2]
+    assert window.purchases_tab.model.table.values('id') == [6]
+    analytics = window.analytics_tab.analytics
+    assert (len(analytics.rentals), len(analytics.purchases)) == (1, 1)
+    assert analytics.cars.values('id') == [11]
+    assert analytics.report('purchase_totals', 'payment_method').rows() == [('Card', 1, 15000.0)]
+    assert window.api_service.car_lookup.known([10]) == {}
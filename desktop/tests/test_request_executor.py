@@ -0,0 +1,129 @@
+import threading
+
+from services.request_executor import RequestExecutor
+
+
+def test_reads_with_the_same_key_are_coalesced(qapp, wait_idle):
+    executor = RequestExecutor()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(2)
+        return len(calls)
+
+    first = executor.submit('cars', load)
+    second = executor.submit('cars', load)
+    release.set()
+    wait_idle(executor)
+    assert first is second
+    assert calls == [1]
+
+
+def test_slots_connected_after_submit_see_a_request_that_already_finished(qapp, wait_idle):
+    executor = RequestExecutor()
+    results, failures, finished = [], [], []
+    handle = executor.submit('cars', lambda: 'cars')
+    broken = executor.submit('rentals', lambda: 1 / 0)
+    # Both jobs are done before anything is connected
+    executor.pool.waitForDone(5000)
+    handle.succeeded.connect(results.append)
+    handle.finished.connect(lambda: finished.append('cars'))
+    broken.failed.connect(failures.append)
+    wait_idle(executor)
+    assert results == ['cars']
+    assert finished == ['cars']
+    assert len(failures) == 1
+    assert executor.is_idle()
+
+
+def test_cancelled_requests_only_finish(qapp, wait_idle):
+    executor = RequestExecutor()
+    results, finished = [], []
+    handle = executor.submit('cars', lambda: 'cars')
+    handle.succeeded.connect(results.append)
+    handle.finished.connect(lambda: finished.append(1))
+    executor.pool.waitForDone(5000)
+    executor.cancel('cars')
+    wait_idle(executor)
+    assert results == []
+    assert finished == [1]
+
+
+def test_writes_are_never_coalesced(qapp, wait_idle):
+    executor = RequestExecutor()
+    release = threading.Event()
+    created, results = [], []
+
+    def create(name):
+        release.wait(2)
+        created.append(name)
+        return name
+
+    for name in ('first', 'second'):
+        handle = executor.submit('car-create', create, name, coalesce=False)
+        handle.succeeded.connect(results.append)
+    release.set()
+    wait_idle(executor)
+    assert sorted(created) == ['first', 'second']
+    assert sorted(results) == ['first', 'second']
+    assert executor.is_idle()
+
+
+def test_two_creates_in_flight_add_two_cars(qapp, wait_idle, monkeypatch):
+    from PyQt5.QtWidgets import QDialog, QMessageBox
+    from models.car import Car
+    from ui.car_management_widget import CarManagementWidget
+
+    messages = []
+    monkeypatch.setattr(QMessageBox, 'information', lambda *args: messages.append(args[1:]))
+    release = threading.Event()
+
+    class FakeCarService:
+        def __init__(self):
+            self.created = []
+            self.lock = threading.Lock()
+
+        def get_cached_cars(self):
+            return []
+
+        def get_all_cars(self):
+            return []
+
+        def search_cars(self, query):
+            return []
+
+        def create_car(self, car):
+            release.wait(2)
+            with self.lock:
+                self.created.append(car)
+                return Car(id=len(self.created), name=car.name, license_plate=car.license_plate)
+
+    service = FakeCarService()
+    executor = RequestExecutor()
+    widget = CarManagementWidget(service, executor)
+    wait_idle(executor)
+
+    plates = iter(('B-1', 'B-2'))
+
+    class FakeDialog:
+        def __init__(self, *args, **kwargs):
+            self.plate = next(plates)
+
+        def exec_(self):
+            return QDialog.Accepted
+
+        def get_car_data(self):
+            return Car(name=self.plate, license_plate=self.plate)
+
+    monkeypatch.setattr('ui.car_management_widget.CarDialog', FakeDialog)
+    # The second create is made while the first is still in flight
+    widget.add_car()
+    widget.add_car()
+    release.set()
+    wait_idle(executor)
+
+    assert sorted(car.license_plate for car in service.created) == ['B-1', 'B-2']
+    assert sorted(car.id for car in widget.all_cars) == [1, 2]
+    assert len(messages) == 2
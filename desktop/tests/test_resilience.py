@@ -0,0 +1,203 @@
+import io
+import random
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from services.http_transport import HttpTransport
+from services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def response(status_code, headers=None):
+    result = requests.Response()
+    result.status_code = status_code
+    result.raw = io.BytesIO(b'')
+    result.headers.update(headers or {})
+    return result
+
+
+def not_connected():
+    return requests.exceptions.ConnectionError(
+        MaxRetryError(None, "http://test/api/cars", NewConnectionError(None, "Connection refused")))
+
+
+# Circuit breaker
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=30.0, clock=clock)
+
+
+def test_breaker_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_a_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_lets_one_trial_through_after_the_reset_timeout(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(29.9)
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    clock.advance(0.1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    # Only the trial request goes out until it completes
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_opens_the_circuit_again(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    # The timeout starts again from the failed trial
+    clock.advance(29)
+    assert not breaker.allow()
+    clock.advance(1)
+    assert breaker.allow()
+
+
+# Retry delays
+
+def test_delays_use_full_jitter_within_the_capped_exponential_bound():
+    policy = RetryPolicy(base_delay=0.25, max_delay=4.0, rng=random.Random(7))
+    for attempt in range(8):
+        bound = min(4.0, 0.25 * 2 ** attempt)
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        # Jittered, not a fixed backoff
+        assert max(delays) - min(delays) > bound / 2
+
+
+def test_retry_after_is_honoured_up_to_the_maximum_delay():
+    policy = RetryPolicy(max_delay=4.0, rng=random.Random(7))
+    assert policy.delay(0, response(503, {'Retry-After': '2'})) == 2.0
+    assert policy.delay(0, response(503, {'Retry-After': '120'})) == 4.0
+    # HTTP dates are not parsed; the jittered delay is used instead
+    assert 0 <= policy.delay(0, response(503, {'Retry-After': 'Wed, 21 Oct 2026 07:28:00 GMT'})) <= 0.25
+
+
+def test_only_safe_or_idempotent_methods_are_retried():
+    policy = RetryPolicy()
+    assert policy.should_retry_response('GET', response(503))
+    assert policy.should_retry_response('PUT', response(502))
+    assert not policy.should_retry_response('POST', response(503))
+    assert not policy.should_retry_response('GET', response(500))
+
+    assert policy.should_retry_error('GET', requests.exceptions.ReadTimeout())
+    assert not policy.should_retry_error('PUT', requests.exceptions.ReadTimeout())
+    assert not policy.should_retry_error('POST', requests.exceptions.ConnectionError())
+    assert policy.should_retry_error('DELETE', requests.exceptions.ConnectionError())
+    # The request never reached the server, so even a POST is sent again
+    assert policy.should_retry_error('POST', not_connected())
+    assert policy.should_retry_error('POST', requests.exceptions.ConnectTimeout())
+    assert not policy.should_retry_error('GET', CircuitOpenError())
+
+
+# Transport
+
+class FakeSession:
+    """Answers requests from a script of responses and errors."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.methods = []
+
+    def request(self, method, url, **kwargs):
+        self.methods.append(method)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def transport_with(*outcomes, attempts=3, clock=None):
+    delays = []
+    transport = HttpTransport(retry=RetryPolicy(attempts=attempts, rng=random.Random(7)),
+                              breaker=CircuitBreaker(failure_threshold=2, clock=clock or FakeClock()),
+                              sleep=delays.append)
+    transport.session = FakeSession(*outcomes)
+    return transport, delays
+
+
+def test_get_is_retried_until_it_succeeds():
+    transport, delays = transport_with(response(503), requests.exceptions.ReadTimeout(), response(200))
+    assert transport.request('GET', "http://test/api/cars", "/api/cars").status_code == 200
+    assert transport.session.methods == ['GET'] * 3
+    assert len(delays) == 2 and 0 <= delays[0] <= 0.25 and 0 <= delays[1] <= 0.5
+    assert transport.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_post_is_not_retried_after_reaching_the_server():
+    transport, delays = transport_with(response(503), response(201))
+    assert transport.request('POST', "http://test/api/cars", "/api/cars").status_code == 503
+    assert transport.session.methods == ['POST'] and delays == []
+    transport, delays = transport_with(requests.exceptions.ReadTimeout(), response(201))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        transport.request('POST', "http://test/api/cars", "/api/cars")
+    assert transport.session.methods == ['POST']
+    assert delays == []
+
+
+def test_post_is_retried_when_the_connection_was_never_opened():
+    transport, delays = transport_with(not_connected(), response(201))
+    assert transport.request('POST', "http://test/api/cars", "/api/cars").status_code == 201
+    assert transport.session.methods == ['POST', 'POST']
+    assert len(delays) == 1
+
+
+def test_last_error_is_raised_once_the_attempts_are_used_up():
+    transport, delays = transport_with(*[requests.exceptions.ConnectTimeout()] * 3)
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        transport.request('GET', "http://test/api/cars", "/api/cars")
+    assert len(transport.session.methods) == 3 and len(delays) == 2
+
+
+def test_open_circuit_fails_fast_until_the_reset_timeout():
+    clock = FakeClock()
+    transport, _ = transport_with(response(500), response(500), response(200), attempts=1, clock=clock)
+    for _ in range(2):
+        assert transport.request('GET', "http://test/api/cars", "/api/cars").status_code == 500
+    with pytest.raises(CircuitOpenError):
+        transport.request('GET', "http://test/api/cars", "/api/cars")
+    assert len(transport.session.methods) == 2
+
+    clock.advance(30)
+    assert transport.request('GET', "http://test/api/cars", "/api/cars").status_code == 200
+    assert transport.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,80 @@
+import pytest
+
+from models.columnar import rental_table
+from ui.table_models import RentalTableModel
+
+RENTALS = [
+    {'id': i, 'customerName': name, 'car': {'id': 10 + i, 'name': 'Dacia', 'model': 'Logan'},
+     'startDate': '2024-01-0%d' % i, 'endDate': '2024-01-09', 'status': status, 'totalPrice': 100.0 * i}
+    for i, (name, status) in enumerate((('Ana', 'PENDING'), ('Bogdan', 'APPROVED'),
+                                        ('Carmen', 'PENDING'), ('Dan', 'PENDING')), start=1)
+]
+
+
+@pytest.fixture
+def model(qapp):
+    model = RentalTableModel()
+    model.set_table(rental_table(RENTALS))
+    model.resets, model.changes = [], []
+    model.modelReset.connect(lambda: model.resets.append(1))
+    model.dataChanged.connect(
+        lambda first, last: model.changes.append((first.row(), last.row(), last.column())))
+    return model
+
+
+def shown(model, column=1):
+    return [model.data(model.index(row, column)) for row in range(model.rowCount())]
+
+
+def test_table_mode_shows_filters_and_sorts(model):
+    assert shown(model) == ['Ana', 'Bogdan', 'Carmen', 'Dan']
+    model.set_filter('status', 'PENDING')
+    assert shown(model) == ['Ana', 'Carmen', 'Dan']
+    assert model.total('total_price') == 800.0
+    model.sort(5, 1)  # Qt.DescendingOrder
+    assert shown(model) == ['Dan', 'Carmen', 'Ana']
+
+
+def test_value_change_outside_the_view_columns_repaints_only_changed_rows(model):
+    model.set_filter('status', 'PENDING')
+    model.resets.clear()
+    model.set_values('id', [3, 4], {'total_price': 1.0})
+    assert model.resets == []
+    # Carmen and Dan are rows 1 and 2 of the filtered view
+    assert model.changes == [(1, 2, model.columnCount() - 1)]
+    assert model.data(model.index(1, 5)) == '$1.00'
+
+
+def test_change_of_a_filtered_column_recomputes_the_view(model):
+    model.set_filter('status', 'PENDING')
+    model.resets.clear()
+    undo = model.set_values('id', [1], {'status': 'APPROVED'})
+    assert model.resets == [1]
+    assert shown(model) == ['Carmen', 'Dan']
+    model.restore_values(undo)
+    assert shown(model) == ['Ana', 'Carmen', 'Dan']
+
+
+def test_change_of_the_sort_column_recomputes_the_view(model):
+    model.sort(1)
+    model.resets.clear()
+    model.patch_rows([dict(RENTALS[0], customerName='Zoe')])
+    assert model.resets == [1]
+    assert shown(model) == ['Bogdan', 'Carmen', 'Dan', 'Zoe']
+
+
+def test_patch_with_new_or_deleted_rows_resets(model):
+    model.patch_rows(deleted_ids=[2])
+    assert model.resets == [1]
+    assert shown(model) == ['Ana', 'Carmen', 'Dan']
+    model.patch_rows([{'id': 7, 'customerName': 'Eva', 'status': 'PENDING'}])
+    assert shown(model) == ['Ana', 'Carmen', 'Dan', 'Eva']
+    # A record with missing fields shows empty cells and a zero price
+    assert model.data(model.index(3, 2)) == ''
+    assert model.data(model.index(3, 5)) == '$0.00'
+
+
+def test_unchanged_patch_emits_nothing(model):
+    model.patch_rows([dict(RENTALS[1])])
+    assert model.resets == []
+    assert model.changes == []
@@ -0,0 +1,228 @@
+from PyQt5.QtWidgets import (QAbstractScrollArea, QFrame, QVBoxLayout, QHBoxLayout,
+                            QLabel, QPushButton)
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt, pyqtSignal
+
+
+class CarCard(QFrame):
+    """A single car card. Cards are created once and re-bound to other cars while scrolling."""
+
+    edit_requested = pyqtSignal(object)
+    delete_requested = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.car = None
+        self.image_url = ""
+
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setStyleSheet("""
+            QFrame {
+                background-color: white;
+                border-radius: 8px;
+                border: 1px solid #e0e0e0;
+            }
+            QFrame:hover {
+                border: 1px solid #2196F3;
+                background-color: #f5f9ff;
+            }
+        """)
+
+        card_layout = QVBoxLayout(self)
+
+        # Car name and model as title
+        self.title_label = QLabel()
+        self.title_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(self.title_label)
+
+        # Car image
+        self.image_label = QLabel()
+        self.image_label.setObjectName("imageLabel")
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setMinimumHeight(160)
+        card_layout.addWidget(self.image_label)
+
+        # Details
+        self.details_label = QLabel()
+        self.details_label.setWordWrap(True)
+        card_layout.addWidget(self.details_label)
+
+        # Action buttons
+        btn_layout = QHBoxLayout()
+
+        edit_btn = QPushButton("Edit")
+        edit_btn.setIcon(QIcon.fromTheme("document-edit"))
+        edit_btn.clicked.connect(lambda: self.edit_requested.emit(self.car))
+
+        delete_btn = QPushButton("Delete")
+        delete_btn.setIcon(QIcon.fromTheme("edit-delete"))
+        delete_btn.clicked.connect(lambda: self.delete_requested.emit(self.car))
+
+        btn_layout.addWidget(edit_btn)
+        btn_layout.addWidget(delete_btn)
+        card_layout.addLayout(btn_layout)
+
+    def bind(self, car):
+        """Show ``car`` on this card."""
+        self.car = car
+        self.title_label.setText(f"<h3 style='margin: 0;'>{car.year} {car.name} {car.model}</h3>")
+
+        # Get the correct price values
+        price_per_day = getattr(car, 'price_per_day', getattr(car, 'dailyRate', 0))
+        purchase_price = getattr(car, 'price', price_per_day * 200)
+
+        # Get status color and text
+        status_color = '#4CAF50' if getattr(car, 'available', False) else '#F44336'
+        status_text = 'Available' if getattr(car, 'available', False) else 'Not Available'
+
+        self.details_label.setText(f"""
+            <div style='margin: 5px 0;'>
+                <p style='margin: 4px 0;'><b>Color:</b> {getattr(car, 'color', 'N/A')}</p>
+                <p style='margin: 4px 0;'><b>Rental Price:</b> ${price_per_day:.2f}/day</p>
+                <p style='margin: 4px 0;'><b>Purchase Price:</b> ${purchase_price:.2f}</p>
+                <p style='margin: 4px 0;'><b>Status:</b> <span style='color: {status_color};'>{status_text}</span></p>
+            </div>
+        """)
+
+        self.image_url = getattr(car, 'image_url', getattr(car, 'imageUrl', ''))
+        self.image_label.clear()
+
+    def set_image(self, url, pixmap):
+        """Show ``pixmap`` if the card is still bound to the car it was loaded for."""
+        if url == self.image_url:
+            self.image_label.setPixmap(pixmap)
+
+    def set_image_text(self, url, text):
+        if url == self.image_url:
+            self.image_label.setText(text)
+
+
+class CarCardGrid(QAbstractScrollArea):
+    """Scrollable grid of car cards that only creates widgets for the visible cells.
+
+    The grid keeps a small pool of ``CarCard`` widgets - enough to cover the
+    viewport - and re-binds them to other cars as the user scrolls, so the cost
+    of showing or filtering the fleet does not depend on its size.
+    """
+
+    COLUMNS = 3  # 3 cards per row
+    CARD_HEIGHT = 380
+    SPACING = 20
+    MARGIN = 20
+
+    edit_requested = pyqtSignal(object)
+    delete_requested = pyqtSignal(object)
+    # Emitted when a card is bound to a car and needs its image (card, url)
+    image_requested = pyqtSignal(object, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cars = []
+        self._cards = []
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(40)
+
+    def set_cars(self, cars):
+        """Show ``cars`` in the grid, reusing the existing card widgets."""
+        self._cars = list(cars)
+        self.verticalScrollBar().setValue(0)
+        for card in self._cards:
+            card.car = None
+        self._update_scroll_range()
+        self._layout_cards()
+
+    def cars(self):
+        return self._cars
+
+    def replace_car(self, car):
+        """Show ``car`` in place of the car with the same ID; only its card is re-bound."""
+        for index, current in enumerate(self._cars):
+            if current.id == car.id:
+                self._cars[index] = car
+                self._layout_cards()
+                return
+
+    def remove_car(self, car_id):
+        """Drop the car with ``car_id``; returns its index and the car (for ``insert_car``)."""
+        for index, current in enumerate(self._cars):
+            if current.id == car_id:
+                del self._cars[index]
+                self._update_scroll_range()
+                self._layout_cards()
+                return index, current
+        return None
+
+    def insert_car(self, index, car):
+        """Show ``car`` at ``index``, e.g. to undo ``remove_car``."""
+        self._cars.insert(min(index, len(self._cars)), car)
+        self._update_scroll_range()
+        self._layout_cards()
+
+    def _row_height(self):
+        return self.CARD_HEIGHT + self.SPACING
+
+    def _row_count(self):
+        return (len(self._cars) + self.COLUMNS - 1) // self.COLUMNS
+
+    def _update_scroll_range(self):
+        content_height = 2 * self.MARGIN + self._row_count() * self._row_height() - self.SPACING
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setPageStep(self.viewport().height())
+        scroll_bar.setRange(0, max(0, content_height - self.viewport().height()))
+
+    def _ensure_pool(self, size):
+        while len(self._cards) < size:
+            card = CarCard(self.viewport())
+            card.edit_requested.connect(self.edit_requested)
+            card.delete_requested.connect(self.delete_requested)
+            self._cards.append(card)
+
+    def _layout_cards(self):
+        viewport = self.viewport()
+        row_height = self._row_height()
+        offset = self.verticalScrollBar().value()
+
+        first_row = max(0, (offset - self.MARGIN) // row_height)
+        visible_rows = viewport.height() // row_height + 2
+        pool_size = visible_rows * self.COLUMNS
+        self._ensure_pool(pool_size)
+
+        card_width = max(1, (viewport.width() - 2 * self.MARGIN
+                             - (self.COLUMNS - 1) * self.SPACING) // self.COLUMNS)
+
+        # Each car index maps to a fixed pool slot, so while scrolling only the
+        # cards of the row that just came into view are re-bound.
+        first_index = first_row * self.COLUMNS
+        visible = range(first_index, min(first_index + pool_size, len(self._cars)))
+        used = set()
+        for index in visible:
+            card = self._cards[index % pool_size]
+            used.add(card)
+
+            car = self._cars[index]
+            if card.car is not car:
+                card.bind(car)
+                if card.image_url:
+                    self.image_requested.emit(card, card.image_url)
+                else:
+                    card.image_label.setText("No Image")
+
+            row, col = divmod(index, self.COLUMNS)
+            x = self.MARGIN + col * (card_width + self.SPACING)
+            y = self.MARGIN + row * row_height - offset
+            card.setGeometry(x, y, card_width, self.CARD_HEIGHT)
+            card.show()
+
+        for card in self._cards:
+            if card not in used:
+                card.hide()
+
+    # QAbstractScrollArea interface
+
+    def scrollContentsBy(self, dx, dy):
+        self._layout_cards()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_range()
+        self._layout_cards()
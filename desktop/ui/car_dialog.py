@@ -1,31 +1,23 @@
-import os
-import sys
-from pathlib import Path
 from datetime import datetime
 
-# Add the project root to Python path if not already there
-project_root = str(Path(__file__).parent.parent.absolute())
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                             QLineEdit, QSpinBox, QDoubleSpinBox, 
                             QCheckBox, QPushButton, QFileDialog, 
-                            QMessageBox, QComboBox, QGroupBox, QFormLayout)
-from PyQt5.QtCore import Qt, QSize, QUrl
-from PyQt5.QtGui import QIcon, QPixmap, QImage
-from PyQt5.QtNetwork import QNetworkRequest, QNetworkAccessManager, QNetworkReply
+                            QComboBox, QGroupBox, QFormLayout)
+from PyQt5.QtCore import Qt, QSize
 
 from models.car import Car
+from services.thumbnail_cache import ThumbnailCache
+
+PREVIEW_SIZE = QSize(300, 200)
 
 class CarDialog(QDialog):
-    def __init__(self, car: Car = None, parent=None):
+    def __init__(self, car: Car = None, parent=None, thumbnail_cache=None):
         super().__init__(parent)
         self.car = car if car else Car()
         self.setWindowTitle("Add New Car" if not car else "Edit Car")
         self.setModal(True)
-        self.network_manager = QNetworkAccessManager(self)
-        self.network_manager.finished.connect(self.handle_image_download)
+        self.thumbnail_cache = thumbnail_cache or ThumbnailCache(parent=self)
         self.init_ui()
         self.load_car_data()
     
@@ -187,26 +179,27 @@ class CarDialog(QDialog):
             return
             
         if image_source.startswith(('http://', 'https://')):
-            # Handle web URL
             self.image_preview.setText("Loading...")
-            request = QNetworkRequest(QUrl(image_source))
-            request.setHeader(QNetworkRequest.UserAgentHeader, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-            self.network_manager.get(request)
+        
+        # URLs and local paths both go through the thumbnail cache
+        self.thumbnail_cache.get(
+            image_source, PREVIEW_SIZE,
+            lambda pixmap: self.handle_preview_loaded(image_source, pixmap))
+    
+    def handle_preview_loaded(self, image_source, pixmap):
+        """Show a preview delivered by the thumbnail cache."""
+        # Ignore previews for text that has since been edited
+        if image_source != self.image_edit.text().strip():
+            return
+        if pixmap is not None:
+            self.set_preview_pixmap(pixmap)
         else:
-            # Handle local file path
-            if os.path.exists(image_source):
-                try:
-                    pixmap = QPixmap(image_source)
-                    if not pixmap.isNull():
-                        self.set_preview_pixmap(pixmap)
-                        return
-                except Exception as e:
-                    print(f"Error loading image: {e}")
             self.set_placeholder_image()
     
     def set_preview_pixmap(self, pixmap):
         """Set the preview pixmap with proper scaling."""
-        pixmap = pixmap.scaled(300, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if pixmap.width() > PREVIEW_SIZE.width() or pixmap.height() > PREVIEW_SIZE.height():
+            pixmap = pixmap.scaled(PREVIEW_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
         self.image_preview.setPixmap(pixmap)
         self.image_preview.setStyleSheet("""
             QLabel {
@@ -230,23 +223,6 @@ class CarDialog(QDialog):
         """)
         self.image_preview.setAlignment(Qt.AlignCenter)
     
-    def handle_image_download(self, reply):
-        """Handle the completion of an image download."""
-        if reply.error() == QNetworkReply.NoError:
-            try:
-                data = reply.readAll()
-                image = QImage()
-                if image.loadFromData(data):
-                    pixmap = QPixmap.fromImage(image)
-                    self.set_preview_pixmap(pixmap)
-                    return
-            except Exception as e:
-                print(f"Error processing downloaded image: {e}")
-        
-        # If we get here, there was an error
-        self.set_placeholder_image()
-        reply.deleteLater()
-    
     def load_car_data(self):
         """Load car data into the form fields."""
         if not self.car:
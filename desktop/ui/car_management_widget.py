@@ -1,33 +1,32 @@
-import os
-import sys
-from pathlib import Path
-
-# Add the project root to Python path if not already there
-project_root = str(Path(__file__).parent.parent.absolute())
-if project_root not in sys.path:
-    sys.path.append(project_root)
+import logging
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QLabel, QLineEdit, QGridLayout, QMessageBox, QFrame, 
-                            QInputDialog, QScrollArea, QTableWidget, QTableWidgetItem, 
-                            QHeaderView, QAbstractItemView, QDialog)
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QImage, QPainter, QColor
-from PyQt5.QtCore import Qt, pyqtSignal, QSize, QUrl
-from PyQt5.QtNetwork import QNetworkRequest, QNetworkAccessManager, QNetworkReply
+                            QLabel, QLineEdit, QMessageBox, QDialog, QFileDialog)
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import pyqtSignal, QSize, QTimer
 
-from models.car import Car
+from services.car_import import CarImporter, read_rows
+from services.request_executor import RequestExecutor
+from services.thumbnail_cache import ThumbnailCache
+from ui.car_card_grid import CarCardGrid
 from ui.car_dialog import CarDialog
 
+logger = logging.getLogger(__name__)
+
+CARD_IMAGE_SIZE = QSize(240, 160)
+
 class CarManagementWidget(QWidget):
-    cars_updated = pyqtSignal()
+    # Emitted once the server confirmed a change (the saved Car / the deleted ID)
+    car_changed = pyqtSignal(object)
+    car_removed = pyqtSignal(int)
     
-    def __init__(self, car_service, parent=None):
+    def __init__(self, car_service, request_executor=None, thumbnail_cache=None, parent=None):
         super().__init__(parent)
         self.car_service = car_service
-        self.network_manager = QNetworkAccessManager(self)
-        self.network_manager.finished.connect(self.handle_image_download)
-        self.image_requests = {}
+        self.request_executor = request_executor or RequestExecutor(parent=self)
+        self.thumbnail_cache = thumbnail_cache or ThumbnailCache(parent=self)
         self.init_ui()
+        self.set_cars(self.car_service.get_cached_cars())
         self.load_cars()
     
     def init_ui(self):
@@ -40,7 +39,13 @@ class CarManagementWidget(QWidget):
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Search cars...")
         self.search_edit.setClearButtonEnabled(True)
-        self.search_edit.textChanged.connect(self.filter_cars)
+        
+        # Debounce searches so fast typing runs one query per pause
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.filter_cars)
+        self.search_edit.textChanged.connect(self.search_timer.start)
         
         # Add Car button
         self.add_btn = QPushButton("Add Car")
@@ -48,229 +53,87 @@ class CarManagementWidget(QWidget):
         self.add_btn.setFixedSize(100, 30)
         self.add_btn.clicked.connect(self.add_car)
         
+        # Import button: creates the cars of a CSV or JSON file in batches
+        self.import_btn = QPushButton("Import...")
+        self.import_btn.setIcon(QIcon.fromTheme("document-import"))
+        self.import_btn.setFixedSize(100, 30)
+        self.import_btn.clicked.connect(self.import_cars)
+        
         search_layout.addWidget(QLabel("Search:"))
         search_layout.addWidget(self.search_edit)
         search_layout.addStretch()
+        search_layout.addWidget(self.import_btn)
         search_layout.addWidget(self.add_btn)
         
-        # Scroll area for car cards
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        
-        # Container widget for car cards
-        self.cards_container = QWidget()
-        self.cards_layout = QGridLayout(self.cards_container)
-        self.cards_layout.setSpacing(20)
-        self.cards_layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Add a stretch to push cards to the top
-        self.cards_layout.setRowStretch(100, 1)
-        
-        self.scroll_area.setWidget(self.cards_container)
+        # Virtualized grid of car cards; only the visible cards exist as widgets
+        self.card_grid = CarCardGrid()
+        self.card_grid.edit_requested.connect(self.edit_car)
+        self.card_grid.delete_requested.connect(self.delete_car)
+        self.card_grid.image_requested.connect(self.load_card_image)
         
         # Add to main layout
         layout.addLayout(search_layout)
-        layout.addWidget(self.scroll_area)
+        layout.addWidget(self.card_grid)
         
         self.setLayout(layout)
     
-    def create_car_card(self, car, row, col):
-        # Create card frame
-        card = QFrame()
-        card.setFrameShape(QFrame.StyledPanel)
-        card.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 8px;
-                border: 1px solid #e0e0e0;
-            }
-            QFrame:hover {
-                border: 1px solid #2196F3;
-                background-color: #f5f9ff;
-            }
-        """)
-        
-        card_layout = QVBoxLayout(card)
-        
-        # Car name and model as title
-        title = QLabel(f"<h3 style='margin: 0;'>{car.year} {car.name} {car.model}</h3>")
-        title.setAlignment(Qt.AlignCenter)
-        card_layout.addWidget(title)
-        
-        # Car image
-        image_label = QLabel()
-        image_label.setObjectName("imageLabel")
-        image_label.setAlignment(Qt.AlignCenter)
-        
-        # Store reference to the image label
-        image_label.setProperty('car_id', getattr(car, 'id', 0))
-        
-        # Load and scale the image if available
-        image_url = getattr(car, 'image_url', getattr(car, 'imageUrl', ''))
-        if image_url:
-            if image_url.startswith(('http://', 'https://')):
-                # Use QNetworkAccessManager for web requests
-                request = QNetworkRequest(QUrl(image_url))
-                # Set a user agent to avoid 403 errors
-                request.setHeader(QNetworkRequest.UserAgentHeader, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-                
-                # Store the request with the image label reference
-                reply = self.network_manager.get(request)
-                self.image_requests[reply] = (image_label, image_url)
-                
-                # Show placeholder while loading
-                image_label.setText("Loading...")
-            else:
-                # For local files
-                if os.path.exists(image_url):
-                    pixmap = QPixmap(image_url)
-                    if not pixmap.isNull():
-                        pixmap = pixmap.scaled(240, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                        image_label.setPixmap(pixmap)
-                    else:
-                        image_label.setText("Invalid Image")
-                else:
-                    image_label.setText("Image not found")
-        else:
-            image_label.setText("No Image")
-        
-        image_label.setAlignment(Qt.AlignCenter)
-        card_layout.addWidget(image_label)
-        
-        # Get the correct price values
-        price_per_day = getattr(car, 'price_per_day', getattr(car, 'dailyRate', 0))
-        purchase_price = getattr(car, 'price', price_per_day * 200)
-        
-        # Get status color and text
-        status_color = '#4CAF50' if getattr(car, 'available', False) else '#F44336'
-        status_text = 'Available' if getattr(car, 'available', False) else 'Not Available'
-        
-        # Create details text
-        details_text = f"""
-            <div style='margin: 5px 0;'>
-                <p style='margin: 4px 0;'><b>Color:</b> {getattr(car, 'color', 'N/A')}</p>
-                <p style='margin: 4px 0;'><b>Rental Price:</b> ${price_per_day:.2f}/day</p>
-                <p style='margin: 4px 0;'><b>Purchase Price:</b> ${purchase_price:.2f}</p>
-                <p style='margin: 4px 0;'><b>Status:</b> <span style='color: {status_color};'>{status_text}</span></p>
-            </div>
-        """
-        # Create details label with all information
-        details_label = QLabel(details_text)
-        details_label.setWordWrap(True)
-        card_layout.addWidget(details_label)
-        
-        # Action buttons
-        btn_layout = QHBoxLayout()
-        
-        edit_btn = QPushButton("Edit")
-        edit_btn.setIcon(QIcon.fromTheme("document-edit"))
-        edit_btn.clicked.connect(lambda: self.edit_car(car))
-        
-        delete_btn = QPushButton("Delete")
-        delete_btn.setIcon(QIcon.fromTheme("edit-delete"))
-        delete_btn.clicked.connect(lambda: self.delete_car(car))
-        
-        btn_layout.addWidget(edit_btn)
-        btn_layout.addWidget(delete_btn)
-        
-        # Add button layout to card layout
-        card_layout.addLayout(btn_layout)
-        
-        # Add to grid
-        self.cards_layout.addWidget(card, row, col)
-        
-        return card
-        
-    def handle_image_download(self, reply):
-        """Handle the completion of an image download"""
-        try:
-            # Get the image label that requested this download
-            image_label, image_url = self.image_requests.get(reply, (None, None))
-            
-            # Check if the label still exists and is valid
-            if not image_label or not hasattr(image_label, 'setPixmap'):
-                print(f"Image label no longer exists for URL: {image_url}")
-                return
-                
-            if reply.error() == QNetworkReply.NoError:
-                try:
-                    # Read the image data
-                    data = reply.readAll()
-                    if data:
-                        image = QImage()
-                        if image.loadFromData(data):
-                            pixmap = QPixmap.fromImage(image)
-                            if not pixmap.isNull():
-                                pixmap = pixmap.scaled(240, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                                try:
-                                    image_label.setPixmap(pixmap)
-                                except RuntimeError:
-                                    print("Failed to set pixmap - widget was deleted")
-                                    return
-                            else:
-                                self.safe_set_text(image_label, "Invalid Image")
-                        else:
-                            self.safe_set_text(image_label, "Invalid Image Data")
-                    else:
-                        self.safe_set_text(image_label, "No Image Data")
-                except Exception as e:
-                    print(f"Error processing image: {e}")
-                    self.safe_set_text(image_label, "Error")
-            else:
-                # Handle network error
-                self.safe_set_text(image_label, "Load Failed")
-        except Exception as e:
-            print(f"Unexpected error in handle_image_download: {e}")
-        finally:
-            # Clean up
-            if reply in self.image_requests:
-                del self.image_requests[reply]
-            reply.deleteLater()
+    def load_card_image(self, card, image_url):
+        """Load the image for a card that was just bound to a car."""
+        card.set_image_text(image_url, "Loading...")
+        self.thumbnail_cache.get(
+            image_url, CARD_IMAGE_SIZE,
+            lambda pixmap: self._on_card_image(card, image_url, pixmap))
     
-    def safe_set_text(self, label, text):
-        """Safely set text on a QLabel, handling the case where it might be deleted"""
-        try:
-            if label and hasattr(label, 'setText'):
-                label.setText(text)
-        except RuntimeError:
-            # The C++ object has been deleted
-            pass
+    def _on_card_image(self, card, image_url, pixmap):
+        # The card may have been re-bound to another car meanwhile
+        if pixmap is not None:
+            card.set_image(image_url, pixmap)
+        else:
+            card.set_image_text(image_url, "Load Failed")
     
     def filter_cars(self):
         try:
-            search_text = self.search_edit.text().strip().lower()
-            
-            # Clear existing cards
-            while self.cards_layout.count() > 0:
-                item = self.cards_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
+            self.search_timer.stop()
             
             if not hasattr(self, 'all_cars') or not self.all_cars:
+                self.card_grid.set_cars([])
                 return
             
-            # Show matching cars
-            row = col = 0
-            for car in self.all_cars:
-                if not search_text or any([
-                    search_text in getattr(car, 'name', '').lower(),
-                    search_text in getattr(car, 'model', '').lower(),
-                    search_text in getattr(car, 'color', '').lower(),
-                    search_text in str(getattr(car, 'year', '')),
-                    search_text in str(getattr(car, 'license_plate', '')).lower(),
-                    search_text in str(getattr(car, 'licensePlate', '')).lower()
-                ]):
-                    self.create_car_card(car, row, col)
-                    col += 1
-                    if col >= 3:  # 3 cards per row
-                        col = 0
-                        row += 1
+            # Show matching cars from the service's search index;
+            # the grid only binds the visible ones to cards
+            matches = self.car_service.search_cars(self.search_edit.text())
+            self.card_grid.set_cars(matches)
         except Exception as e:
             QMessageBox.warning(self, "Search Error", f"Error filtering cars: {str(e)}")
     
     def load_cars(self):
-        self.all_cars = self.car_service.get_all_cars()
-        self.filter_cars()  # This will create and display the cards
+        """Fetch cars in the background; the cards are rebuilt when they arrive."""
+        if self.request_executor.is_running('cars'):
+            return
+        handle = self.request_executor.submit('cars', self.car_service.get_all_cars)
+        handle.succeeded.connect(self.set_cars)
+        handle.failed.connect(
+            lambda error: QMessageBox.warning(self, "Error", f"Failed to load cars: {error}"))
+    
+    def set_cars(self, cars):
+        self.all_cars = cars
+        self.filter_cars()  # This will bind the visible cards
+    
+    def apply_changes(self, cars, deleted_ids=()):
+        """Show cars changed elsewhere, re-binding only the affected cards."""
+        known = {car.id for car in self.all_cars}
+        added = [car for car in cars if car.id not in known]
+        for car in cars:
+            if car.id in known:
+                self._replace_car(car)
+        if deleted_ids:
+            deleted = set(deleted_ids)
+            self.all_cars = [car for car in self.all_cars if car.id not in deleted]
+            for car_id in deleted:
+                self.card_grid.remove_car(car_id)
+        if added:
+            self.all_cars.extend(added)
+            self.filter_cars()
     
     def get_selected_car(self):
         return None  # Not used in card-based UI
@@ -279,40 +142,94 @@ class CarManagementWidget(QWidget):
         pass  # Not used in card-based UI
     
     def add_car(self):
-        dialog = CarDialog()
+        dialog = CarDialog(thumbnail_cache=self.thumbnail_cache)
         if dialog.exec_() == QDialog.Accepted:
             try:
                 car = dialog.get_car_data()
-                print("Car data before sending to API:", car.__dict__)  # Debug log
                 
-                result = self.car_service.create_car(car)
-                
-                if result:
-                    print("Car created successfully:", result.__dict__)  # Debug log
-                    self.load_cars()
-                    self.cars_updated.emit()
-                    QMessageBox.information(self, "Success", "Car added successfully!")
-                else:
-                    error_msg = "Failed to add car. Please check the console for more details."
-                    print(error_msg)
-                    QMessageBox.warning(self, "Error", error_msg)
+                handle = self.request_executor.submit('car-create', self.car_service.create_car, car,
+                                                      coalesce=False)
+                handle.succeeded.connect(self._on_car_created)
+                handle.failed.connect(self._on_car_create_failed)
                     
             except Exception as e:
-                error_msg = f"An error occurred while adding the car: {str(e)}"
-                print(error_msg)
-                QMessageBox.critical(self, "Error", error_msg)
+                self._on_car_create_failed(str(e))
+    
+    def _on_car_created(self, result):
+        if result:
+            self.all_cars.append(result)
+            self.filter_cars()
+            self.car_changed.emit(result)
+            QMessageBox.information(self, "Success", "Car added successfully!")
+        else:
+            error_msg = "Failed to add car. Please check the console for more details."
+            logger.warning(error_msg)
+            QMessageBox.warning(self, "Error", error_msg)
+    
+    def _on_car_create_failed(self, error):
+        error_msg = f"An error occurred while adding the car: {error}"
+        logger.error(error_msg)
+        QMessageBox.critical(self, "Error", error_msg)
+    
+    def import_cars(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Cars", "", "Car files (*.csv *.json *.jsonl);;All files (*)")
+        if not path:
+            return
+        importer = CarImporter(self.car_service)
+        handle = self.request_executor.submit(
+            'car-import', importer.run, read_rows(path), list(self.all_cars), coalesce=False)
+        self.import_btn.setEnabled(False)
+        self.import_btn.setText("Importing...")
+        handle.succeeded.connect(self._on_cars_imported)
+        handle.failed.connect(
+            lambda error: QMessageBox.critical(self, "Error", f"Failed to import cars: {error}"))
+        handle.finished.connect(self._on_import_finished)
+    
+    def _on_cars_imported(self, report):
+        if report.created:
+            self.apply_changes(report.created)
+        message = report.summary()
+        if report.errors:
+            shown = report.errors[:20]
+            message += "\n\n" + "\n".join(str(error) for error in shown)
+            if len(report.errors) > len(shown):
+                message += f"\n... and {len(report.errors) - len(shown)} more"
+            QMessageBox.warning(self, "Import Finished", message)
+        else:
+            QMessageBox.information(self, "Import Finished", message)
+    
+    def _on_import_finished(self):
+        self.import_btn.setEnabled(True)
+        self.import_btn.setText("Import...")
     
     def edit_car(self, car):
-        dialog = CarDialog(car, self)
+        dialog = CarDialog(car, self, thumbnail_cache=self.thumbnail_cache)
         if dialog.exec_() == QDialog.Accepted:
             updated_car = dialog.get_car_data()
-            result = self.car_service.update_car(updated_car)
-            if result:
-                self.load_cars()
-                self.cars_updated.emit()
-                QMessageBox.information(self, "Success", "Car updated successfully!")
-            else:
-                QMessageBox.warning(self, "Error", "Failed to update car.")
+            # Show the edit right away and put the original back if it fails
+            self._replace_car(updated_car)
+            handle = self.request_executor.submit(
+                f'car-update-{updated_car.id}', self.car_service.update_car, updated_car,
+                coalesce=False)
+            handle.succeeded.connect(lambda result: self._on_car_updated(result, car))
+            handle.failed.connect(lambda error: self._on_car_update_failed(error, car))
+    
+    def _on_car_updated(self, result, original):
+        if result:
+            # The server's copy wins over the edited one
+            self._replace_car(result)
+            self.car_changed.emit(result)
+        else:
+            self._on_car_update_failed("The server rejected the update.", original)
+    
+    def _on_car_update_failed(self, error, original):
+        self._replace_car(original)
+        QMessageBox.warning(self, "Error", f"Failed to update car: {error}")
+    
+    def _replace_car(self, car):
+        self.all_cars = [car if current.id == car.id else current for current in self.all_cars]
+        self.card_grid.replace_car(car)
     
     def delete_car(self, car):
         if not car or not car.id:
@@ -327,9 +244,25 @@ class CarManagementWidget(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            if self.car_service.delete_car(car.id):
-                self.load_cars()
-                self.cars_updated.emit()
-                QMessageBox.information(self, "Success", "Car deleted successfully!")
-            else:
-                QMessageBox.warning(self, "Error", "Failed to delete car.")
+            # Remove the card right away and put it back if the delete fails
+            position = self.all_cars.index(car) if car in self.all_cars else len(self.all_cars)
+            self.all_cars = [current for current in self.all_cars if current.id != car.id]
+            removed = self.card_grid.remove_car(car.id)
+            handle = self.request_executor.submit(
+                f'car-delete-{car.id}', self.car_service.delete_car, car.id, coalesce=False)
+            handle.succeeded.connect(
+                lambda success: self._on_car_deleted(success, car, position, removed))
+            handle.failed.connect(
+                lambda error: self._on_car_delete_failed(error, car, position, removed))
+    
+    def _on_car_deleted(self, success, car, position, removed):
+        if success:
+            self.car_removed.emit(car.id)
+        else:
+            self._on_car_delete_failed("The server rejected the delete.", car, position, removed)
+    
+    def _on_car_delete_failed(self, error, car, position, removed):
+        self.all_cars.insert(position, car)
+        if removed is not None:
+            self.card_grid.insert_car(*removed)
+        QMessageBox.warning(self, "Error", f"Failed to delete car: {error}")
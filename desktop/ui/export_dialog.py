@@ -0,0 +1,71 @@
+import os
+from typing import Optional
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from services.exporter import cached_records, parquet_available, write_export
+from services.request_executor import RequestExecutor, RequestHandle
+from services.sync_engine import SyncEngine
+
+
+def export_entity(parent, request_executor: RequestExecutor, sync_engine: SyncEngine,
+                  entity: str, status: Optional[str] = None) -> Optional[RequestHandle]:
+    """Ask for a file and export the stored ``entity`` records to it in the background.
+
+    The local copy is synced first and then streamed to the file in batches,
+    so long histories never have to fit in memory. A progress dialog shows
+    the rows written and cancels the export. Returns the export's handle, or
+    None if the user did not choose a file.
+    """
+    key = f'export-{entity}'
+    if request_executor.is_running(key):
+        QMessageBox.information(parent, "Export", f"An export of {entity} is already running.")
+        return None
+
+    filters = "CSV files (*.csv)"
+    if parquet_available():
+        filters += ";;Parquet files (*.parquet)"
+    path, selected = QFileDialog.getSaveFileName(parent, f"Export {entity.title()}",
+                                                 f"{entity}.csv", filters)
+    if not path:
+        return None
+    file_format = 'parquet' if 'parquet' in selected or path.lower().endswith('.parquet') else 'csv'
+    if not os.path.splitext(path)[1]:
+        path += f".{file_format}"
+
+    dialog = QProgressDialog(f"Exporting {entity}...", "Cancel", 0,
+                             sync_engine.store.count(entity, status=status), parent)
+    dialog.setWindowTitle(f"Export {entity.title()}")
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+    dialog.setMinimumDuration(500)
+
+    handle = request_executor.submit(key, _export, sync_engine, entity, path, file_format, status,
+                                     with_handle=True)
+    written = [0]
+
+    def on_progress(rows):
+        written[0] += rows
+        # Records synced after the count make the export longer
+        dialog.setMaximum(max(dialog.maximum(), written[0]))
+        dialog.setValue(written[0])
+
+    handle.progress.connect(on_progress)
+    dialog.canceled.connect(lambda: request_executor.cancel(key))
+    handle.succeeded.connect(lambda count: QMessageBox.information(
+        parent, "Export Finished", f"Exported {count} {entity} to {path}"))
+    handle.failed.connect(lambda error: QMessageBox.critical(
+        parent, "Error", f"Failed to export {entity}: {error}"))
+    handle.finished.connect(dialog.deleteLater)
+    return handle
+
+
+def _export(sync_engine: SyncEngine, entity: str, path: str, file_format: str,
+            status: Optional[str], handle: RequestHandle) -> int:
+    """Sync ``entity`` and write its stored records to ``path`` (runs on a worker thread)."""
+    sync_engine.sync(entity)
+    return write_export(cached_records(sync_engine.store, entity, status), path, entity,
+                        file_format, progress=handle.report_progress,
+                        cancelled=lambda: handle.cancelled)
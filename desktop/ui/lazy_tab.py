@@ -0,0 +1,31 @@
+from typing import Callable, Optional
+
+from PyQt5.QtWidgets import QVBoxLayout, QWidget
+
+
+class LazyTab(QWidget):
+    """Tab page that builds its real widget the first time ``build`` is called.
+
+    The page is added to the ``QTabWidget`` up front, so tab indices and
+    titles never change; the widget returned by ``factory`` is placed inside
+    it on demand.
+    """
+
+    def __init__(self, factory: Callable[[], QWidget], parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self.widget: Optional[QWidget] = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    @property
+    def is_built(self) -> bool:
+        return self.widget is not None
+
+    def build(self) -> QWidget:
+        """Create the widget if needed and return it."""
+        if self.widget is None:
+            self.widget = self._factory()
+            self.layout().addWidget(self.widget)
+        return self.widget
@@ -1,72 +1,185 @@
-import os
-import sys
-from pathlib import Path
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QMainWindow, QTabWidget, QMessageBox
 
-# Add the project root to Python path if not already there
-project_root = str(Path(__file__).parent.parent.absolute())
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
-# Now import local modules
-from ui.tabs.rentals_tab import RentalsTab
-from ui.tabs.purchases_tab import PurchasesTab
-from ui.car_management_widget import CarManagementWidget
+import config
+from ui.lazy_tab import LazyTab
 from services.api_service import ApiService
 from services.car_service import CarService
+from services.change_feed import ChangeFeed
+from services.local_store import LocalStore
+from services.sync_engine import SyncEngine
+from services.request_executor import RequestExecutor
+
 
 class MainWindow(QMainWindow):
+    # Entities prefetched after startup, most wanted first
+    PREFETCH_ORDER = ('rentals', 'purchases', 'cars')
+    # Entities each tab (by index) syncs itself when it is built
+    TAB_ENTITIES = (('rentals',), ('purchases', 'cars'), ('cars',), ('cars', 'rentals', 'purchases'))
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Car Rental Admin")
         self.setGeometry(100, 100, 1200, 800)
         
-        # Initialize API service
+        # Initialize API service; its transport (connection pool, timeouts) is shared by every service
         self.api_service = ApiService()
         
+        # Shared worker pool so REST calls never block the GUI thread
+        self.request_executor = RequestExecutor(config.REQUEST_WORKERS, parent=self)
+        
+        # Scaled car images, persisted across sessions (created with the Car Management tab)
+        self.thumbnail_cache = None
+        
+        # Local mirror of cars, rentals and purchases, refreshed with delta syncs
+        self.local_store = LocalStore()
+        self.sync_engine = SyncEngine(self.api_service, self.local_store)
+        
         # Create tabs
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
         
         # Initialize services
-        self.car_service = CarService(self.api_service.base_url)
-        
-        # Add tabs
-        self.rentals_tab = RentalsTab(self.api_service)
-        self.purchases_tab = PurchasesTab(self.api_service)
-        self.car_management_tab = CarManagementWidget(self.car_service)
+        self.car_service = CarService(self.api_service, self.sync_engine)
         
-        self.car_management_tab.cars_updated.connect(self.on_cars_updated)
-        
-        # Add tabs to the tab widget
-        self.tabs.addTab(self.rentals_tab, "Rentals")
-        self.tabs.addTab(self.purchases_tab, "Purchases")
-        self.tabs.addTab(self.car_management_tab, "Car Management")
+        # Tabs are built the first time they are opened (see start_up)
+        self.rentals_tab = None
+        self.purchases_tab = None
+        self.car_management_tab = None
+        self.analytics_tab = None
+        self.tabs.addTab(LazyTab(self._build_rentals_tab), "Rentals")
+        self.tabs.addTab(LazyTab(self._build_purchases_tab), "Purchases")
+        self.tabs.addTab(LazyTab(self._build_car_management_tab), "Car Management")
+        self.tabs.addTab(LazyTab(self._build_analytics_tab), "Analytics")
         
         # Connect tab change signal to refresh cars when switching to Car Management tab
         self.tabs.currentChanged.connect(self.on_tab_changed)
         
+        # Changes made by other clients are pushed by the server and patched into the tabs
+        self.change_feed = ChangeFeed(self.api_service, self.local_store, parent=self)
+        self.change_feed.changes.connect(self.on_remote_changes)
+        self.change_feed.reconnected.connect(self.on_feed_reconnected)
+        self._started = False
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._started:
+            self._started = True
+            # Runs once the window has been painted
+            QTimer.singleShot(0, self.start_up)
+    
+    def start_up(self):
+        """Build the open tab and warm the local store for the others.
+        
+        The open tab loads its data first; the other entities are synced in
+        the background at prefetch priority, so opening their tab later only
+        costs a delta sync. The change feed is connected last.
+        """
+        index = self.tabs.currentIndex()
+        self.on_tab_changed(index)
+        prefetch = [e for e in self.PREFETCH_ORDER if e not in self.TAB_ENTITIES[index]]
+        for priority, entity in enumerate(prefetch):
+            self.request_executor.submit(f'prefetch-{entity}', self.sync_engine.sync, entity,
+                                         priority=RequestExecutor.PREFETCH - priority)
+        self.change_feed.start()
+    
+    # The tab modules (and QtNetwork and numpy behind them) are imported on first use
+    
+    def _build_rentals_tab(self):
+        from ui.tabs.rentals_tab import RentalsTab
+        self.rentals_tab = RentalsTab(self.api_service, self.request_executor, self.sync_engine)
+        return self.rentals_tab
+    
+    def _build_purchases_tab(self):
+        from ui.tabs.purchases_tab import PurchasesTab
+        self.purchases_tab = PurchasesTab(self.api_service, self.request_executor, self.sync_engine)
+        return self.purchases_tab
+    
+    def _build_car_management_tab(self):
+        from services.thumbnail_cache import ThumbnailCache
+        from ui.car_management_widget import CarManagementWidget
+        self.thumbnail_cache = ThumbnailCache(parent=self)
+        self.car_management_tab = CarManagementWidget(
+            self.car_service, self.request_executor, self.thumbnail_cache)
+        self.car_management_tab.car_changed.connect(self.on_car_changed)
+        self.car_management_tab.car_removed.connect(self.on_car_removed)
+        return self.car_management_tab
+    
+    def _build_analytics_tab(self):
+        from ui.tabs.analytics_tab import AnalyticsTab
+        self.analytics_tab = AnalyticsTab(self.api_service, self.request_executor, self.sync_engine)
+        return self.analytics_tab
+    
+    def _built_tabs(self):
+        return [tab for tab in (self.rentals_tab, self.purchases_tab) if tab is not None]
+        
     def on_tab_changed(self, index):
-        """Handle tab changes and refresh data when switching to the Car Management tab"""
-        current_tab = self.tabs.widget(index)
-        if current_tab == self.car_management_tab:
+        """Build the tab on first use; refresh the cars when switching back to Car Management"""
+        page = self.tabs.widget(index)
+        if not page.is_built:
+            # A new tab loads its own data
+            page.build()
+            return
+        # While the change feed is connected the cars are already current
+        if page.widget is self.car_management_tab and not self.change_feed.connected:
             try:
                 self.car_management_tab.load_cars()
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to refresh car list: {str(e)}")
     
-    def on_cars_updated(self):
-        """Handle car updates by refreshing the rentals and purchases tabs"""
-        try:
-            # Refresh the current tab if it's the car management tab
-            current_tab = self.tabs.currentWidget()
-            if current_tab == self.car_management_tab:
-                self.car_management_tab.load_cars()
-                
-            # Also refresh rentals and purchases tabs
-            if hasattr(self.rentals_tab, 'load_rentals'):
-                self.rentals_tab.load_rentals()
-            if hasattr(self.purchases_tab, 'load_purchases'):
-                self.purchases_tab.load_purchases()
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to refresh data: {str(e)}")
\ No newline at end of file
+    def on_car_changed(self, car):
+        """Show an added or edited car on the rentals and purchases that reference it"""
+        self.api_service.car_lookup.prime([car.to_dict()])
+        for tab in self._built_tabs():
+            tab.apply_car(car)
+    
+    def on_car_removed(self, car_id):
+        """Drop a deleted car's rentals and purchases from the open tabs and the analytics
+        
+        The server deletes them with the car and reports them to the next
+        delta sync, which brings the local store up to date.
+        """
+        self.api_service.car_lookup.forget([car_id])
+        for tab in self._built_tabs():
+            tab.remove_cars([car_id])
+        if self.analytics_tab is not None:
+            self.analytics_tab.remove_cars([car_id])
+    
+    def on_remote_changes(self, entity, records, deleted_ids):
+        """Apply a batch of changes pushed by the server to the open tabs
+        
+        Tabs that are not built yet read the changes from the local store later.
+        """
+        if entity == 'rentals':
+            if self.rentals_tab is not None:
+                self.rentals_tab.apply_changes(records, deleted_ids)
+        elif entity == 'purchases':
+            if self.purchases_tab is not None:
+                self.api_service.attach_cars(records, self.api_service.car_lookup.known)
+                self.purchases_tab.apply_changes(records, deleted_ids)
+        elif entity == 'cars':
+            self.api_service.car_lookup.prime(records)
+            cars = self.car_service.apply_changes(records, deleted_ids)
+            if self.car_management_tab is not None:
+                self.car_management_tab.apply_changes(cars, deleted_ids)
+            for car in cars:
+                for tab in self._built_tabs():
+                    tab.apply_car(car)
+    
+    def on_feed_reconnected(self):
+        """Catch up on the changes published while the feed was disconnected"""
+        if self.rentals_tab is not None:
+            self.rentals_tab.load_rentals()
+        if self.purchases_tab is not None:
+            self.purchases_tab.load_purchases()
+        if self.car_management_tab is not None:
+            self.car_management_tab.load_cars()
+    
+    def closeEvent(self, event):
+        """Drop pending requests so the window closes without waiting on the network."""
+        self.change_feed.stop()
+        self.request_executor.shutdown()
+        if self.thumbnail_cache is not None:
+            self.thumbnail_cache.flush()
+        self.local_store.close()
+        super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,324 @@
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+
+
+def _money(value: float) -> str:
+    return f"${value:.2f}"
+
+
+def _percent(value: float) -> str:
+    return f"{value * 100:.1f}%"
+
+
+class ColumnarTableModel(QAbstractTableModel):
+    """Read-only table model that stores rows column by column.
+
+    Only the raw values are kept; display strings and colors are produced on
+    demand in ``data()``, so the view only pays for the rows it actually paints.
+    Subclasses describe the columns through ``headers``, ``row_values`` and the
+    optional ``formatters`` / ``status_colors`` tables.
+
+    Rows are either given all at once with ``set_records`` or come from a
+    ``ColumnarTable`` shown directly (``set_table``). The model then keeps
+    only the array of visible row positions: searching, the filters
+    of ``set_filter`` / ``set_date_range``, sorting and ``total`` are NumPy
+    operations over the table columns named in ``table_columns``.
+    """
+
+    headers: Sequence[str] = ()
+    id_column = 0
+    status_column: Optional[int] = None
+    status_colors: Dict[str, QColor] = {}
+    formatters: Dict[int, Callable[[Any], str]] = {}
+    # Columns holding floats are stored in a compact array('d')
+    float_columns: Sequence[int] = ()
+    # Table mode: table column shown in each model column, and columns the search looks at
+    table_columns: Sequence[str] = ()
+    search_columns: Sequence[str] = ()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns: List[Sequence[Any]] = self._empty_columns()
+        self._row_count = 0
+        self._descending = False
+        self._search = ""
+        self._table = None
+        self._rows: Optional[np.ndarray] = None
+        self._filters: Dict[str, Any] = {}
+        self._date_ranges: Dict[str, Tuple[Any, Any]] = {}
+        self._sort_column: Optional[int] = None
+
+    def row_values(self, record) -> tuple:
+        """Return the raw cell values of one record, in column order."""
+        raise NotImplementedError
+
+    def set_records(self, records):
+        """Replace the model contents with the given records."""
+        self._table = None
+        rows = [self.row_values(record) for record in records]
+        self.beginResetModel()
+        self._columns = self._empty_columns()
+        self._row_count = 0
+        self._append_rows(rows)
+        self.endResetModel()
+
+    def set_table(self, table):
+        """Show the rows of a ``ColumnarTable``, keeping the current search, filters and sort."""
+        self._table = table
+        self._apply_view()
+
+    def patch_rows(self, records=(), deleted_ids=()):
+        """Replace ``records`` and drop ``deleted_ids`` in the shown table without a reload."""
+        if self._table is not None:
+            self._swap_table(self._table.patch(records, deleted_ids))
+
+    def set_values(self, key_column: str, keys, values: Dict[str, Any]) -> List[Tuple[str, list, list]]:
+        """Set ``values`` (column -> value) on the rows whose ``key_column`` is in ``keys``.
+
+        Meant for optimistic edits: the change shows immediately and the
+        returned undo list restores the previous values with ``restore_values``
+        if the server rejects it.
+        """
+        table = self._table
+        if table is None:
+            return []
+        rows = np.flatnonzero(table.isin(key_column, keys))
+        ids = table.values('id', rows)
+        undo = [(name, ids, table.values(name, rows)) for name in values]
+        for name, value in values.items():
+            table = table.with_values(name, rows, value)
+        self._swap_table(table)
+        return undo
+
+    def restore_values(self, undo: List[Tuple[str, list, list]], ids=None):
+        """Roll back a ``set_values`` change, for all its rows or only those in ``ids``."""
+        table = self._table
+        if table is None or not undo:
+            return
+        only = None if ids is None else {int(record_id) for record_id in ids}
+        for name, row_ids, previous in undo:
+            by_value: Dict[Any, List[int]] = {}
+            for record_id, value in zip(row_ids, previous):
+                if only is None or record_id in only:
+                    by_value.setdefault(value, []).append(record_id)
+            for value, group in by_value.items():
+                table = table.with_values(name, np.flatnonzero(table.isin('id', group)), value)
+        self._swap_table(table)
+
+    @property
+    def table(self):
+        return self._table
+
+    def set_search(self, text: str):
+        """Keep only the rows whose ``search_columns`` contain ``text``."""
+        text = text.strip()
+        if text != self._search:
+            self._search = text
+            self._apply_view()
+
+    def set_filter(self, column: str, value: Any = None):
+        """Keep only the rows whose table column ``column`` equals ``value`` (None clears it)."""
+        if value is None:
+            self._filters.pop(column, None)
+        else:
+            self._filters[column] = value
+        self._apply_view()
+
+    def set_date_range(self, column: str, start=None, end=None):
+        """Keep only the rows whose date column ``column`` lies in ``[start, end]``."""
+        if start is None and end is None:
+            self._date_ranges.pop(column, None)
+        else:
+            self._date_ranges[column] = (start, end)
+        self._apply_view()
+
+    def total(self, column: str) -> float:
+        """Sum the table column ``column`` over the rows currently shown."""
+        if self._table is None or self._rows is None:
+            return 0.0
+        return self._table.sum(column, self._rows)
+
+    def value(self, row: int, column: int) -> Any:
+        """Return the raw value stored at ``row``/``column``."""
+        if self._table is not None:
+            return self._table.value(self.table_columns[column], self._rows[row])
+        return self._columns[column][row]
+
+    def row_id(self, row: int) -> Any:
+        return self.value(row, self.id_column)
+
+    def status(self, row: int) -> str:
+        return self.value(row, self.status_column) if self.status_column is not None else ""
+
+    def _empty_columns(self) -> List[Sequence[Any]]:
+        return [array('d') if col in self.float_columns else [] for col in range(len(self.headers))]
+
+    def _swap_table(self, table):
+        """Show ``table``, a patched copy of the current one.
+
+        When the rows keep their positions and no changed column takes part
+        in the search, filters or sort, only the changed rows are repainted;
+        otherwise the view is recomputed.
+        """
+        old = self._table
+        if old is None or self._rows is None or len(table) != len(old) \
+                or not np.array_equal(old.array('id'), table.array('id')):
+            self.set_table(table)
+            return
+        changed = np.zeros(len(table), dtype=bool)
+        changed_columns = set()
+        for name in table.column_names:
+            before, after = old.array(name), table.array(name)
+            if before is after:
+                continue
+            differs = before != after
+            if before.dtype.kind == "M":
+                differs &= ~(np.isnat(before) & np.isnat(after))
+            if differs.any():
+                changed |= differs
+                changed_columns.add(name)
+        self._table = table
+        view_columns = set(self._filters) | set(self._date_ranges)
+        if self._search:
+            view_columns.update(self.search_columns)
+        if self._sort_column is not None and self._sort_column < len(self.table_columns):
+            view_columns.add(self.table_columns[self._sort_column])
+        if changed_columns & view_columns:
+            self._apply_view()
+            return
+        visible = np.flatnonzero(changed[self._rows])
+        if len(visible):
+            self.dataChanged.emit(self.index(int(visible[0]), 0),
+                                  self.index(int(visible[-1]), self.columnCount() - 1))
+
+    def _apply_view(self):
+        """Recompute the visible row positions of the table from the search, filters and sort."""
+        table = self._table
+        if table is None:
+            return
+        mask = table.contains(self.search_columns, self._search) if self._search \
+            else np.ones(len(table), dtype=bool)
+        for column, value in self._filters.items():
+            mask &= table.equals(column, value)
+        for column, (start, end) in self._date_ranges.items():
+            mask &= table.between(column, start, end)
+        rows = np.flatnonzero(mask)
+        if self._sort_column is not None and self._sort_column < len(self.table_columns):
+            rows = table.order(self.table_columns[self._sort_column], rows, self._descending)
+        self.beginResetModel()
+        self._rows = rows
+        self._row_count = len(rows)
+        self.endResetModel()
+
+    def _append_rows(self, rows: List[tuple]):
+        if rows:
+            for column, values in zip(self._columns, zip(*rows)):
+                column.extend(values)
+            self._row_count += len(rows)
+
+    # QAbstractTableModel interface
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Re-sort the shown rows in the order of ``column``."""
+        self._sort_column = column
+        self._descending = order == Qt.DescendingOrder
+        self._apply_view()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if role == Qt.DisplayRole:
+            value = self.value(row, col)
+            formatter = self.formatters.get(col)
+            if formatter is not None:
+                return formatter(value)
+            return "" if value is None else str(value)
+
+        if role == Qt.BackgroundRole and col == self.status_column:
+            return self.status_colors.get(self.value(row, col))
+
+        return None
+
+
+class RentalTableModel(ColumnarTableModel):
+    headers = ("ID", "Customer", "Car", "Period", "Status", "Total Price")
+    status_column = 4
+    float_columns = (5,)
+    formatters = {5: _money}
+    status_colors = {
+        "APPROVED": QColor(200, 255, 200),  # Light green
+        "REJECTED": QColor(255, 200, 200),  # Light red
+    }
+    table_columns = ("id", "customer_name", "car_name", "period", "status", "total_price")
+    search_columns = ("customer_name", "customer_email", "car_name", "period", "status")
+
+    def row_values(self, rental) -> tuple:
+        return (
+            rental.id,
+            rental.customer_name,
+            rental.car_name,
+            rental.formatted_date,
+            rental.status,
+            float(rental.total_price or 0.0),
+        )
+
+
+class PurchaseTableModel(ColumnarTableModel):
+    # Columns: ID, Customer, Email, Phone, Address, Car, Purchase Date, Payment Method, Status, Purchase Price
+    headers = ("ID", "Customer", "Email", "Phone", "Address", "Car",
+               "Purchase Date", "Payment Method", "Status", "Purchase Price")
+    status_column = 8
+    float_columns = (9,)
+    formatters = {9: _money}
+    status_colors = {
+        "COMPLETED": QColor(200, 255, 200),  # Light green
+        "CANCELLED": QColor(255, 200, 200),  # Light red
+    }
+    table_columns = ("id", "customer_name", "customer_email", "customer_phone", "customer_address",
+                     "car_name", "purchase_date", "payment_method", "status", "total_amount")
+    search_columns = ("customer_name", "customer_email", "customer_phone", "customer_address",
+                      "car_name", "payment_method", "status")
+
+    def row_values(self, purchase) -> tuple:
+        return (
+            purchase.id,
+            purchase.customer_name or "",
+            purchase.customer_email or "",
+            # phone and address may be missing in API - default to empty string
+            getattr(purchase, 'customer_phone', '') or "",
+            getattr(purchase, 'customer_address', '') or "",
+            purchase.car_name,
+            purchase.purchase_date or "",
+            str(purchase.payment_method) if getattr(purchase, 'payment_method', None) else "",
+            purchase.status,
+            float(purchase.total_amount or 0.0),
+        )
+
+
+class AnalyticsTableModel(ColumnarTableModel):
+    """Rows of an analytics ``Aggregate``: group label, count and value."""
+    headers = ("Group", "Count", "Value")
+    float_columns = (2,)
+    money_formatters = {2: _money}
+    utilization_formatters = {2: _percent}
+    formatters = money_formatters
+
+    def row_values(self, row) -> tuple:
+        return row
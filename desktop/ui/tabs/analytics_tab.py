@@ -0,0 +1,211 @@
+from datetime import date, timedelta
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                            QPushButton, QHeaderView, QComboBox, QLabel,
+                            QMessageBox, QAbstractItemView)
+
+from models.columnar import car_table, purchase_table, rental_table
+from services.analytics import Analytics
+from services.request_executor import RequestExecutor
+from services.sync_engine import SyncEngine
+from ui.table_models import AnalyticsTableModel
+
+
+class AnalyticsTab(QWidget):
+    """Rental revenue, fleet utilization and purchase totals computed from the local store."""
+
+    REPORT_TITLES = (
+        ("Rental revenue", 'rental_revenue'),
+        ("Fleet utilization", 'utilization'),
+        ("Purchase totals", 'purchase_totals'),
+    )
+    GROUP_TITLES = {
+        'day': "Day", 'week': "Week", 'month': "Month", 'car_type': "Car type",
+        'car': "Car", 'status': "Status", 'payment_method': "Payment method",
+    }
+    # Label, days back from today (None = all time)
+    PERIODS = (("All time", None), ("Last 30 days", 30), ("Last 90 days", 90),
+               ("Last 12 months", 365))
+    # Reports that can be limited to one status, and the table holding it
+    STATUS_TABLES = {'rental_revenue': 'rentals', 'purchase_totals': 'purchases'}
+
+    def __init__(self, api_service, request_executor=None, sync_engine=None):
+        super().__init__()
+        self.api_service = api_service
+        self.request_executor = request_executor or RequestExecutor(parent=self)
+        self.sync_engine = sync_engine or SyncEngine(api_service)
+        self.analytics = None
+        self._loaded = False
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        controls.setSpacing(10)
+
+        self.report_combo = QComboBox()
+        for title, report in self.REPORT_TITLES:
+            self.report_combo.addItem(title, report)
+        self.group_combo = QComboBox()
+        self.period_combo = QComboBox()
+        for title, days in self.PERIODS:
+            self.period_combo.addItem(title, days)
+        self.status_combo = QComboBox()
+
+        self.refresh_btn = QPushButton("Refresh")
+        self.refresh_btn.setObjectName("refresh_btn")
+        self.refresh_btn.setToolTip("Sync the latest data and recompute the report")
+        self.refresh_btn.setMinimumWidth(120)
+        self.refresh_btn.setMinimumHeight(40)
+        self.refresh_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 8px 16px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #0b7dda;
+            }
+            QPushButton:disabled {
+                background-color: #cccccc;
+                color: #666666;
+            }
+        """)
+
+        controls.addWidget(self.refresh_btn)
+        controls.addStretch()
+        for label, combo in (("Report", self.report_combo), ("Group by", self.group_combo),
+                             ("Period", self.period_combo), ("Status", self.status_combo)):
+            controls.addWidget(QLabel(label))
+            controls.addWidget(combo)
+
+        self.model = AnalyticsTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(28)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+
+        self.summary_label = QLabel()
+        self.summary_label.setContentsMargins(10, 4, 10, 4)
+
+        container = QWidget()
+        container.setLayout(controls)
+        container.setStyleSheet("""
+            QWidget {
+                background-color: #f5f5f5;
+                padding: 10px;
+                border-bottom: 1px solid #e0e0e0;
+            }
+        """)
+
+        layout.addWidget(container, 0)
+        layout.addWidget(self.table, 1)
+        layout.addWidget(self.summary_label, 0)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        self.refresh_btn.clicked.connect(self.load_data)
+        self.report_combo.currentIndexChanged.connect(self.on_report_changed)
+        for combo in (self.group_combo, self.period_combo, self.status_combo):
+            combo.currentIndexChanged.connect(self.update_report)
+        self.on_report_changed()
+
+    def showEvent(self, event):
+        # The data is only loaded the first time the tab is opened
+        super().showEvent(event)
+        if not self._loaded:
+            self._loaded = True
+            self.load_data()
+
+    def load_data(self):
+        """Sync and build the columnar tables in the background."""
+        if self.request_executor.is_running('analytics'):
+            return
+        self.refresh_btn.setEnabled(False)
+        self.refresh_btn.setText("Loading...")
+
+        handle = self.request_executor.submit('analytics', self.build_analytics)
+        handle.succeeded.connect(self.on_data_loaded)
+        handle.failed.connect(self.on_load_failed)
+        handle.finished.connect(self.on_load_finished)
+
+    def build_analytics(self) -> Analytics:
+        """Pull the latest rentals, purchases and cars and index them (runs on a worker thread)."""
+        for entity in ('cars', 'rentals', 'purchases'):
+            self.sync_engine.sync(entity)
+        cars = self.sync_engine.cached('cars')
+        lookup = self.api_service.car_lookup
+        lookup.prime(cars)
+        purchases = self.sync_engine.cached('purchases')
+        self.api_service.attach_cars(purchases, lookup.known)
+        return Analytics(rental_table(self.sync_engine.cached('rentals')),
+                         purchase_table(purchases), car_table(cars))
+
+    def on_data_loaded(self, analytics):
+        self.analytics = analytics
+        self.on_report_changed()
+
+    def on_load_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to load analytics data: {error}")
+
+    def on_load_finished(self):
+        self.refresh_btn.setEnabled(True)
+        self.refresh_btn.setText("Refresh")
+
+    def remove_cars(self, car_ids):
+        """Drop deleted cars and their rentals and purchases from the loaded reports."""
+        if self.analytics is not None:
+            self.analytics = self.analytics.without_cars(car_ids)
+            self.on_report_changed()
+
+    def on_report_changed(self):
+        """Offer the groupings and statuses of the selected report."""
+        report = self.report_combo.currentData()
+        statuses = []
+        if self.analytics is not None and report in self.STATUS_TABLES:
+            statuses = getattr(self.analytics, self.STATUS_TABLES[report]).categories('status')
+        for combo, items in (
+                (self.group_combo, [(self.GROUP_TITLES[g], g) for g in Analytics.REPORTS[report]]),
+                (self.status_combo, [("All statuses", None)] + [(s.title(), s) for s in statuses])):
+            current = combo.currentData()
+            combo.blockSignals(True)
+            combo.clear()
+            for title, value in items:
+                combo.addItem(title, value)
+            combo.setCurrentIndex(max(combo.findData(current), 0))
+            combo.blockSignals(False)
+        self.status_combo.setEnabled(report in self.STATUS_TABLES)
+        self.update_report()
+
+    def update_report(self):
+        """Show the selected report; repeated filter combinations come from the cache."""
+        if self.analytics is None:
+            return
+        report = self.report_combo.currentData()
+        group_by = self.group_combo.currentData()
+        days = self.period_combo.currentData()
+        start = (date.today() - timedelta(days=days)).isoformat() if days else None
+        end = date.today().isoformat() if days else None
+        status = self.status_combo.currentData() if report in self.STATUS_TABLES else None
+
+        result = self.analytics.report(report, group_by, start, end, status)
+
+        value_title = "Utilization" if report == 'utilization' else "Total"
+        count_title = "Rented days" if report == 'utilization' else "Count"
+        self.model.headers = (self.GROUP_TITLES[group_by], count_title, value_title)
+        self.model.formatters = self.model.utilization_formatters if report == 'utilization' \
+            else self.model.money_formatters
+        self.model.set_records(result.rows())
+
+        if report == 'utilization':
+            summary = f"{result.total_count:,} rented car-days"
+        else:
+            summary = f"{result.total_count:,} records · Total ${result.total_value:,.2f}"
+        self.summary_label.setText(summary)
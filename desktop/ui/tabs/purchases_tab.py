@@ -1,14 +1,24 @@
-import requests
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                            QTableWidgetItem, QPushButton, QHeaderView,
-                            QMessageBox, QAbstractItemView, QApplication)
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, 
+                            QPushButton, QHeaderView, QLineEdit, QComboBox, QLabel,
+                            QMessageBox, QAbstractItemView)
+import logging
+
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor
+
+from models.columnar import purchase_table
+from services.request_executor import RequestExecutor
+from services.sync_engine import SyncEngine
+from ui.export_dialog import export_entity
+from ui.table_models import PurchaseTableModel
+
+logger = logging.getLogger(__name__)
 
 class PurchasesTab(QWidget):
-    def __init__(self, api_service):
+    def __init__(self, api_service, request_executor=None, sync_engine=None):
         super().__init__()
         self.api_service = api_service
+        self.request_executor = request_executor or RequestExecutor(parent=self)
+        self.sync_engine = sync_engine or SyncEngine(api_service)
         self.init_ui()
         self.load_purchases()
     
@@ -23,9 +33,10 @@ class PurchasesTab(QWidget):
         self.refresh_btn = QPushButton("Refresh")
         self.complete_btn = QPushButton("✅ Complete")
         self.cancel_btn = QPushButton("Cancel")
+        self.export_btn = QPushButton("Export...")
         
         # Set fixed size for buttons
-        for btn in [self.refresh_btn, self.complete_btn, self.cancel_btn]:
+        for btn in [self.refresh_btn, self.complete_btn, self.cancel_btn, self.export_btn]:
             btn.setMinimumWidth(120)
             btn.setMinimumHeight(40)
             btn.setStyleSheet("""
@@ -63,11 +74,13 @@ class PurchasesTab(QWidget):
         self.refresh_btn.setObjectName("refresh_btn")
         self.complete_btn.setObjectName("complete_btn")
         self.cancel_btn.setObjectName("cancel_btn")
+        self.export_btn.setObjectName("export_btn")
         
         # Set button tooltips
         self.refresh_btn.setToolTip("Refresh the purchases list")
-        self.complete_btn.setToolTip("Mark the selected purchase as completed")
-        self.cancel_btn.setToolTip("Cancel the selected purchase")
+        self.complete_btn.setToolTip("Mark the selected purchases as completed")
+        self.cancel_btn.setToolTip("Cancel the selected purchases")
+        self.export_btn.setToolTip("Export the purchases with the chosen status to CSV or Parquet")
         
         # Disable action buttons by default (until a row is selected)
         self.complete_btn.setEnabled(False)
@@ -76,26 +89,52 @@ class PurchasesTab(QWidget):
         btn_layout.addWidget(self.refresh_btn)
         btn_layout.addWidget(self.complete_btn)
         btn_layout.addWidget(self.cancel_btn)
+        btn_layout.addWidget(self.export_btn)
+        btn_layout.addStretch()
+        
+        # Status filter; the choices come from the loaded purchases
+        self.status_combo = QComboBox()
+        self.status_combo.addItem("All statuses", None)
+        btn_layout.addWidget(self.status_combo)
         
-        # Table
-        self.table = QTableWidget()
-        # Show full purchase fields in a clear order to match backend model
-        # Columns: ID, Customer, Email, Phone, Address, Car, Purchase Date, Payment Method, Status, Purchase Price
-        self.table.setColumnCount(10)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Customer", "Email", "Phone", "Address", "Car", "Purchase Date", "Payment Method", "Status", "Purchase Price"
-        ])
+        # Filter box (matches customer, car, date, payment method and status)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter purchases...")
+        self.filter_edit.setClearButtonEnabled(True)
+        btn_layout.addWidget(self.filter_edit)
+        
+        # Table backed by a model over a columnar copy of the local store;
+        # only the visible rows are rendered. Show full purchase fields in a
+        # clear order to match backend model
+        self.model = PurchaseTableModel(self)
+        self.status_combo.currentIndexChanged.connect(
+            lambda _: self.model.set_filter('status', self.status_combo.currentData()))
+        
+        # Debounce the filter so fast typing runs one query per pause
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(lambda: self.model.set_search(self.filter_edit.text()))
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+        
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(28)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         
         # Connect selection change event
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         
         # Connect buttons
         self.refresh_btn.clicked.connect(self.load_purchases)
         self.complete_btn.clicked.connect(self.complete_purchase)
         self.cancel_btn.clicked.connect(self.cancel_purchase)
+        self.export_btn.clicked.connect(self.export_purchases)
         
         # Create a container widget for the buttons
         button_container = QWidget()
@@ -110,206 +149,235 @@ class PurchasesTab(QWidget):
             }
         """)
         
+        # Count and total of the purchases currently shown
+        self.summary_label = QLabel()
+        self.summary_label.setContentsMargins(10, 4, 10, 4)
+        self.model.modelReset.connect(self.update_summary)
+        self.model.dataChanged.connect(self.update_summary)
+        
         # Add widgets to main layout with stretch factors
         layout.addWidget(button_container, 0)  # Buttons at the top, don't stretch
         layout.addWidget(self.table, 1)        # Table takes remaining space
+        layout.addWidget(self.summary_label, 0)
         
         # Set layout margins and spacing
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
     
+    def sync_purchases(self):
+        """Pull the changed purchases and build their columnar table (runs on a worker thread)."""
+        self.sync_engine.sync('purchases')
+        # Let purchases that only reference a car by ID show its name. The
+        # car sync is a delta, and the lookup only takes the changed cars
+        self.sync_engine.sync('cars')
+        lookup = self.api_service.car_lookup
+        lookup.refresh(self.sync_engine.cached('cars'))
+        
+        return purchase_table(self._with_cars(lookup))
+    
+    def _with_cars(self, lookup):
+        """Yield the stored purchases, attaching the cars of one store batch at a time."""
+        for batch in self.sync_engine.cached_batches('purchases'):
+            self.api_service.attach_cars(batch, lookup.known)
+            yield from batch
+    
     def load_purchases(self):
+        """Sync purchases in the background; the table is refilled when they arrive."""
+        if self.request_executor.is_running('purchases'):
+            return
+        
+        # Show loading state
+        self.refresh_btn.setEnabled(False)
+        self.refresh_btn.setText("Loading...")
+        
+        handle = self.request_executor.submit('purchases', self.sync_purchases)
+        handle.succeeded.connect(self.populate_purchases)
+        handle.failed.connect(self.on_load_failed)
+        handle.finished.connect(self.on_load_finished)
+    
+    def populate_purchases(self, table):
+        """Show the freshly built purchases table."""
         try:
-            # Show loading state
-            self.refresh_btn.setEnabled(False)
-            self.refresh_btn.setText("Loading...")
+            self.model.set_table(table)
+            self._update_status_choices(table.categories('status'))
+            logger.debug("Showing %d purchases", len(table))
             
-            # Force UI update
-            QApplication.processEvents()
-            
-            # Debug: Print the API URL being called
-            print(f"Fetching purchases from: {self.api_service.base_url}/purchases")
-            
-            purchases = self.api_service.get_purchases()
-            print(f"Received {len(purchases)} purchases from API")
-            
-            if not purchases:
+            if not len(table):
                 QMessageBox.information(self, "No Purchases", "No purchases found in the database.")
-            
-            self.table.setRowCount(len(purchases))
-            
-            for row, purchase in enumerate(purchases):
-                try:
-                    print(f"Processing purchase {row + 1}/{len(purchases)}: {purchase}")
-                    print(f"Purchase data: {purchase.__dict__}")
-                    
-                    # ID
-                    # Fill columns matching headers
-                    self.table.setItem(row, 0, QTableWidgetItem(str(purchase.id)))
-                    self.table.setItem(row, 1, QTableWidgetItem(purchase.customer_name))
-                    self.table.setItem(row, 2, QTableWidgetItem(purchase.customer_email or ""))
-                    # phone and address may be missing in API - default to empty string
-                    self.table.setItem(row, 3, QTableWidgetItem(getattr(purchase, 'customer_phone', '') or ""))
-                    self.table.setItem(row, 4, QTableWidgetItem(getattr(purchase, 'customer_address', '') or ""))
-                    self.table.setItem(row, 5, QTableWidgetItem(purchase.car_name))
-                    self.table.setItem(row, 6, QTableWidgetItem(purchase.purchase_date))
-
-                    # Payment method
-                    self.table.setItem(row, 7, QTableWidgetItem(str(purchase.payment_method) if getattr(purchase, 'payment_method', None) else ""))
-
-                    # Status with color coding (column 8)
-                    status_item = QTableWidgetItem(purchase.status)
-                    if purchase.status == "COMPLETED":
-                        status_item.setBackground(QColor(200, 255, 200))  # Light green
-                    elif purchase.status == "CANCELLED":
-                        status_item.setBackground(QColor(255, 200, 200))  # Light red
-                    self.table.setItem(row, 8, status_item)
-
-                    # Purchase price (column 9)
-                    self.table.setItem(row, 9, QTableWidgetItem(f"${purchase.total_amount:.2f}"))
-                    
-                except Exception as e:
-                    print(f"Error processing purchase {row + 1}: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-            
-            # Auto-resize rows to content
-            self.table.resizeRowsToContents()
-            
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Network error while fetching purchases: {str(e)}\n"
-            if hasattr(e, 'response') and e.response is not None:
-                error_msg += f"Status Code: {e.response.status_code}\n"
-                try:
-                    error_msg += f"Response: {e.response.text}"
-                except:
-                    pass
-            
-            print(error_msg)
-            QMessageBox.critical(self, "Network Error", error_msg)
+            self.on_selection_changed()
             
         except Exception as e:
-            error_msg = f"Failed to load purchases: {str(e)}\n"
-            import traceback
-            error_msg += traceback.format_exc()
-            
-            print(error_msg)
+            logger.exception("Failed to load purchases")
             QMessageBox.critical(self, "Error", f"An unexpected error occurred:\n{str(e)}")
-            
-        finally:
-            # Reset button state
-            self.refresh_btn.setEnabled(True)
-            self.refresh_btn.setText("Refresh")
+    
+    def apply_changes(self, records, deleted_ids):
+        """Patch purchases changed elsewhere (e.g. pushed by the server) into the shown table."""
+        if self.model.table is None:
+            return
+        self.model.patch_rows(records, deleted_ids)
+        self._update_status_choices(self.model.table.categories('status'))
+    
+    def apply_car(self, car):
+        """Show an edited car on its purchases without reloading them."""
+        self.model.set_values('car_id', [car.id], {
+            'car_name': f"{car.name} {car.model}".strip(),
+            'car_type': car.car_type,
+        })
+    
+    def remove_cars(self, car_ids):
+        """Drop the purchases of deleted cars (the server deletes them with the car); returns their IDs."""
+        table = self.model.table
+        if table is None:
+            return []
+        deleted_ids = table.values('id', table.isin('car_id', car_ids))
+        if deleted_ids:
+            self.apply_changes((), deleted_ids)
+        return deleted_ids
+    
+    def _update_status_choices(self, statuses):
+        current = self.status_combo.currentData()
+        self.status_combo.blockSignals(True)
+        self.status_combo.clear()
+        self.status_combo.addItem("All statuses", None)
+        for status in statuses:
+            self.status_combo.addItem(status.title(), status)
+        index = self.status_combo.findData(current)
+        self.status_combo.setCurrentIndex(max(index, 0))
+        self.status_combo.blockSignals(False)
+        if index < 0 and current is not None:
+            self.model.set_filter('status', None)
+    
+    def update_summary(self):
+        count = self.model.rowCount()
+        self.summary_label.setText(
+            f"{count} purchase{'s' if count != 1 else ''} · Total ${self.model.total('total_amount'):,.2f}")
+    
+    def on_load_failed(self, error):
+        error_msg = f"Network error while fetching purchases: {error}"
+        logger.error(error_msg)
+        QMessageBox.critical(self, "Network Error", error_msg)
+    
+    def on_load_finished(self):
+        # Reset button state
+        self.refresh_btn.setEnabled(True)
+        self.refresh_btn.setText("Refresh")
+    
+    def export_purchases(self):
+        """Export the purchases with the status chosen in the filter to a file in the background."""
+        handle = export_entity(self, self.request_executor, self.sync_engine, 'purchases',
+                               self.status_combo.currentData())
+        if handle is not None:
+            self.export_btn.setEnabled(False)
+            handle.finished.connect(lambda: self.export_btn.setEnabled(True))
     
     def complete_purchase(self):
-        """Mark the selected purchase as completed."""
+        """Mark the selected purchases as completed."""
         self._update_purchase_status("COMPLETED")
     
     def cancel_purchase(self):
-        """Cancel the selected purchase."""
+        """Cancel the selected purchases."""
         self._update_purchase_status("CANCELLED")
     
     def on_selection_changed(self):
-        """Enable/disable action buttons based on selection"""
-        selected = self.table.selectedItems()
-        has_selection = len(selected) > 0
-        
-        # Enable action buttons only if a row is selected
-        self.complete_btn.setEnabled(has_selection)
-        self.cancel_btn.setEnabled(has_selection)
-        
-        # If a row is selected, check if it's already in a final state
-        if has_selection:
-            row = selected[0].row()
-            status = self.table.item(row, 8).text()  # Status is in column 8
-            
-            # Disable buttons if already in final state
-            if status in ["COMPLETED", "CANCELLED"]:
-                self.complete_btn.setEnabled(False)
-                self.cancel_btn.setEnabled(False)
+        """Enable the action buttons while any selected purchase is still open"""
+        open_purchases = bool(self._open_ids())
+        self.complete_btn.setEnabled(open_purchases)
+        self.cancel_btn.setEnabled(open_purchases)
+    
+    def _selected_rows(self):
+        """Return the model rows of the current selection."""
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
+    
+    def _open_ids(self):
+        """IDs of the selected purchases that are not in a final state."""
+        return [int(self.model.row_id(row)) for row in self._selected_rows()
+                if self.model.row_id(row) and self.model.status(row) not in ["COMPLETED", "CANCELLED"]]
     
     def _update_purchase_status(self, status: str):
-        """Update the status of the selected purchase"""
-        selected = self.table.selectedItems()
-        if not selected:
+        """Update the status of every selected open purchase in one request"""
+        if not self._selected_rows():
             QMessageBox.warning(self, "No Selection", "Please select a purchase to update.")
             return
         
         try:
-            row = selected[0].row()
-            purchase_id_item = self.table.item(row, 0)  # ID is in column 0
+            purchase_ids = self._open_ids()
             
-            if not purchase_id_item:
-                QMessageBox.warning(self, "Error", "Could not determine purchase ID.")
-                return
-                
-            purchase_id = purchase_id_item.text()
-            if not purchase_id or purchase_id == '0':
-                QMessageBox.warning(self, "Error", "Invalid purchase ID. Please refresh the list and try again.")
-                return
-                
-            purchase_id = int(purchase_id)
-            current_status = self.table.item(row, 8).text()  # Status is in column 8
-            
-            # Don't allow updating if already in a final state
-            if current_status in ["COMPLETED", "CANCELLED"]:
-                QMessageBox.warning(self, "Cannot Update", "This purchase has already been processed.")
+            # Purchases that were already processed are left alone
+            if not purchase_ids:
+                QMessageBox.warning(self, "Cannot Update", "The selected purchases have already been processed.")
                 return
                 
             # Show confirmation dialog
             action = "complete" if status == "COMPLETED" else "cancel"
+            target = f"purchase #{purchase_ids[0]}" if len(purchase_ids) == 1 \
+                else f"{len(purchase_ids)} purchases"
             confirm = QMessageBox.question(
                 self,
                 "Confirm Action",
-                f"Are you sure you want to {action} purchase #{purchase_id}?",
+                f"Are you sure you want to {action} {target}?",
                 QMessageBox.Yes | QMessageBox.No
             )
             
             if confirm == QMessageBox.Yes:
-                # Disable buttons during update
-                self.complete_btn.setEnabled(False)
-                self.cancel_btn.setEnabled(False)
-                
-                # Show processing state
-                processing_msg = QMessageBox(
-                    QMessageBox.Information,
-                    "Processing",
-                    f"Updating purchase status to {status.lower()}...",
-                    QMessageBox.NoButton,
-                    self
-                )
-                processing_msg.setWindowModality(Qt.WindowModal)
-                processing_msg.show()
-                
-                # Force UI update
-                QApplication.processEvents()
+                # Show the new status right away; it is rolled back if the server refuses it
+                undo = self.model.set_values('id', purchase_ids, {'status': status})
+                self.on_selection_changed()
                 
-                print(f"[UI] Attempting to update purchase {purchase_id} to status: {status}")
-                
-                # Perform the update
-                success = self.api_service.update_purchase_status(purchase_id, status)
-                
-                if success:
-                    print(f"[UI] Successfully updated purchase {purchase_id} to {status}")
-                    # Close processing message and refresh data
-                    processing_msg.close()
-                    self.load_purchases()
-                    QMessageBox.information(self, "Success", f"Purchase {action}d successfully!")
-                else:
-                    print(f"[UI] Failed to update purchase {purchase_id}")
-                    processing_msg.close()
-                    QMessageBox.warning(self, "Update Failed", 
-                                     "Failed to update purchase status. "
-                                     "Please check the console for more details and try again.")
+                # Batches never share a purchase, so the first ID keys the request
+                handle = self.request_executor.submit(
+                    f'purchase-status-{purchase_ids[0]}', self.apply_purchase_statuses,
+                    purchase_ids, status, coalesce=False)
+                handle.succeeded.connect(
+                    lambda result: self._on_status_updated(result, action, undo))
+                handle.failed.connect(
+                    lambda error: self._on_status_update_failed(error, undo))
+                return
                 
         except ValueError as ve:
             QMessageBox.critical(self, "Error", f"Invalid purchase ID format: {str(ve)}")
         except Exception as e:
-            error_msg = f"Failed to update purchase status: {str(e)}\n"
-            import traceback
-            error_msg += traceback.format_exc()
-            print(error_msg)
+            logger.exception("Failed to update purchase status")
             QMessageBox.critical(self, "Error", f"An unexpected error occurred:\n{str(e)}")
-        finally:
-            # Re-enable buttons
-            self.on_selection_changed()
\ No newline at end of file
+        
+        # Re-enable buttons
+        self.on_selection_changed()
+    
+    def apply_purchase_statuses(self, purchase_ids, status):
+        """Update the purchases on the server and patch the local store (runs on a worker thread)."""
+        result = self.api_service.update_purchase_statuses(purchase_ids, status)
+        if result is not None:
+            store = self.sync_engine.store
+            store.apply_changes('purchases', result['updated'], result['deletedIds'],
+                                store.cursor('purchases'))
+            self.api_service.attach_cars(result['updated'], self.api_service.car_lookup.known)
+        return result
+    
+    def _on_status_updated(self, result, action, undo):
+        if result is None:
+            self.model.restore_values(undo)
+            QMessageBox.warning(self, "Update Failed", 
+                             "Failed to update purchase status. "
+                             "Please check the console for more details and try again.")
+            self.on_selection_changed()
+            return
+        
+        # Reconcile the optimistic rows with what the server saved
+        self.model.restore_values(undo, result['failed'])
+        self.model.patch_rows(result['updated'], result['deletedIds'])
+        self._update_status_choices(self.model.table.categories('status'))
+        
+        if result['failed']:
+            logger.warning("Purchase status update failed for %s", result['failed'])
+            done = len(result['updated']) + len(result['deletedIds'])
+            failures = "\n".join(f"#{purchase_id}: {reason}"
+                                  for purchase_id, reason in list(result['failed'].items())[:10])
+            QMessageBox.warning(self, "Partially Updated",
+                                f"{done} purchase{'s' if done != 1 else ''} {action}d.\n"
+                                f"{len(result['failed'])} could not be updated:\n{failures}")
+        self.on_selection_changed()
+    
+    def _on_status_update_failed(self, error, undo):
+        self.model.restore_values(undo)
+        logger.error("Failed to update purchase status: %s", error)
+        QMessageBox.critical(self, "Error", f"An unexpected error occurred:\n{error}")
+        self.on_selection_changed()
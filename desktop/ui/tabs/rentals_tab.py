@@ -1,13 +1,23 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                            QTableWidgetItem, QPushButton, QHeaderView,
-                            QMessageBox, QAbstractItemView, QApplication)
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, 
+                            QPushButton, QHeaderView, QLineEdit, QComboBox, QLabel,
+                            QMessageBox, QAbstractItemView)
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor
+
+from models.columnar import rental_table
+from services.request_executor import RequestExecutor
+from services.sync_engine import SyncEngine
+from ui.export_dialog import export_entity
+from ui.table_models import RentalTableModel
 
 class RentalsTab(QWidget):
-    def __init__(self, api_service):
+    # Status the server stores for each action
+    SERVER_STATUSES = {"APPROVED": "CONFIRMED", "REJECTED": "CANCELLED"}
+    
+    def __init__(self, api_service, request_executor=None, sync_engine=None):
         super().__init__()
         self.api_service = api_service
+        self.request_executor = request_executor or RequestExecutor(parent=self)
+        self.sync_engine = sync_engine or SyncEngine(api_service)
         self.init_ui()
         self.load_rentals()
     
@@ -22,9 +32,10 @@ class RentalsTab(QWidget):
         self.refresh_btn = QPushButton("Refresh")
         self.approve_btn = QPushButton("✅ Approve")
         self.reject_btn = QPushButton("Reject")
+        self.export_btn = QPushButton("Export...")
         
         # Set fixed size for buttons
-        for btn in [self.refresh_btn, self.approve_btn, self.reject_btn]:
+        for btn in [self.refresh_btn, self.approve_btn, self.reject_btn, self.export_btn]:
             btn.setMinimumWidth(120)
             btn.setMinimumHeight(40)
             btn.setStyleSheet("""
@@ -62,35 +73,66 @@ class RentalsTab(QWidget):
         self.refresh_btn.setObjectName("refresh_btn")
         self.approve_btn.setObjectName("approve_btn")
         self.reject_btn.setObjectName("reject_btn")
+        self.export_btn.setObjectName("export_btn")
         
         # Set button tooltips
         self.refresh_btn.setToolTip("Refresh the rentals list")
-        self.approve_btn.setToolTip("Approve the selected rental")
-        self.reject_btn.setToolTip("Reject the selected rental")
+        self.approve_btn.setToolTip("Approve the selected pending rentals")
+        self.reject_btn.setToolTip("Reject the selected pending rentals")
+        self.export_btn.setToolTip("Export the rentals with the chosen status to CSV or Parquet")
         
         # Disable action buttons by default (until a row is selected)
         self.approve_btn.setEnabled(False)
         self.reject_btn.setEnabled(False)
         
+        # Filter box (matches customer, car, dates and status)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter rentals...")
+        self.filter_edit.setClearButtonEnabled(True)
+        
         btn_layout.addWidget(self.refresh_btn)
         btn_layout.addWidget(self.approve_btn)
         btn_layout.addWidget(self.reject_btn)
+        btn_layout.addWidget(self.export_btn)
+        btn_layout.addStretch()
+        
+        # Status filter; the choices come from the loaded rentals
+        self.status_combo = QComboBox()
+        self.status_combo.addItem("All statuses", None)
+        btn_layout.addWidget(self.status_combo)
+        btn_layout.addWidget(self.filter_edit)
+        
+        # Table backed by a model over a columnar copy of the local store;
+        # sorting, filtering and the total are NumPy operations on its columns
+        self.model = RentalTableModel(self)
+        self.status_combo.currentIndexChanged.connect(
+            lambda _: self.model.set_filter('status', self.status_combo.currentData()))
+        
+        # Debounce the filter so fast typing runs one query per pause
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(lambda: self.model.set_search(self.filter_edit.text()))
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
         
-        # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Customer", "Car", "Period", "Status", "Total Price"
-        ])
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(28)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         
         # Connect selection change event
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         
         # Connect buttons
         self.refresh_btn.clicked.connect(self.load_rentals)
         self.approve_btn.clicked.connect(self.approve_rental)
         self.reject_btn.clicked.connect(self.reject_rental)
+        self.export_btn.clicked.connect(self.export_rentals)
         
         # Create a container widget for the buttons
         button_container = QWidget()
@@ -105,51 +147,108 @@ class RentalsTab(QWidget):
             }
         """)
         
+        # Count and total of the rentals currently shown
+        self.summary_label = QLabel()
+        self.summary_label.setContentsMargins(10, 4, 10, 4)
+        self.model.modelReset.connect(self.update_summary)
+        self.model.dataChanged.connect(self.update_summary)
+        
         # Add widgets to main layout with stretch factors
         layout.addWidget(button_container, 0)  # Buttons at the top, don't stretch
         layout.addWidget(self.table, 1)        # Table takes remaining space
+        layout.addWidget(self.summary_label, 0)
         
         # Set layout margins and spacing
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
     
     def load_rentals(self):
+        """Sync rentals in the background; the table is refilled when they arrive."""
+        if self.request_executor.is_running('rentals'):
+            return
+        
+        # Show loading state
+        self.refresh_btn.setEnabled(False)
+        self.refresh_btn.setText("Loading...")
+        
+        handle = self.request_executor.submit('rentals', self.sync_rentals)
+        handle.succeeded.connect(self.populate_rentals)
+        handle.failed.connect(self.on_load_failed)
+        handle.finished.connect(self.on_load_finished)
+    
+    def sync_rentals(self):
+        """Pull the changed rentals and build their columnar table (runs on a worker thread)."""
+        self.sync_engine.sync('rentals')
+        return rental_table(record for batch in self.sync_engine.cached_batches('rentals')
+                            for record in batch)
+    
+    def populate_rentals(self, table):
+        """Show the freshly built rentals table."""
         try:
-            # Show loading state
-            self.refresh_btn.setEnabled(False)
-            self.refresh_btn.setText("Loading...")
-            
-            # Force UI update
-            QApplication.processEvents()
-            
-            rentals = self.api_service.get_rentals()
-            self.table.setRowCount(len(rentals))
-            
-            for row, rental in enumerate(rentals):
-                self.table.setItem(row, 0, QTableWidgetItem(str(rental.id)))
-                self.table.setItem(row, 1, QTableWidgetItem(rental.customer_name))
-                self.table.setItem(row, 2, QTableWidgetItem(rental.car_name))
-                self.table.setItem(row, 3, QTableWidgetItem(rental.formatted_date))
-                
-                # Status with color coding
-                status_item = QTableWidgetItem(rental.status)
-                if rental.status == "APPROVED":
-                    status_item.setBackground(QColor(200, 255, 200))  # Light green
-                elif rental.status == "REJECTED":
-                    status_item.setBackground(QColor(255, 200, 200))  # Light red
-                self.table.setItem(row, 4, status_item)
-                
-                self.table.setItem(row, 5, QTableWidgetItem(f"${rental.total_price:.2f}"))
-                
-            # Auto-resize rows to content
-            self.table.resizeRowsToContents()
+            self.model.set_table(table)
+            self._update_status_choices(table.categories('status'))
+            self.on_selection_changed()
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load rentals: {str(e)}")
-        finally:
-            # Reset button state
-            self.refresh_btn.setEnabled(True)
-            self.refresh_btn.setText("Refresh")
+    
+    def apply_changes(self, records, deleted_ids):
+        """Patch rentals changed elsewhere (e.g. pushed by the server) into the shown table."""
+        if self.model.table is None:
+            return
+        self.model.patch_rows(records, deleted_ids)
+        self._update_status_choices(self.model.table.categories('status'))
+    
+    def apply_car(self, car):
+        """Show an edited car on its rentals without reloading them."""
+        self.model.set_values('car_id', [car.id], {
+            'car_name': f"{car.name} {car.model}".strip(),
+            'car_type': car.car_type,
+        })
+    
+    def remove_cars(self, car_ids):
+        """Drop the rentals of deleted cars (the server deletes them with the car); returns their IDs."""
+        table = self.model.table
+        if table is None:
+            return []
+        deleted_ids = table.values('id', table.isin('car_id', car_ids))
+        if deleted_ids:
+            self.apply_changes((), deleted_ids)
+        return deleted_ids
+    
+    def _update_status_choices(self, statuses):
+        current = self.status_combo.currentData()
+        self.status_combo.blockSignals(True)
+        self.status_combo.clear()
+        self.status_combo.addItem("All statuses", None)
+        for status in statuses:
+            self.status_combo.addItem(status.title(), status)
+        index = self.status_combo.findData(current)
+        self.status_combo.setCurrentIndex(max(index, 0))
+        self.status_combo.blockSignals(False)
+        if index < 0 and current is not None:
+            self.model.set_filter('status', None)
+    
+    def update_summary(self):
+        count = self.model.rowCount()
+        self.summary_label.setText(
+            f"{count} rental{'s' if count != 1 else ''} · Total ${self.model.total('total_price'):,.2f}")
+    
+    def on_load_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to load rentals: {error}")
+    
+    def on_load_finished(self):
+        # Reset button state
+        self.refresh_btn.setEnabled(True)
+        self.refresh_btn.setText("Refresh")
+    
+    def export_rentals(self):
+        """Export the rentals with the status chosen in the filter to a file in the background."""
+        handle = export_entity(self, self.request_executor, self.sync_engine, 'rentals',
+                               self.status_combo.currentData())
+        if handle is not None:
+            self.export_btn.setEnabled(False)
+            handle.finished.connect(lambda: self.export_btn.setEnabled(True))
     
     def approve_rental(self):
         self._update_rental_status("APPROVED")
@@ -158,81 +257,96 @@ class RentalsTab(QWidget):
         self._update_rental_status("REJECTED")
     
     def on_selection_changed(self):
-        """Enable/disable action buttons based on selection and rental status"""
-        # Disable all buttons by default
-        self.approve_btn.setEnabled(False)
-        self.reject_btn.setEnabled(False)
-        
-        # Get selected items
-        selected = self.table.selectedItems()
-        if not selected:
-            return
-            
-        # Get the status of the selected rental
-        row = selected[0].row()
-        status_item = self.table.item(row, 4)  # Status is in column 4
-        
-        # Only enable buttons if status is PENDING
-        if status_item and status_item.text() == "PENDING":
-            self.approve_btn.setEnabled(True)
-            self.reject_btn.setEnabled(True)
+        """Enable the action buttons while any selected rental is pending"""
+        pending = bool(self._pending_ids())
+        self.approve_btn.setEnabled(pending)
+        self.reject_btn.setEnabled(pending)
+    
+    def _selected_rows(self):
+        """Return the model rows of the current selection."""
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
+    
+    def _pending_ids(self):
+        """IDs of the selected rentals that are still pending."""
+        return [int(self.model.row_id(row)) for row in self._selected_rows()
+                if self.model.status(row) == "PENDING"]
     
     def _update_rental_status(self, status: str):
-        """Update the status of the selected rental"""
-        selected = self.table.selectedItems()
-        if not selected:
+        """Update the status of every selected pending rental in one request"""
+        if not self._selected_rows():
             QMessageBox.warning(self, "No Selection", "Please select a rental to update.")
             return
         
         try:
-            row = selected[0].row()
-            rental_id = int(self.table.item(row, 0).text())
-            current_status = self.table.item(row, 4).text()
+            rental_ids = self._pending_ids()
             
-            # Don't allow updating if already in a final state
-            if current_status in ["APPROVED", "REJECTED"]:
-                QMessageBox.warning(self, "Cannot Update", "This rental has already been processed.")
+            # Rentals that were already processed are left alone
+            if not rental_ids:
+                QMessageBox.warning(self, "Cannot Update", "The selected rentals have already been processed.")
                 return
-                
+            
             # Show confirmation dialog
+            target = "this rental" if len(rental_ids) == 1 else f"{len(rental_ids)} rentals"
             confirm = QMessageBox.question(
                 self,
                 "Confirm Action",
-                f"Are you sure you want to {status.lower()} this rental?",
+                f"Are you sure you want to {status.lower()} {target}?",
                 QMessageBox.Yes | QMessageBox.No
             )
             
             if confirm == QMessageBox.Yes:
-                # Disable buttons during update
-                self.approve_btn.setEnabled(False)
-                self.reject_btn.setEnabled(False)
-                
-                # Show processing state
-                processing_msg = QMessageBox(
-                    QMessageBox.Information,
-                    "Processing",
-                    f"Updating rental status to {status}...",
-                    QMessageBox.NoButton,
-                    self
-                )
-                processing_msg.setWindowModality(Qt.WindowModal)
-                processing_msg.show()
-                
-                # Force UI update
-                QApplication.processEvents()
+                # Show the new status right away; it is rolled back if the server refuses it
+                undo = self.model.set_values(
+                    'id', rental_ids, {'status': self.SERVER_STATUSES.get(status, status)})
+                self.on_selection_changed()
                 
-                # Perform the update
-                if self.api_service.update_rental_status(rental_id, status):
-                    # Close processing message and refresh data
-                    processing_msg.close()
-                    self.load_rentals()
-                    QMessageBox.information(self, "Success", f"Rental {status.lower()}d successfully!")
-                else:
-                    processing_msg.close()
-                    QMessageBox.warning(self, "Update Failed", "Failed to update rental status. Please try again.")
+                # Batches never share a rental, so the first ID keys the request
+                handle = self.request_executor.submit(
+                    f'rental-status-{rental_ids[0]}', self.apply_rental_statuses, rental_ids, status,
+                    coalesce=False)
+                handle.succeeded.connect(
+                    lambda result: self._on_status_updated(result, status, undo))
+                handle.failed.connect(
+                    lambda error: self._on_status_update_failed(error, undo))
+                return
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to update rental status: {str(e)}")
-        finally:
-            # Re-enable buttons
-            self.on_selection_changed()
\ No newline at end of file
+        
+        # Re-enable buttons
+        self.on_selection_changed()
+    
+    def apply_rental_statuses(self, rental_ids, status):
+        """Update the rentals on the server and patch the local store (runs on a worker thread)."""
+        result = self.api_service.update_rental_statuses(rental_ids, status)
+        if result is not None:
+            store = self.sync_engine.store
+            store.apply_changes('rentals', result['updated'], result['deletedIds'],
+                                store.cursor('rentals'))
+        return result
+    
+    def _on_status_updated(self, result, status, undo):
+        if result is None:
+            self.model.restore_values(undo)
+            QMessageBox.warning(self, "Update Failed", "Failed to update rental status. Please try again.")
+            self.on_selection_changed()
+            return
+        
+        # Reconcile the optimistic rows with what the server saved
+        self.model.restore_values(undo, result['failed'])
+        self.model.patch_rows(result['updated'], result['deletedIds'])
+        self._update_status_choices(self.model.table.categories('status'))
+        
+        if result['failed']:
+            done = len(result['updated']) + len(result['deletedIds'])
+            failures = "\n".join(f"#{rental_id}: {reason}"
+                                  for rental_id, reason in list(result['failed'].items())[:10])
+            QMessageBox.warning(self, "Partially Updated",
+                                f"{done} rental{'s' if done != 1 else ''} {status.lower()}.\n"
+                                f"{len(result['failed'])} could not be updated:\n{failures}")
+        self.on_selection_changed()
+    
+    def _on_status_update_failed(self, error, undo):
+        self.model.restore_values(undo)
+        QMessageBox.critical(self, "Error", f"Failed to update rental status: {error}")
+        self.on_selection_changed()
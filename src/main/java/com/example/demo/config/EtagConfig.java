@@ -0,0 +1,32 @@
+package com.example.demo.config;
+
+import jakarta.servlet.http.HttpServletRequest;
+import org.springframework.boot.web.servlet.FilterRegistrationBean;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+import org.springframework.web.filter.ShallowEtagHeaderFilter;
+
+/**
+ * Adds an ETag (hash of the response body) to every API response and answers
+ * {@code If-None-Match} requests for unchanged content with 304 Not Modified,
+ * so clients can revalidate cached lists without downloading them again.
+ * The {@code /api/events} stream is left out.
+ */
+@Configuration
+public class EtagConfig {
+
+    @Bean
+    public FilterRegistrationBean<ShallowEtagHeaderFilter> shallowEtagHeaderFilter() {
+        ShallowEtagHeaderFilter filter = new ShallowEtagHeaderFilter() {
+            @Override
+            protected boolean shouldNotFilter(HttpServletRequest request) {
+                // The event stream never ends, so it cannot be buffered to compute a hash
+                return request.getRequestURI().startsWith("/api/events");
+            }
+        };
+        FilterRegistrationBean<ShallowEtagHeaderFilter> registration = new FilterRegistrationBean<>(filter);
+        registration.addUrlPatterns("/api/*");
+        registration.setName("etagFilter");
+        return registration;
+    }
+}
@@ -0,0 +1,24 @@
+package com.example.demo.config;
+
+import org.springframework.boot.autoconfigure.data.web.PageableHandlerMethodArgumentResolverCustomizer;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+import org.springframework.data.web.config.EnableSpringDataWebSupport;
+
+import static org.springframework.data.web.config.EnableSpringDataWebSupport.PageSerializationMode.VIA_DTO;
+
+/**
+ * Paging for the {@code /page} list endpoints: pages are serialized as
+ * {@code {"content": [...], "page": {"size", "number", "totalElements", "totalPages"}}}
+ * and a single request can never ask for more than {@link #MAX_PAGE_SIZE} rows.
+ */
+@Configuration
+@EnableSpringDataWebSupport(pageSerializationMode = VIA_DTO)
+public class PagingConfig {
+    public static final int MAX_PAGE_SIZE = 500;
+
+    @Bean
+    public PageableHandlerMethodArgumentResolverCustomizer pageableCustomizer() {
+        return resolver -> resolver.setMaxPageSize(MAX_PAGE_SIZE);
+    }
+}
@@ -1,11 +1,18 @@
 package com.example.demo.controller;
 
+import com.example.demo.dto.BulkCreateResult;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.model.Car;
 import com.example.demo.service.CarService;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.domain.Sort;
+import org.springframework.data.web.PageableDefault;
 import org.springframework.format.annotation.DateTimeFormat;
 import org.springframework.web.bind.annotation.*;
 
+import java.time.Instant;
 import java.time.LocalDate;
 import java.util.List;
 @RestController
@@ -21,6 +28,27 @@ public class CarController {
         return carService.getAllCars();
     }
     
+    // Paged listing, e.g. /api/cars/page?page=0&size=100&sort=price,desc&type=SUV&available=true&q=bmw
+    @GetMapping("/page")
+    public Page<Car> getCarPage(
+            @RequestParam(name = "type", required = false) Car.CarType type,
+            @RequestParam(name = "available", required = false) Boolean available,
+            @RequestParam(name = "q", required = false) String text,
+            @PageableDefault(size = 100, sort = "id") Pageable pageable) {
+        return carService.getCarPage(type, available, text, pageable);
+    }
+    
+    /**
+     * Cars created, updated or deleted since {@code since} (ISO-8601 instant).
+     * Without {@code since} every car is returned. Send the returned
+     * {@code serverTime} as {@code since} on the next call.
+     */
+    @GetMapping("/changes")
+    public ChangeSet<Car> getCarChanges(
+            @RequestParam(name = "since", required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) Instant since) {
+        return carService.getCarChanges(since);
+    }
+    
     @GetMapping("/all-available")
     public List<Car> getAllAvailableCars() {
         return carService.getAllAvailableCars();
@@ -57,6 +85,17 @@ public class CarController {
         return carService.createCar(car);
     }
     
+    /**
+     * Create a batch of cars, e.g. a new lot imported from a file. Cars with
+     * missing fields or a license plate that is already registered (or repeated
+     * in the batch) are returned in {@code failed} by their index; the rest
+     * are saved together.
+     */
+    @PostMapping("/batch")
+    public BulkCreateResult<Car> createCars(@RequestBody List<Car> cars) {
+        return carService.createCars(cars);
+    }
+    
     @GetMapping("/{id}")
     public Car getCarById(@PathVariable int id) {
         return carService.getCarById(id);
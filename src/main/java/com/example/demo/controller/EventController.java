@@ -0,0 +1,32 @@
+package com.example.demo.controller;
+
+import com.example.demo.service.ChangeFeed;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.http.MediaType;
+import org.springframework.web.bind.annotation.*;
+import org.springframework.web.servlet.mvc.method.annotation.SseEmitter;
+
+@RestController
+@RequestMapping("/api/events")
+@CrossOrigin(origins = {"http://localhost:8081", "http://localhost:3000", "http://localhost:4173", "http://localhost:5173"})
+public class EventController {
+
+    private final ChangeFeed changeFeed;
+
+    @Autowired
+    public EventController(ChangeFeed changeFeed) {
+        this.changeFeed = changeFeed;
+    }
+
+    /**
+     * Server-sent event stream of car, rental and purchase changes. Every event
+     * is named after its collection ({@code cars}, {@code rentals},
+     * {@code purchases}) and carries a {@code ChangeEvent} as JSON. Clients
+     * should run a {@code /changes} sync after reconnecting to catch up on
+     * anything published while they were disconnected.
+     */
+    @GetMapping(produces = MediaType.TEXT_EVENT_STREAM_VALUE)
+    public SseEmitter subscribe() {
+        return changeFeed.subscribe();
+    }
+}
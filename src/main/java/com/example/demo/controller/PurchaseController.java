@@ -1,13 +1,23 @@
 // src/main/java/com/example/demo/controller/PurchaseController.java
 package com.example.demo.controller;
 
+import com.example.demo.dto.BulkStatusRequest;
+import com.example.demo.dto.BulkStatusResult;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.model.Car;
 import com.example.demo.model.Purchase;
 import com.example.demo.service.PurchaseService;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.domain.Sort;
+import org.springframework.data.web.PageableDefault;
+import org.springframework.format.annotation.DateTimeFormat;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
 
+import java.time.Instant;
+import java.time.LocalDate;
 import java.util.List;
 import java.util.Map;
 
@@ -28,6 +38,28 @@ public class PurchaseController {
         return purchaseService.getAllPurchases();
     }
 
+    // Paged listing, e.g. /api/purchases/page?page=0&size=100&sort=purchaseDate,desc&status=COMPLETED&from=2024-01-01&to=2024-12-31
+    @GetMapping("/page")
+    public Page<Purchase> getPurchasePage(
+            @RequestParam(name = "status", required = false) Purchase.Status status,
+            @RequestParam(name = "email", required = false) String email,
+            @RequestParam(name = "from", required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE) LocalDate from,
+            @RequestParam(name = "to", required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE) LocalDate to,
+            @PageableDefault(size = 100, sort = "id", direction = Sort.Direction.DESC) Pageable pageable) {
+        return purchaseService.getPurchasePage(status, email, from, to, pageable);
+    }
+
+    /**
+     * Purchases created, updated or deleted since {@code since} (ISO-8601 instant).
+     * Without {@code since} every purchase is returned. Send the returned
+     * {@code serverTime} as {@code since} on the next call.
+     */
+    @GetMapping("/changes")
+    public ChangeSet<Purchase> getPurchaseChanges(
+            @RequestParam(name = "since", required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) Instant since) {
+        return purchaseService.getPurchaseChanges(since);
+    }
+
     @GetMapping("/{id}")
     public Purchase getPurchaseById(@PathVariable Integer id) {
         return purchaseService.getPurchaseById(id);
@@ -110,4 +142,19 @@ public class PurchaseController {
         return ResponseEntity.ok(updatedPurchase);
     }
 
-}
\ No newline at end of file
+    // Bulk status change, e.g. PUT /api/purchases/status {"ids": [1, 2, 3], "status": "COMPLETED"}
+    @PutMapping("/status")
+    public ResponseEntity<BulkStatusResult<Purchase>> updatePurchaseStatuses(@RequestBody BulkStatusRequest request) {
+        if (request.getIds() == null || request.getStatus() == null) {
+            return ResponseEntity.badRequest().build();
+        }
+        Purchase.Status status;
+        try {
+            status = Purchase.Status.valueOf(request.getStatus().toUpperCase());
+        } catch (IllegalArgumentException e) {
+            return ResponseEntity.badRequest().build();
+        }
+        return ResponseEntity.ok(purchaseService.updatePurchaseStatuses(request.getIds(), status));
+    }
+
+}
@@ -1,12 +1,20 @@
 package com.example.demo.controller;
 
+import com.example.demo.dto.BulkStatusRequest;
+import com.example.demo.dto.BulkStatusResult;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.model.Rental;
 import com.example.demo.service.RentalService;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.domain.Sort;
+import org.springframework.data.web.PageableDefault;
 import org.springframework.format.annotation.DateTimeFormat;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
 
+import java.time.Instant;
 import java.time.LocalDate;
 import java.util.List;
 
@@ -27,6 +35,28 @@ public class RentalController {
         return rentalService.getAllRentals();
     }
 
+    // Paged listing, e.g. /api/rentals/page?page=0&size=100&sort=startDate,desc&status=PENDING&email=@acme&from=2024-01-01
+    @GetMapping("/page")
+    public Page<Rental> getRentalPage(
+            @RequestParam(name = "status", required = false) Rental.RentalStatus status,
+            @RequestParam(name = "email", required = false) String email,
+            @RequestParam(name = "from", required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE) LocalDate from,
+            @RequestParam(name = "to", required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE) LocalDate to,
+            @PageableDefault(size = 100, sort = "id", direction = Sort.Direction.DESC) Pageable pageable) {
+        return rentalService.getRentalPage(status, email, from, to, pageable);
+    }
+
+    /**
+     * Rentals created, updated or deleted since {@code since} (ISO-8601 instant).
+     * Without {@code since} every rental is returned. Send the returned
+     * {@code serverTime} as {@code since} on the next call.
+     */
+    @GetMapping("/changes")
+    public ChangeSet<Rental> getRentalChanges(
+            @RequestParam(name = "since", required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) Instant since) {
+        return rentalService.getRentalChanges(since);
+    }
+
     @GetMapping("/{id}")
     public ResponseEntity<Rental> getRentalById(@PathVariable Integer id) {
         return ResponseEntity.ok(rentalService.getRentalById(id));
@@ -89,20 +119,13 @@ public class RentalController {
         }
 
         try {
-            // Map "APPROVED" to "CONFIRMED" for backward compatibility
-            if ("APPROVED".equalsIgnoreCase(statusStr)) {
-                statusStr = "CONFIRMED";
-            } else if ("REJECTED".equalsIgnoreCase(statusStr)) {
-                statusStr = "CANCELLED";
-            }
-            
             // Get the existing rental first
             Rental existingRental = rentalService.getRentalById(id);
             System.out.println("Existing rental status: " + existingRental.getStatus());
             
             // Create an update object with only the status field set
             Rental rentalUpdate = new Rental();
-            rentalUpdate.setStatus(Rental.RentalStatus.valueOf(statusStr));
+            rentalUpdate.setStatus(toRentalStatus(statusStr));
             
             // Update the rental
             Rental updated = rentalService.updateRental(id, rentalUpdate);
@@ -119,4 +142,32 @@ public class RentalController {
             return ResponseEntity.status(500).body("Error updating rental status: " + e.getMessage());
         }
     }
+
+    // Bulk approve/reject, e.g. PUT /api/rentals/status {"ids": [1, 2, 3], "status": "APPROVED"}
+    @PutMapping("/status")
+    public ResponseEntity<?> updateRentalStatuses(@RequestBody BulkStatusRequest request) {
+        if (request.getIds() == null || request.getStatus() == null) {
+            return ResponseEntity.badRequest().body("ids and status are required");
+        }
+        Rental.RentalStatus status;
+        try {
+            status = toRentalStatus(request.getStatus());
+        } catch (IllegalArgumentException e) {
+            return ResponseEntity.badRequest().body("Invalid status: " + request.getStatus() + ". Valid values are: " +
+                java.util.Arrays.toString(Rental.RentalStatus.values()));
+        }
+        BulkStatusResult<Rental> result = rentalService.updateRentalStatuses(request.getIds(), status);
+        return ResponseEntity.ok(result);
+    }
+
+    // Map "APPROVED"/"REJECTED" to "CONFIRMED"/"CANCELLED" for backward compatibility
+    private static Rental.RentalStatus toRentalStatus(String status) {
+        if ("APPROVED".equalsIgnoreCase(status)) {
+            return Rental.RentalStatus.CONFIRMED;
+        }
+        if ("REJECTED".equalsIgnoreCase(status)) {
+            return Rental.RentalStatus.CANCELLED;
+        }
+        return Rental.RentalStatus.valueOf(status.toUpperCase());
+    }
 }
@@ -0,0 +1,19 @@
+package com.example.demo.dto;
+
+import lombok.AllArgsConstructor;
+import lombok.Data;
+
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Outcome of a batch create. {@code created} holds the records as saved, in
+ * request order; {@code failed} the reason for every rejected record, keyed
+ * by its position in the request.
+ */
+@Data
+@AllArgsConstructor
+public class BulkCreateResult<T> {
+    private List<T> created;
+    private Map<Integer, String> failed;
+}
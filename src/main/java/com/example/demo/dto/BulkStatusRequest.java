@@ -0,0 +1,15 @@
+package com.example.demo.dto;
+
+import lombok.Data;
+
+import java.util.List;
+
+/**
+ * Body of a bulk status change: the IDs to update and the status to set on
+ * all of them.
+ */
+@Data
+public class BulkStatusRequest {
+    private List<Integer> ids;
+    private String status;
+}
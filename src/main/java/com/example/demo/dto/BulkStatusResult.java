@@ -0,0 +1,20 @@
+package com.example.demo.dto;
+
+import lombok.AllArgsConstructor;
+import lombok.Data;
+
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Outcome of a bulk status change. {@code updated} holds the records as saved,
+ * {@code deletedIds} the records removed by the change (cancellations) and
+ * {@code failed} the reason for every ID that could not be updated.
+ */
+@Data
+@AllArgsConstructor
+public class BulkStatusResult<T> {
+    private List<T> updated;
+    private List<Integer> deletedIds;
+    private Map<Integer, String> failed;
+}
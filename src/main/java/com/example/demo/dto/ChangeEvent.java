@@ -0,0 +1,37 @@
+package com.example.demo.dto;
+
+import lombok.AllArgsConstructor;
+import lombok.Data;
+
+import java.time.Instant;
+
+/**
+ * One change pushed on {@code /api/events}: a car, rental or purchase that was
+ * created or updated ({@code record} holds it as saved) or deleted (only the
+ * {@code id} is set). {@code entity} is the collection name used by
+ * {@code /changes}: {@code cars}, {@code rentals} or {@code purchases}.
+ */
+@Data
+@AllArgsConstructor
+public class ChangeEvent {
+    public static final String CARS = "cars";
+    public static final String RENTALS = "rentals";
+    public static final String PURCHASES = "purchases";
+
+    public static final String UPSERT = "upsert";
+    public static final String DELETE = "delete";
+
+    private String entity;
+    private String type;
+    private Integer id;
+    private Object record;
+    private Instant serverTime;
+
+    public static ChangeEvent upsert(String entity, Integer id, Object record) {
+        return new ChangeEvent(entity, UPSERT, id, record, Instant.now());
+    }
+
+    public static ChangeEvent delete(String entity, Integer id) {
+        return new ChangeEvent(entity, DELETE, id, null, Instant.now());
+    }
+}
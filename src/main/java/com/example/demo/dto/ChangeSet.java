@@ -0,0 +1,20 @@
+package com.example.demo.dto;
+
+import lombok.AllArgsConstructor;
+import lombok.Data;
+
+import java.time.Instant;
+import java.util.List;
+
+/**
+ * Rows created or updated since a client's last sync, plus the IDs deleted in
+ * the same window. {@code serverTime} is the cursor to send as {@code since}
+ * on the next request.
+ */
+@Data
+@AllArgsConstructor
+public class ChangeSet<T> {
+    private List<T> items;
+    private List<Integer> deletedIds;
+    private Instant serverTime;
+}
@@ -4,6 +4,7 @@ import com.fasterxml.jackson.annotation.JsonIgnore;
 import jakarta.persistence.*;
 import lombok.Data;
 import lombok.ToString;
+import java.time.Instant;
 import java.util.List;
 
 @Entity
@@ -60,6 +61,15 @@ public class Car {
     @Column(name = "image_url", length = 1000)
     private String imageUrl;  // URL of the car image
 
+    @Column(name = "updated_at")
+    private Instant updatedAt;  // Last change, used by the /changes endpoints
+
+    @PrePersist
+    @PreUpdate
+    void touchUpdatedAt() {
+        updatedAt = Instant.now();
+    }
+
     public enum CarType {
         SEDAN, SUV, HATCHBACK, CONVERTIBLE, SPORTS, MINIVAN, PICKUP
     }
@@ -0,0 +1,40 @@
+package com.example.demo.model;
+
+import jakarta.persistence.*;
+import lombok.Data;
+import lombok.NoArgsConstructor;
+
+import java.time.Instant;
+
+/**
+ * Tombstone kept for every deleted car, rental or purchase so that clients
+ * syncing with {@code /changes?since=} learn about removals as well as updates.
+ */
+@Entity
+@Data
+@NoArgsConstructor
+@Table(name = "deleted_records", indexes = @Index(columnList = "entity_type, deleted_at"))
+public class DeletedRecord {
+    public static final String CAR = "car";
+    public static final String RENTAL = "rental";
+    public static final String PURCHASE = "purchase";
+
+    @Id
+    @GeneratedValue(strategy = GenerationType.IDENTITY)
+    private Long id;
+
+    @Column(name = "entity_type", nullable = false, length = 20)
+    private String entityType;
+
+    @Column(name = "entity_id", nullable = false)
+    private Integer entityId;
+
+    @Column(name = "deleted_at", nullable = false)
+    private Instant deletedAt;
+
+    public DeletedRecord(String entityType, Integer entityId) {
+        this.entityType = entityType;
+        this.entityId = entityId;
+        this.deletedAt = Instant.now();
+    }
+}
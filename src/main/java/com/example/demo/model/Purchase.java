@@ -5,6 +5,7 @@ import com.fasterxml.jackson.annotation.JsonIgnore;
 import jakarta.persistence.*;
 import lombok.Data;
 import lombok.ToString;
+import java.time.Instant;
 import java.time.LocalDate;
 
 @Entity
@@ -46,6 +47,15 @@ public class Purchase {
     @Column(nullable = false)
     private Status status = Status.PENDING;
 
+    @Column(name = "updated_at")
+    private Instant updatedAt;  // Last change, used by the /changes endpoints
+
+    @PrePersist
+    @PreUpdate
+    void touchUpdatedAt() {
+        updatedAt = Instant.now();
+    }
+
     public enum PaymentMethod {
         CASH, CREDIT_CARD, BANK_TRANSFER, LEASING
     }
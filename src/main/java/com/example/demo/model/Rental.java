@@ -5,6 +5,7 @@ import com.fasterxml.jackson.annotation.JsonIgnoreProperties;
 import jakarta.persistence.*;
 import lombok.Data;
 import lombok.ToString;
+import java.time.Instant;
 import java.time.LocalDate;
 
 @Entity
@@ -44,6 +45,15 @@ public class Rental {
     @Column(nullable = false)
     private RentalStatus status = RentalStatus.PENDING;
     
+    @Column(name = "updated_at")
+    private Instant updatedAt;  // Last change, used by the /changes endpoints
+    
+    @PrePersist
+    @PreUpdate
+    void touchUpdatedAt() {
+        updatedAt = Instant.now();
+    }
+    
     public enum RentalStatus {
         PENDING, CONFIRMED, COMPLETED, CANCELLED
     }
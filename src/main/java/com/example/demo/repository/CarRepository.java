@@ -2,15 +2,18 @@ package com.example.demo.repository;
 
 import com.example.demo.model.Car;
 import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.JpaSpecificationExecutor;
 import org.springframework.data.jpa.repository.Query;
 import org.springframework.data.repository.query.Param;
 import org.springframework.stereotype.Repository;
 
+import java.time.Instant;
 import java.time.LocalDate;
+import java.util.Collection;
 import java.util.List;
 
 @Repository
-public interface CarRepository extends JpaRepository<Car, Integer> {
+public interface CarRepository extends JpaRepository<Car, Integer>, JpaSpecificationExecutor<Car> {
     @Query("SELECT c FROM Car c WHERE c.name = :name")
     Car findByName(@Param("name") String name);
     
@@ -38,5 +41,11 @@ public interface CarRepository extends JpaRepository<Car, Integer> {
     // Find all available cars (for rent or for sale)
     @Query("SELECT c FROM Car c WHERE c.isAvailable = true AND (c.forSale = true OR c.forRent = true)")
     List<Car> findAllAvailableCars();
+    
+    // Cars created or updated at or after the given instant
+    List<Car> findByUpdatedAtGreaterThanEqual(Instant since);
+    
+    // Cars already registered under any of the given plates
+    List<Car> findByLicensePlateIn(Collection<String> licensePlates);
 }
 
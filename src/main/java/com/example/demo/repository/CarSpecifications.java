@@ -0,0 +1,33 @@
+package com.example.demo.repository;
+
+import com.example.demo.model.Car;
+import org.springframework.data.jpa.domain.Specification;
+
+/**
+ * Optional filters for the paged car listing. Every factory returns
+ * {@code null} when its argument is missing, so they can be combined freely.
+ */
+public final class CarSpecifications {
+    private CarSpecifications() {
+    }
+
+    public static Specification<Car> hasType(Car.CarType type) {
+        return type == null ? null : (root, query, cb) -> cb.equal(root.get("type"), type);
+    }
+
+    public static Specification<Car> isAvailable(Boolean available) {
+        return available == null ? null : (root, query, cb) -> cb.equal(root.get("isAvailable"), available);
+    }
+
+    // Matches the name, model or license plate
+    public static Specification<Car> textContains(String text) {
+        if (text == null || text.isBlank()) {
+            return null;
+        }
+        String pattern = "%" + text.trim().toLowerCase() + "%";
+        return (root, query, cb) -> cb.or(
+                cb.like(cb.lower(root.get("name")), pattern),
+                cb.like(cb.lower(root.get("model")), pattern),
+                cb.like(cb.lower(root.get("licensePlate")), pattern));
+    }
+}
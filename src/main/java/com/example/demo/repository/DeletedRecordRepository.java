@@ -0,0 +1,12 @@
+package com.example.demo.repository;
+
+import com.example.demo.model.DeletedRecord;
+import org.springframework.data.jpa.repository.JpaRepository;
+
+import java.time.Instant;
+import java.util.List;
+
+public interface DeletedRecordRepository extends JpaRepository<DeletedRecord, Long> {
+    // Tombstones of one entity type written at or after the given instant
+    List<DeletedRecord> findByEntityTypeAndDeletedAtGreaterThanEqual(String entityType, Instant since);
+}
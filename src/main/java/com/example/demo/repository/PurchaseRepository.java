@@ -3,9 +3,13 @@ package com.example.demo.repository;
 
 import com.example.demo.model.Purchase;
 import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.JpaSpecificationExecutor;
+import java.time.Instant;
 import java.util.List;
 
-public interface    PurchaseRepository extends JpaRepository<Purchase, Integer> {
+public interface    PurchaseRepository extends JpaRepository<Purchase, Integer>, JpaSpecificationExecutor<Purchase> {
     boolean existsByCarId(Integer carId);
     List<Purchase> findByCustomerEmail(String email);
+    // Purchases created or updated at or after the given instant
+    List<Purchase> findByUpdatedAtGreaterThanEqual(Instant since);
 }
\ No newline at end of file
@@ -0,0 +1,37 @@
+package com.example.demo.repository;
+
+import com.example.demo.model.Purchase;
+import org.springframework.data.jpa.domain.Specification;
+
+import java.time.LocalDate;
+
+/**
+ * Optional filters for the paged purchase listing. Every factory returns
+ * {@code null} when its argument is missing, so they can be combined freely.
+ */
+public final class PurchaseSpecifications {
+    private PurchaseSpecifications() {
+    }
+
+    public static Specification<Purchase> hasStatus(Purchase.Status status) {
+        return status == null ? null : (root, query, cb) -> cb.equal(root.get("status"), status);
+    }
+
+    public static Specification<Purchase> emailContains(String email) {
+        if (email == null || email.isBlank()) {
+            return null;
+        }
+        String pattern = "%" + email.trim().toLowerCase() + "%";
+        return (root, query, cb) -> cb.like(cb.lower(root.get("customerEmail")), pattern);
+    }
+
+    // Purchases made within [from, to]; either bound may be open
+    public static Specification<Purchase> purchasedBetween(LocalDate from, LocalDate to) {
+        if (from == null && to == null) {
+            return null;
+        }
+        return (root, query, cb) -> cb.and(
+                from == null ? cb.conjunction() : cb.greaterThanOrEqualTo(root.get("purchaseDate"), from),
+                to == null ? cb.conjunction() : cb.lessThanOrEqualTo(root.get("purchaseDate"), to));
+    }
+}
@@ -2,13 +2,15 @@ package com.example.demo.repository;
 
 import com.example.demo.model.Rental;
 import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.JpaSpecificationExecutor;
 import org.springframework.data.jpa.repository.Query;
 import org.springframework.data.repository.query.Param;
 
+import java.time.Instant;
 import java.time.LocalDate;
 import java.util.List;
 
-public interface RentalRepository extends JpaRepository<Rental, Integer> {
+public interface RentalRepository extends JpaRepository<Rental, Integer>, JpaSpecificationExecutor<Rental> {
     
     // Find all rentals for a specific customer email
     List<Rental> findByCustomerEmail(String customerEmail);
@@ -37,4 +39,7 @@ public interface RentalRepository extends JpaRepository<Rental, Integer> {
     
     // Find all rentals for a specific car
     List<Rental> findByCarId(Integer carId);
+    
+    // Rentals created or updated at or after the given instant
+    List<Rental> findByUpdatedAtGreaterThanEqual(Instant since);
 }
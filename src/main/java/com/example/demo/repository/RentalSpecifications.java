@@ -0,0 +1,37 @@
+package com.example.demo.repository;
+
+import com.example.demo.model.Rental;
+import org.springframework.data.jpa.domain.Specification;
+
+import java.time.LocalDate;
+
+/**
+ * Optional filters for the paged rental listing. Every factory returns
+ * {@code null} when its argument is missing, so they can be combined freely.
+ */
+public final class RentalSpecifications {
+    private RentalSpecifications() {
+    }
+
+    public static Specification<Rental> hasStatus(Rental.RentalStatus status) {
+        return status == null ? null : (root, query, cb) -> cb.equal(root.get("status"), status);
+    }
+
+    public static Specification<Rental> emailContains(String email) {
+        if (email == null || email.isBlank()) {
+            return null;
+        }
+        String pattern = "%" + email.trim().toLowerCase() + "%";
+        return (root, query, cb) -> cb.like(cb.lower(root.get("customerEmail")), pattern);
+    }
+
+    // Rentals overlapping the [from, to] period; either bound may be open
+    public static Specification<Rental> overlaps(LocalDate from, LocalDate to) {
+        if (from == null && to == null) {
+            return null;
+        }
+        return (root, query, cb) -> cb.and(
+                from == null ? cb.conjunction() : cb.greaterThanOrEqualTo(root.get("endDate"), from),
+                to == null ? cb.conjunction() : cb.lessThanOrEqualTo(root.get("startDate"), to));
+    }
+}
@@ -1,7 +1,12 @@
 package com.example.demo.service;
 
+import com.example.demo.dto.BulkCreateResult;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.model.Car;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
 
+import java.time.Instant;
 import java.time.LocalDate;
 import java.util.List;
 
@@ -27,4 +32,13 @@ public interface CarService {
     Car getCarByName(String name);
     Car updateCar(Car car);
     void deleteCar(int id);
+    
+    // Create many cars in one transaction; invalid and duplicate-plate cars are reported, not saved
+    BulkCreateResult<Car> createCars(List<Car> cars);
+    
+    // One page of cars, optionally filtered by type, availability and name/model/plate text
+    Page<Car> getCarPage(Car.CarType type, Boolean available, String text, Pageable pageable);
+    
+    // Cars changed or deleted since the given instant (all cars if null)
+    ChangeSet<Car> getCarChanges(Instant since);
 }
@@ -1,18 +1,40 @@
 package com.example.demo.service;
 
+import com.example.demo.dto.BulkCreateResult;
+import com.example.demo.dto.ChangeEvent;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.exception.ResourceNotFoundException;
 import com.example.demo.model.Car;
+import com.example.demo.model.DeletedRecord;
 import com.example.demo.repository.CarRepository;
+import com.example.demo.repository.CarSpecifications;
+import com.example.demo.repository.DeletedRecordRepository;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.context.ApplicationEventPublisher;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.jpa.domain.Specification;
 import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
 
+import java.time.Instant;
 import java.time.LocalDate;
+import java.util.ArrayList;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
 import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.stream.Collectors;
 
 @Service
 public class CarServiceImpl implements CarService {
     @Autowired
     private CarRepository carRepository;
+    @Autowired
+    private DeletedRecordRepository deletedRecordRepository;
+    @Autowired
+    private ApplicationEventPublisher eventPublisher;
     @Override
     public List<Car> getAllCars() {
         return carRepository.findAll();
@@ -39,8 +61,81 @@ public class CarServiceImpl implements CarService {
     }
     @Override
     public Car createCar(Car car) {
-        return carRepository.save(car);
+        Car saved = carRepository.save(car);
+        eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, saved.getId(), saved));
+        return saved;
+    }
+    
+    @Override
+    @Transactional
+    public BulkCreateResult<Car> createCars(List<Car> cars) {
+        Map<Integer, String> failed = new LinkedHashMap<>();
+        // Look plates up as sent and normalized, then compare them normalized
+        Set<String> plates = new HashSet<>();
+        for (Car car : cars) {
+            if (car != null && car.getLicensePlate() != null) {
+                plates.add(car.getLicensePlate().trim());
+                plates.add(normalizePlate(car.getLicensePlate()));
+            }
+        }
+        Set<String> registered = carRepository.findByLicensePlateIn(plates).stream()
+                .map(car -> normalizePlate(car.getLicensePlate())).collect(Collectors.toSet());
+        Set<String> seen = new HashSet<>();
+        List<Car> valid = new ArrayList<>();
+        for (int index = 0; index < cars.size(); index++) {
+            Car car = cars.get(index);
+            String problem = validate(car);
+            if (problem == null) {
+                String plate = normalizePlate(car.getLicensePlate());
+                if (registered.contains(plate)) {
+                    problem = "license plate " + car.getLicensePlate() + " is already registered";
+                } else if (!seen.add(plate)) {
+                    problem = "license plate " + car.getLicensePlate() + " appears twice in the batch";
+                }
+            }
+            if (problem != null) {
+                failed.put(index, problem);
+                continue;
+            }
+            car.setId(null);
+            valid.add(car);
+        }
+        List<Car> created = carRepository.saveAll(valid);
+        created.forEach(saved -> eventPublisher.publishEvent(
+                ChangeEvent.upsert(ChangeEvent.CARS, saved.getId(), saved)));
+        return new BulkCreateResult<>(created, failed);
+    }
+    
+    private static String validate(Car car) {
+        if (car == null) {
+            return "empty record";
+        }
+        if (car.getName() == null || car.getName().isBlank()) {
+            return "name is required";
+        }
+        if (car.getModel() == null || car.getModel().isBlank()) {
+            return "model is required";
+        }
+        if (car.getLicensePlate() == null || car.getLicensePlate().isBlank()) {
+            return "license plate is required";
+        }
+        if (car.getType() == null) {
+            return "type is required";
+        }
+        if (car.getColor() == null) {
+            car.setColor("");
+        }
+        if (car.getDailyRate() < 0 || car.getPrice() < 0) {
+            return "prices cannot be negative";
+        }
+        return null;
     }
+    
+    // "b-12 abc" and "B12ABC" are the same plate
+    private static String normalizePlate(String plate) {
+        return plate.replaceAll("[\\s-]", "").toUpperCase();
+    }
+    
     @Override
     public Car getCarById(int id) {
         return carRepository.findById(id)
@@ -50,10 +145,49 @@ public class CarServiceImpl implements CarService {
     public Car getCarByName(String name) { return carRepository.findByName(name);}
     @Override
     public Car updateCar(Car car) {
-        return carRepository.save(car);
+        Car saved = carRepository.save(car);
+        eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, saved.getId(), saved));
+        return saved;
     }
     @Override
+    @Transactional
     public void deleteCar(int id) {
-        carRepository.deleteById(id);
+        carRepository.findById(id).ifPresent(car -> {
+            // Rentals and the purchase are removed by the cascade, record them too
+            List<DeletedRecord> tombstones = new ArrayList<>();
+            tombstones.add(new DeletedRecord(DeletedRecord.CAR, car.getId()));
+            if (car.getRentals() != null) {
+                car.getRentals().forEach(rental ->
+                        tombstones.add(new DeletedRecord(DeletedRecord.RENTAL, rental.getId())));
+            }
+            if (car.getPurchase() != null) {
+                tombstones.add(new DeletedRecord(DeletedRecord.PURCHASE, car.getPurchase().getId()));
+            }
+            carRepository.delete(car);
+            deletedRecordRepository.saveAll(tombstones);
+            // Entity types are the singular of the collection names ("car" -> "cars")
+            tombstones.forEach(tombstone -> eventPublisher.publishEvent(
+                    ChangeEvent.delete(tombstone.getEntityType() + "s", tombstone.getEntityId())));
+        });
+    }
+    @Override
+    public Page<Car> getCarPage(Car.CarType type, Boolean available, String text, Pageable pageable) {
+        return carRepository.findAll(Specification.allOf(
+                CarSpecifications.hasType(type),
+                CarSpecifications.isAvailable(available),
+                CarSpecifications.textContains(text)), pageable);
+    }
+    @Override
+    public ChangeSet<Car> getCarChanges(Instant since) {
+        // Taken before querying so rows changed meanwhile show up in the next sync
+        Instant serverTime = Instant.now();
+        if (since == null) {
+            return new ChangeSet<>(carRepository.findAll(), List.of(), serverTime);
+        }
+        List<Integer> deletedIds = deletedRecordRepository
+                .findByEntityTypeAndDeletedAtGreaterThanEqual(DeletedRecord.CAR, since).stream()
+                .map(DeletedRecord::getEntityId)
+                .toList();
+        return new ChangeSet<>(carRepository.findByUpdatedAtGreaterThanEqual(since), deletedIds, serverTime);
     }
 }
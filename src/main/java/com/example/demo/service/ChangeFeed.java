@@ -0,0 +1,60 @@
+package com.example.demo.service;
+
+import com.example.demo.dto.ChangeEvent;
+import org.springframework.scheduling.annotation.Scheduled;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.event.TransactionalEventListener;
+import org.springframework.web.servlet.mvc.method.annotation.SseEmitter;
+
+import java.io.IOException;
+import java.util.List;
+import java.util.concurrent.CopyOnWriteArrayList;
+
+/**
+ * Pushes {@link ChangeEvent}s to every client subscribed to {@code /api/events}
+ * as server-sent events. Services publish the events through Spring's
+ * {@code ApplicationEventPublisher}; they are only sent once the transaction
+ * that made the change has committed, so a client never sees a change that
+ * was rolled back.
+ */
+@Service
+public class ChangeFeed {
+    // Comment line sent to idle connections so clients and proxies keep them open
+    private static final long HEARTBEAT_MILLIS = 20_000;
+
+    private final List<SseEmitter> emitters = new CopyOnWriteArrayList<>();
+
+    public SseEmitter subscribe() {
+        // No timeout: the stream stays open until the client disconnects
+        SseEmitter emitter = new SseEmitter(0L);
+        emitters.add(emitter);
+        emitter.onCompletion(() -> emitters.remove(emitter));
+        emitter.onTimeout(() -> emitters.remove(emitter));
+        emitter.onError(error -> emitters.remove(emitter));
+        return emitter;
+    }
+
+    @TransactionalEventListener(fallbackExecution = true)
+    public void onChange(ChangeEvent event) {
+        for (SseEmitter emitter : emitters) {
+            send(emitter, SseEmitter.event().name(event.getEntity()).data(event));
+        }
+    }
+
+    @Scheduled(fixedRate = HEARTBEAT_MILLIS)
+    public void heartbeat() {
+        for (SseEmitter emitter : emitters) {
+            send(emitter, SseEmitter.event().comment("ping"));
+        }
+    }
+
+    private void send(SseEmitter emitter, SseEmitter.SseEventBuilder event) {
+        try {
+            emitter.send(event);
+        } catch (IOException | IllegalStateException e) {
+            // The client went away; drop it instead of failing the change
+            emitters.remove(emitter);
+            emitter.completeWithError(e);
+        }
+    }
+}
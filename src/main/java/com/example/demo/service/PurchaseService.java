@@ -1,7 +1,13 @@
 // src/main/java/com/example/demo/service/PurchaseService.java
 package com.example.demo.service;
 
+import com.example.demo.dto.BulkStatusResult;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.model.Purchase;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import java.time.Instant;
+import java.time.LocalDate;
 import java.util.List;
 
 public interface PurchaseService {
@@ -11,4 +17,7 @@ public interface PurchaseService {
     void deletePurchase(Integer id);
     List<Purchase> getPurchasesByEmail(String email);
     Purchase updatePurchase(Integer id, Purchase purchaseDetails);
+    BulkStatusResult<Purchase> updatePurchaseStatuses(List<Integer> ids, Purchase.Status status);
+    Page<Purchase> getPurchasePage(Purchase.Status status, String email, LocalDate from, LocalDate to, Pageable pageable);
+    ChangeSet<Purchase> getPurchaseChanges(Instant since);
 }
\ No newline at end of file
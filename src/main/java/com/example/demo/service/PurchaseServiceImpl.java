@@ -1,17 +1,32 @@
 // src/main/java/com/example/demo/service/PurchaseServiceImpl.java
 package com.example.demo.service;
 
+import com.example.demo.dto.BulkStatusResult;
+import com.example.demo.dto.ChangeEvent;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.exception.ResourceNotFoundException;
 import com.example.demo.model.Car;
+import com.example.demo.model.DeletedRecord;
 import com.example.demo.model.Purchase;
 import com.example.demo.repository.CarRepository;
+import com.example.demo.repository.DeletedRecordRepository;
 import com.example.demo.repository.PurchaseRepository;
+import com.example.demo.repository.PurchaseSpecifications;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.context.ApplicationEventPublisher;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.jpa.domain.Specification;
 import org.springframework.stereotype.Service;
 import org.springframework.transaction.annotation.Transactional;
 
+import java.time.Instant;
 import java.time.LocalDate;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.LinkedHashSet;
 import java.util.List;
+import java.util.Map;
 
 @Service
 public class PurchaseServiceImpl implements PurchaseService {
@@ -19,14 +34,20 @@ public class PurchaseServiceImpl implements PurchaseService {
     private final PurchaseRepository purchaseRepository;
     private final CarRepository carRepository;
     private final EmailService emailService;
+    private final DeletedRecordRepository deletedRecordRepository;
+    private final ApplicationEventPublisher eventPublisher;
 
     @Autowired
     public PurchaseServiceImpl(PurchaseRepository purchaseRepository,
                                CarRepository carRepository,
-                               EmailService emailService) {
+                               EmailService emailService,
+                               DeletedRecordRepository deletedRecordRepository,
+                               ApplicationEventPublisher eventPublisher) {
         this.purchaseRepository = purchaseRepository;
         this.carRepository = carRepository;
         this.emailService = emailService;
+        this.deletedRecordRepository = deletedRecordRepository;
+        this.eventPublisher = eventPublisher;
     }
 
     @Override
@@ -69,12 +90,15 @@ public class PurchaseServiceImpl implements PurchaseService {
             // Mark car as not available (but preserve forSale/forRent flags)
             car.setAvailable(false);
             carRepository.save(car);
+            eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, car.getId(), car));
             
             // Set the car in the purchase
             purchase.setCar(car);
             
             // Save and return the purchase
-            return purchaseRepository.save(purchase);
+            Purchase saved = purchaseRepository.save(purchase);
+            eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.PURCHASES, saved.getId(), saved));
+            return saved;
         } catch (Exception e) {
             throw new RuntimeException("Failed to process purchase: " + e.getMessage(), e);
         }
@@ -89,8 +113,11 @@ public class PurchaseServiceImpl implements PurchaseService {
         // Mark car as available for sale again
         car.setForSale(true);
         carRepository.save(car);
+        eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, car.getId(), car));
 
         purchaseRepository.delete(purchase);
+        deletedRecordRepository.save(new DeletedRecord(DeletedRecord.PURCHASE, purchase.getId()));
+        eventPublisher.publishEvent(ChangeEvent.delete(ChangeEvent.PURCHASES, purchase.getId()));
     }
 
     @Override
@@ -114,6 +141,7 @@ public class PurchaseServiceImpl implements PurchaseService {
                 car.setAvailable(true);  // Make car available again
                 car.setPurchase(null);   // Clear the purchase reference
                 carRepository.save(car);
+                eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, car.getId(), car));
                 
                 // Send cancellation email before deleting
                 try {
@@ -128,6 +156,8 @@ public class PurchaseServiceImpl implements PurchaseService {
                 
                 // Delete the purchase record
                 purchaseRepository.delete(purchase);
+                deletedRecordRepository.save(new DeletedRecord(DeletedRecord.PURCHASE, purchase.getId()));
+                eventPublisher.publishEvent(ChangeEvent.delete(ChangeEvent.PURCHASES, purchase.getId()));
                 return purchase;  // Return the deleted purchase (will be detached)
             }
             // If purchase is approved/completed, keep car as sold
@@ -136,6 +166,7 @@ public class PurchaseServiceImpl implements PurchaseService {
         // Only save if purchase wasn't cancelled (deleted)
         if (purchase.getStatus() != Purchase.Status.CANCELLED) {
             Purchase saved = purchaseRepository.save(purchase);
+            eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.PURCHASES, saved.getId(), saved));
 
             // Send notification emails on purchase status changes
             try {
@@ -157,4 +188,56 @@ public class PurchaseServiceImpl implements PurchaseService {
         
         return purchase;  // Return the deleted purchase (in case it was cancelled)
     }
+
+    /**
+     * Applies {@code status} to every purchase in {@code ids} in one transaction.
+     * Unknown IDs are reported in the result instead of failing the batch;
+     * cancelled purchases are deleted by {@link #updatePurchase} and listed in
+     * {@code deletedIds}.
+     */
+    @Override
+    @Transactional
+    public BulkStatusResult<Purchase> updatePurchaseStatuses(List<Integer> ids, Purchase.Status status) {
+        List<Purchase> updated = new ArrayList<>();
+        List<Integer> deletedIds = new ArrayList<>();
+        Map<Integer, String> failed = new LinkedHashMap<>();
+        for (Integer id : new LinkedHashSet<>(ids)) {
+            Purchase statusUpdate = new Purchase();
+            statusUpdate.setStatus(status);
+            try {
+                Purchase purchase = updatePurchase(id, statusUpdate);
+                if (status == Purchase.Status.CANCELLED) {
+                    deletedIds.add(id);
+                } else {
+                    updated.add(purchase);
+                }
+            } catch (RuntimeException e) {
+                failed.put(id, e.getMessage());
+            }
+        }
+        return new BulkStatusResult<>(updated, deletedIds, failed);
+    }
+
+    @Override
+    public Page<Purchase> getPurchasePage(Purchase.Status status, String email,
+                                          LocalDate from, LocalDate to, Pageable pageable) {
+        return purchaseRepository.findAll(Specification.allOf(
+                PurchaseSpecifications.hasStatus(status),
+                PurchaseSpecifications.emailContains(email),
+                PurchaseSpecifications.purchasedBetween(from, to)), pageable);
+    }
+
+    @Override
+    public ChangeSet<Purchase> getPurchaseChanges(Instant since) {
+        // Taken before querying so rows changed meanwhile show up in the next sync
+        Instant serverTime = Instant.now();
+        if (since == null) {
+            return new ChangeSet<>(purchaseRepository.findAll(), List.of(), serverTime);
+        }
+        List<Integer> deletedIds = deletedRecordRepository
+                .findByEntityTypeAndDeletedAtGreaterThanEqual(DeletedRecord.PURCHASE, since).stream()
+                .map(DeletedRecord::getEntityId)
+                .toList();
+        return new ChangeSet<>(purchaseRepository.findByUpdatedAtGreaterThanEqual(since), deletedIds, serverTime);
+    }
 }
\ No newline at end of file
@@ -1,6 +1,11 @@
 package com.example.demo.service;
 
+import com.example.demo.dto.BulkStatusResult;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.model.Rental;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import java.time.Instant;
 import java.time.LocalDate;
 import java.util.List;
 
@@ -9,6 +14,7 @@ public interface RentalService {
     Rental getRentalById(Integer id);
     Rental createRental(Rental rental);
     Rental updateRental(Integer id, Rental rental);
+    BulkStatusResult<Rental> updateRentalStatuses(List<Integer> ids, Rental.RentalStatus status);
     void deleteRental(Integer id);
     List<Rental> getRentalsByEmail(String email);
     List<Rental> getActiveRentals();
@@ -16,4 +22,6 @@ public interface RentalService {
     List<Rental> getRentalsByCarId(Integer carId);
     List<Rental> getRentalsInDateRangeForCar(Integer carId, LocalDate start, LocalDate end);
     double calculateRentalPrice(Integer carId, LocalDate startDate, LocalDate endDate);
+    Page<Rental> getRentalPage(Rental.RentalStatus status, String email, LocalDate from, LocalDate to, Pageable pageable);
+    ChangeSet<Rental> getRentalChanges(Instant since);
 }
@@ -1,32 +1,53 @@
 package com.example.demo.service;
 
+import com.example.demo.dto.BulkStatusResult;
+import com.example.demo.dto.ChangeEvent;
+import com.example.demo.dto.ChangeSet;
 import com.example.demo.exception.ResourceNotFoundException;
 import com.example.demo.model.Car;
+import com.example.demo.model.DeletedRecord;
 import com.example.demo.model.Rental;
 import com.example.demo.repository.CarRepository;
+import com.example.demo.repository.DeletedRecordRepository;
 import com.example.demo.repository.RentalRepository;
+import com.example.demo.repository.RentalSpecifications;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.context.ApplicationEventPublisher;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.jpa.domain.Specification;
 import org.springframework.stereotype.Service;
 import org.springframework.transaction.annotation.Transactional;
 
+import java.time.Instant;
 import java.time.LocalDate;
 import java.time.format.DateTimeFormatter;
 import java.time.temporal.ChronoUnit;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.LinkedHashSet;
 import java.util.List;
+import java.util.Map;
 
 @Service
 public class RentalServiceImpl implements RentalService {
     private final RentalRepository rentalRepository;
     private final CarRepository carRepository;
     private final EmailService emailService;
+    private final DeletedRecordRepository deletedRecordRepository;
+    private final ApplicationEventPublisher eventPublisher;
 
     @Autowired
     public RentalServiceImpl(RentalRepository rentalRepository, 
                            CarRepository carRepository,
-                           EmailService emailService) {
+                           EmailService emailService,
+                           DeletedRecordRepository deletedRecordRepository,
+                           ApplicationEventPublisher eventPublisher) {
         this.rentalRepository = rentalRepository;
         this.carRepository = carRepository;
         this.emailService = emailService;
+        this.deletedRecordRepository = deletedRecordRepository;
+        this.eventPublisher = eventPublisher;
     }
 
     @Override
@@ -70,6 +91,7 @@ public class RentalServiceImpl implements RentalService {
         
         // Save the rental
         Rental savedRental = rentalRepository.save(rental);
+        eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.RENTALS, savedRental.getId(), savedRental));
 
         return savedRental;
     }
@@ -102,6 +124,7 @@ public class RentalServiceImpl implements RentalService {
                     System.out.println("Setting car " + car.getId() + " to available");
                     car.setAvailable(true);
                     car = carRepository.save(car);
+                    eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, car.getId(), car));
                 } else {
                     System.err.println("Warning: Car is null for rental " + rental.getId());
                 }
@@ -113,14 +136,18 @@ public class RentalServiceImpl implements RentalService {
                     System.out.println("Setting car " + car.getId() + " to available and deleting cancelled rental");
                     car.setAvailable(true);
                     car = carRepository.save(car);
+                    eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, car.getId(), car));
                 }
                 // Delete the rental after sending the email (handled below)
                 rentalRepository.delete(rental);
+                deletedRecordRepository.save(new DeletedRecord(DeletedRecord.RENTAL, rental.getId()));
+                eventPublisher.publishEvent(ChangeEvent.delete(ChangeEvent.RENTALS, rental.getId()));
                 return rental; // Return the deleted rental
             }
         }
 
         Rental saved = rentalRepository.save(rental);
+        eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.RENTALS, saved.getId(), saved));
 
         // Send notification emails when admin accepts/confirms or cancels the rental
         try {
@@ -145,6 +172,35 @@ public class RentalServiceImpl implements RentalService {
         return saved;
     }
 
+    /**
+     * Applies {@code status} to every rental in {@code ids} in one transaction.
+     * Unknown IDs are reported in the result instead of failing the batch;
+     * cancelled rentals are deleted by {@link #updateRental} and listed in
+     * {@code deletedIds}.
+     */
+    @Override
+    @Transactional
+    public BulkStatusResult<Rental> updateRentalStatuses(List<Integer> ids, Rental.RentalStatus status) {
+        List<Rental> updated = new ArrayList<>();
+        List<Integer> deletedIds = new ArrayList<>();
+        Map<Integer, String> failed = new LinkedHashMap<>();
+        for (Integer id : new LinkedHashSet<>(ids)) {
+            Rental statusUpdate = new Rental();
+            statusUpdate.setStatus(status);
+            try {
+                Rental rental = updateRental(id, statusUpdate);
+                if (status == Rental.RentalStatus.CANCELLED) {
+                    deletedIds.add(id);
+                } else {
+                    updated.add(rental);
+                }
+            } catch (RuntimeException e) {
+                failed.put(id, e.getMessage());
+            }
+        }
+        return new BulkStatusResult<>(updated, deletedIds, failed);
+    }
+
     @Override
     @Transactional
     public void deleteRental(Integer id) {
@@ -156,9 +212,35 @@ public class RentalServiceImpl implements RentalService {
             Car car = rental.getCar();
             car.setAvailable(true);
             carRepository.save(car);
+            eventPublisher.publishEvent(ChangeEvent.upsert(ChangeEvent.CARS, car.getId(), car));
         }
 
         rentalRepository.delete(rental);
+        deletedRecordRepository.save(new DeletedRecord(DeletedRecord.RENTAL, rental.getId()));
+        eventPublisher.publishEvent(ChangeEvent.delete(ChangeEvent.RENTALS, rental.getId()));
+    }
+
+    @Override
+    public Page<Rental> getRentalPage(Rental.RentalStatus status, String email,
+                                      LocalDate from, LocalDate to, Pageable pageable) {
+        return rentalRepository.findAll(Specification.allOf(
+                RentalSpecifications.hasStatus(status),
+                RentalSpecifications.emailContains(email),
+                RentalSpecifications.overlaps(from, to)), pageable);
+    }
+
+    @Override
+    public ChangeSet<Rental> getRentalChanges(Instant since) {
+        // Taken before querying so rows changed meanwhile show up in the next sync
+        Instant serverTime = Instant.now();
+        if (since == null) {
+            return new ChangeSet<>(rentalRepository.findAll(), List.of(), serverTime);
+        }
+        List<Integer> deletedIds = deletedRecordRepository
+                .findByEntityTypeAndDeletedAtGreaterThanEqual(DeletedRecord.RENTAL, since).stream()
+                .map(DeletedRecord::getEntityId)
+                .toList();
+        return new ChangeSet<>(rentalRepository.findByUpdatedAtGreaterThanEqual(since), deletedIds, serverTime);
     }
 
     @Override